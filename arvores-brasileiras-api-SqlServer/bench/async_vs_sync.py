@@ -0,0 +1,109 @@
+"""Compara o caminho síncrono (WSGI com uma thread por requisição) com o caminho ASGI
+
+As duas aplicações são exercitadas no próprio processo, sem sockets, contra o banco
+configurado pelas variáveis de ambiente (SQL_SERVER, SQL_DATABASE...), para isolar o
+custo do despacho e da concorrência no acesso ao banco.
+
+Uso:
+    python bench/async_vs_sync.py --concurrency 32 --requests 2000 \\
+        --path "/api/especies?include_relationships=true&per_page=20" --path /api/arvores-completa/1
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# O cache de respostas esconderia o custo do banco
+os.environ.setdefault('CACHE_ENABLED', 'false')
+
+DEFAULT_PATHS = (
+    '/api/especies?per_page=20',
+    '/api/especies?include_relationships=true&per_page=20',
+    '/api/arvores-completa/1'
+)
+
+def summary(name, latencies, elapsed, errors):
+    latencies = sorted(latencies)
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    print(
+        f"{name:<7} {len(latencies) / elapsed:9.1f} req/s   p50 {percentile(0.50):7.2f} ms   "
+        f"p95 {percentile(0.95):7.2f} ms   p99 {percentile(0.99):7.2f} ms   "
+        f"média {statistics.mean(latencies) * 1000:7.2f} ms   erros {errors}"
+    )
+
+def bench_sync(flask_app, paths, requests, concurrency, name='sync'):
+    """Uma thread por requisição em andamento, como o servidor threaded do Werkzeug"""
+    client = flask_app.test_client()
+
+    def call(index):
+        started = time.perf_counter()
+        response = client.get(paths[index % len(paths)])
+        response.get_data()
+        return time.perf_counter() - started, response.status_code >= 500
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(call, range(requests)))
+    summary(name, [latency for latency, _ in results], time.perf_counter() - started, sum(error for _, error in results))
+
+async def asgi_get(asgi_app, path):
+    """Executa uma requisição GET em uma aplicação ASGI e retorna (status, corpo)"""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': path, 'query_string': query.encode(), 'headers': [],
+        'http_version': '1.1', 'scheme': 'http', 'server': ('bench', 80), 'client': ('127.0.0.1', 0), 'root_path': ''
+    }
+    messages = []
+
+    async def receive(): return {'type': 'http.request', 'body': b'', 'more_body': False}
+    async def send(message): messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    return messages[0]['status'], b''.join(message.get('body', b'') for message in messages[1:])
+
+async def bench_async(asgi_app, paths, requests, concurrency):
+    """`concurrency` clientes simultâneos em um único loop de eventos"""
+    latencies, errors, counter = [], 0, iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for index in counter:
+            started = time.perf_counter()
+            status, _ = await asgi_get(asgi_app, paths[index % len(paths)])
+            latencies.append(time.perf_counter() - started)
+            errors += status >= 500
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    summary('asgi', latencies, time.perf_counter() - started, errors)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--path', action='append', help='Rota GET exercitada (pode repetir)')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args(argv)
+    paths = args.path or list(DEFAULT_PATHS)
+
+    from src.main import create_app
+    from src.asgi import AsgiApp
+    from src.database.executor import db_executor
+
+    flask_app = create_app('production')
+    asgi_app = AsgiApp(flask_app)
+
+    print(f"{args.requests} requisições, {args.concurrency} simultâneas, rotas: {', '.join(paths)}")
+    # Aquecimento: abre as conexões do pool e carrega os caminhos de código
+    bench_sync(flask_app, paths, min(args.requests, 50), args.concurrency, name='warmup')
+    bench_sync(flask_app, paths, args.requests, args.concurrency)
+    asyncio.run(bench_async(asgi_app, paths, args.requests, args.concurrency))
+    print('executor:', db_executor.stats())
+    db_executor.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Micro-benchmark da serialização JSON das respostas (sem banco)
+
+Serializa uma resposta de `get_all` com 1000 registros no formato de DadosArvore
+(envelope `data` + `pagination`) com o provedor padrão do Flask e com
+`FastJSONProvider` (json da biblioteca padrão e orjson, se instalado), a partir de:
+  - registros já convertidos (float / texto ISO), como os modelos produzem;
+  - registros com os tipos do banco (Decimal / datetime), convertidos pelo provedor;
+  - registros pré-codificados (Fragment), como os documentos em cache.
+
+Uso:
+    python bench/json_serialization.py --rows 1000
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from src.json_provider import FastJSONProvider, orjson
+
+def raw_rows(count):
+    cadastro = datetime(2024, 1, 1, 10, 30)
+    return [
+        {
+            'DadosID': i,
+            'EspecieID': i % 500,
+            'TempoDeVidaEstimado': 50 + i % 300,
+            'CrescimentoAnual': Decimal('0.35') + i % 10,
+            'RaizProfundidadeMedia': Decimal('1.50'),
+            'DensidadeMadeira': None if i % 7 == 0 else Decimal('0.72'),
+            'Observacao': 'Madeira de lei, espécie nativa da Mata Atlântica',
+            'DataCadastro': cadastro + timedelta(minutes=i)
+        }
+        for i in range(count)
+    ]
+
+def converted(rows):
+    return [
+        {key: float(value) if isinstance(value, Decimal) else value.isoformat() if isinstance(value, datetime) else value
+         for key, value in row.items()}
+        for row in rows
+    ]
+
+def page(items):
+    return {
+        'data': items,
+        'pagination': {'page': 1, 'per_page': len(items), 'total': len(items), 'pages': 1, 'has_next': False, 'has_prev': False}
+    }
+
+def measure(name, function, repeat, number):
+    best = min(timing(function, number) for _ in range(repeat))
+    print(f"{name:<44} {best * 1000:8.3f} ms")
+    return best
+
+def timing(function, number):
+    started = time.perf_counter()
+    for _ in range(number): function()
+    return (time.perf_counter() - started) / number
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    app = Flask(__name__)
+    rows = raw_rows(args.rows)
+    payload = page(converted(rows))
+    raw_payload = page(rows)
+
+    flask_default = DefaultJSONProvider(app)
+    providers = [('stdlib', FastJSONProvider(app, 'stdlib'))]
+    if orjson is not None: providers.append(('orjson', FastJSONProvider(app, 'orjson')))
+
+    print(f"get_all com {args.rows} registros, média de {args.number} serializações (melhor de {args.repeat})")
+    with app.app_context():
+        baseline = measure('flask padrão (registros convertidos)', lambda: flask_default.dumps(payload).encode(), args.repeat, args.number)
+        for name, provider in providers:
+            fragments = page([provider.encode(item) for item in payload['data']])
+            # Todas as variantes produzem o mesmo documento
+            assert provider.loads(provider.dumps_bytes(payload)) == provider.loads(provider.dumps_bytes(raw_payload)) \
+                == provider.loads(provider.dumps_bytes(fragments)) == flask_default.loads(flask_default.dumps(payload))
+
+            results = [
+                measure(f"{name} (registros convertidos)", lambda: provider.dumps_bytes(payload), args.repeat, args.number),
+                measure(f"{name} (tipos do banco)", lambda: provider.dumps_bytes(raw_payload), args.repeat, args.number),
+                measure(f"{name} (fragmentos pré-codificados)", lambda: provider.dumps_bytes(fragments), args.repeat, args.number)
+            ]
+            print(f"ganho sobre o padrão: {', '.join(f'{baseline / result:.1f}x' for result in results)}")
+
+if __name__ == '__main__':
+    main()
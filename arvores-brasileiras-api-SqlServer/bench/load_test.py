@@ -0,0 +1,559 @@
+"""Carga em todas as rotas GET da API: latência p50/p95/p99, vazão e consultas por requisição
+
+Cria (ou reutiliza) um banco SQLite com volumes configuráveis e dados determinísticos
+e exercita cada rota de leitura dos blueprints (especies, biomas, ocorrencias,
+caracteristicas, curiosidades, dados-arvore, arvores-completa e a busca), com IDs e
+valores de exemplo sorteados a partir de uma semente fixa:
+  - client: Flask test client no próprio processo, várias threads (sem rede);
+  - http: HTTP de verdade, com conexões keep-alive e várias threads, contra o servidor de
+    produção (src/server.py, se o gunicorn ou o waitress estiver instalado; senão o
+    servidor do Werkzeug) iniciado em outro processo sobre o mesmo banco, ou contra um
+    servidor já em execução (--url, qualquer banco).
+As consultas por requisição vêm do cabeçalho Server-Timing (METRICS_ENABLED=true).
+
+Os resultados podem ser gravados como linha de base (bench/baselines/<nome>.json) e
+comparados nas execuções seguintes: p95 ou vazão piores que a tolerância, ou mais
+consultas por requisição, são apontados como regressão (código de saída 1).
+
+Uso:
+    python bench/load_test.py --especies 100000 --ocorrencias 1000000 --save-baseline local
+    python bench/load_test.py --especies 100000 --ocorrencias 1000000 --compare local
+    python bench/load_test.py --mode http --concurrency 32 --requests 500 --route especies
+    python bench/load_test.py --mode http --url http://localhost:5000 --requests 200
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import quote, urlsplit
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import re
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# Muda quando os dados gerados ou o esquema mudam: bancos de versões anteriores são recriados
+SEED_VERSION = 2
+
+BLUEPRINTS = ('especies', 'biomas', 'ocorrencias', 'caracteristicas', 'curiosidades', 'dados_arvore', 'arvores', 'search', 'stats')
+
+NOMES = ('Ipê', 'Jatobá', 'Embaúba', 'Pau-brasil', 'Jequitibá', 'Aroeira', 'Cedro', 'Peroba')
+FAMILIAS = ('Bignoniaceae', 'Fabaceae', 'Urticaceae', 'Lecythidaceae', 'Anacardiaceae', 'Meliaceae', 'Apocynaceae')
+REGIOES = ('Norte', 'Nordeste', 'Centro-Oeste', 'Sudeste', 'Sul')
+BIOMAS = ('Amazônia', 'Cerrado', 'Mata Atlântica', 'Caatinga', 'Pampa', 'Pantanal')
+FREQUENCIAS = ('Comum', 'Rara', 'Ocasional')
+TIPOS_FOLHA = ('Simples', 'Composta', 'Bipinada')
+FLORACOES = ('Primavera', 'Verão', 'Outono', 'Inverno')
+FONTES = ('Embrapa', 'IBF', 'Lorenzi', 'Flora do Brasil')
+
+# Valores sorteados para os parâmetros textuais das rotas
+PATH_SAMPLES = {
+    'familia': FAMILIAS, 'regiao': REGIOES, 'frequencia': FREQUENCIAS, 'tipo_folha': TIPOS_FOLHA, 'fonte': FONTES,
+    'recurso': ('especies', 'biomas', 'ocorrencias', 'caracteristicas', 'curiosidades', 'dados-arvore')
+}
+
+# Tabela de onde vêm os IDs de cada parâmetro inteiro (caracteristicas e dados-arvore: um por espécie)
+ID_TABLES = {
+    'especie_id': 'especies', 'bioma_id': 'biomas', 'ocorrencia_id': 'ocorrencias',
+    'caracteristica_id': 'especies', 'curiosidade_id': 'curiosidades', 'dados_id': 'especies'
+}
+
+# Parâmetros de query das rotas que dependem deles
+ROUTE_QUERIES = {
+    'especies.search_especies': lambda rng: f"nome={quote(rng.choice(NOMES)[:3])}",
+    'especies.autocomplete_especies': lambda rng: f"prefix={quote(rng.choice(NOMES)[:2])}",
+    'biomas.search_biomas': lambda rng: f"nome={quote(rng.choice(BIOMAS)[:4])}",
+    'curiosidades.search_curiosidades': lambda rng: f"texto={quote(rng.choice(NOMES))}",
+    'search.search': lambda rng: f"q={quote(rng.choice(NOMES))}",
+    'arvores.get_arvores_completas': None,  # montada com os IDs sorteados em route_cases
+    'caracteristicas.get_caracteristicas_by_altura_range': lambda rng: f"min={rng.randint(5, 25)}&max={rng.randint(26, 40)}",
+    'dados_arvore.get_dados_arvore_by_tempo_vida_range': lambda rng: f"min={rng.randint(20, 200)}&max={rng.randint(201, 400)}",
+    'dados_arvore.get_dados_arvore_by_crescimento_range': lambda rng: f"min={rng.randint(1, 9) / 10}&max=1.2",
+    'dados_arvore.get_dados_arvore_by_densidade_range': lambda rng: f"min=0.4&max={rng.randint(5, 12) / 10}",
+    'arvores.query_arvores': lambda rng: (
+        f"AlturaMedia__gte={rng.randint(5, 25)}&TempoDeVidaEstimado__lte={rng.randint(100, 400)}"
+        f"&DensidadeMadeira__gte={rng.randint(3, 9) / 10}&sort=-AlturaMedia&per_page=50"
+    )
+}
+
+# Variações das listagens: relacionamentos, páginas profundas, filtros, ordenação e projeção
+LIST_VARIANTS = {
+    'especies.get_especies': (
+        'per_page=20&include_relationships=true',
+        'page={page}&per_page=20',
+        'per_page=50&Familia={familia}',
+        'per_page=50&NomePopular__contains={nome}',
+        'per_page=50&after=&sort=NomePopular',
+        'per_page=50&fields=EspecieID,NomePopular',
+        'per_page=20&count=estimate'
+    ),
+    'ocorrencias.get_ocorrencias': ('per_page=50&BiomaID={bioma}', 'per_page=20&include_relationships=true'),
+    'biomas.get_biomas': ('include_relationships=true',),
+    'dados_arvore.get_dados_arvore': ('per_page=50&CrescimentoAnual__gte=0.8',)
+}
+
+# Agregações de /api/stats medidas além da contagem simples de cada recurso
+STATS_CASES = (
+    '/api/stats/ocorrencias?group_by=Bioma&distinct=EspecieID',
+    '/api/stats/caracteristicas?group_by=Familia&metrics=AlturaMedia,DiametroMedio&percentiles=50,90&bins=10',
+    '/api/stats/dados-arvore?group_by=Familia&metrics=DensidadeMadeira,TempoDeVidaEstimado&percentiles=50'
+)
+
+# Exportações devolvem a tabela inteira: só entram com --exports
+EXPORT_SUFFIX = '.export_'
+
+# ---------------------------------------------------------------- dados
+
+def default_volumes(especies, biomas, ocorrencias, curiosidades):
+    return {
+        'especies': especies,
+        'biomas': biomas,
+        'ocorrencias': ocorrencias if ocorrencias is not None else especies * 10,
+        'curiosidades': curiosidades if curiosidades is not None else especies * 2
+    }
+
+def database_path(volumes):
+    name = '-'.join(f"{volumes[key]}" for key in ('especies', 'biomas', 'ocorrencias', 'curiosidades'))
+    return os.path.join(tempfile.gettempdir(), f"arvores-bench-v{SEED_VERSION}-{name}.db")
+
+def seed(path, volumes, seed_value=42):
+    """Banco SQLite com o esquema da API e `volumes` linhas geradas a partir de uma semente fixa"""
+    rng = random.Random(seed_value)
+    especies, biomas = volumes['especies'], volumes['biomas']
+    partial = path + '.partial'
+    if os.path.exists(partial): os.remove(partial)
+    connection = sqlite3.connect(partial)
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("PRAGMA synchronous = OFF")
+    with open(os.path.join(ROOT, 'src', 'database', 'schema_sqlite.sql'), encoding='utf-8') as file:
+        connection.executescript(file.read())
+
+    connection.executemany(
+        "INSERT INTO Biomas (Nome, Descricao, Regiao) VALUES (?, ?, ?)",
+        ((f"{BIOMAS[i % len(BIOMAS)]}{'' if i < len(BIOMAS) else f' {i}'}", f'Descrição do bioma {i + 1}', REGIOES[i % len(REGIOES)])
+         for i in range(biomas))
+    )
+    connection.executemany(
+        "INSERT INTO Especies (NomeCientifico, NomePopular, Familia, Descricao, DataCadastro) VALUES (?, ?, ?, ?, ?)",
+        ((f'Genus species{i}', f'{rng.choice(NOMES)} {i}', rng.choice(FAMILIAS), f'Descrição da espécie {i}',
+          f'20{rng.randint(15, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:00:00')
+         for i in range(1, especies + 1))
+    )
+    connection.executemany(
+        "INSERT INTO Ocorrencias (EspecieID, BiomaID, Frequencia) VALUES (?, ?, ?)",
+        ((rng.randint(1, especies), rng.randint(1, biomas), rng.choice(FREQUENCIAS)) for _ in range(volumes['ocorrencias']))
+    )
+    connection.executemany(
+        "INSERT INTO Caracteristicas (EspecieID, AlturaMedia, DiametroMedio, TipoFolha, Floracao) VALUES (?, ?, ?, ?, ?)",
+        ((i, f'{rng.uniform(2, 45):.2f}', f'{rng.uniform(0.1, 3):.2f}', rng.choice(TIPOS_FOLHA), rng.choice(FLORACOES))
+         for i in range(1, especies + 1))
+    )
+    connection.executemany(
+        "INSERT INTO Curiosidades (EspecieID, Texto, Fonte) VALUES (?, ?, ?)",
+        ((rng.randint(1, especies), f'Curiosidade {i} sobre o {rng.choice(NOMES)}', rng.choice(FONTES))
+         for i in range(1, volumes['curiosidades'] + 1))
+    )
+    connection.executemany(
+        "INSERT INTO DadosArvore (EspecieID, TempoDeVidaEstimado, CrescimentoAnual, RaizProfundidadeMedia, DensidadeMadeira) "
+        "VALUES (?, ?, ?, ?, ?)",
+        ((i, rng.randint(20, 400), f'{rng.uniform(0.1, 1.5):.2f}', f'{rng.uniform(0.5, 8):.2f}',
+          None if rng.random() < 0.1 else f'{rng.uniform(0.3, 1.2):.2f}')
+         for i in range(1, especies + 1))
+    )
+    connection.commit()
+    connection.execute("ANALYZE")
+    connection.close()
+    os.replace(partial, path)
+
+# ---------------------------------------------------------------- rotas
+
+def route_rules():
+    """Regras GET dos blueprints de dados, registradas em uma aplicação vazia (sem abrir o banco)"""
+    from flask import Flask
+    from src.routes.especies import especies_bp
+    from src.routes.biomas import biomas_bp
+    from src.routes.ocorrencias import ocorrencias_bp
+    from src.routes.caracteristicas import caracteristicas_bp
+    from src.routes.curiosidades import curiosidades_bp
+    from src.routes.dados_arvore import dados_arvore_bp
+    from src.routes.arvores import arvores_bp
+    from src.routes.search import search_bp
+    from src.routes.stats import stats_bp
+
+    app = Flask(__name__)
+    for blueprint in (especies_bp, biomas_bp, ocorrencias_bp, caracteristicas_bp, curiosidades_bp, dados_arvore_bp, arvores_bp, search_bp, stats_bp):
+        app.register_blueprint(blueprint, url_prefix='/api')
+    rules = [rule for rule in app.url_map.iter_rules()
+             if 'GET' in rule.methods and rule.endpoint.split('.')[0] in BLUEPRINTS]
+    return sorted(rules, key=lambda rule: rule.rule)
+
+class RouteCase:
+    """Uma rota (ou variação de listagem) e o sorteio das URLs de cada requisição"""
+
+    def __init__(self, label, build):
+        self.label = label
+        self.build = build
+
+    def urls(self, count, rng):
+        return [self.build(rng) for _ in range(count)]
+
+def route_cases(volumes, exports=False, only=None):
+    def random_id(table):
+        return lambda rng: rng.randint(1, max(1, volumes[table]))
+
+    def sample_values(rng):
+        return {
+            'page': rng.randint(1, max(1, volumes['especies'] // 20)),
+            'familia': quote(rng.choice(FAMILIAS)),
+            'nome': quote(rng.choice(NOMES)[:4]),
+            'bioma': rng.randint(1, max(1, volumes['biomas']))
+        }
+
+    cases = []
+    for rule in route_rules():
+        if EXPORT_SUFFIX in rule.endpoint and not exports: continue
+        table = rule.endpoint.split('.')[0].replace('_', '-')
+        if only and not any(name in (table, rule.endpoint) for name in only): continue
+
+        values = {}
+        for name, converter in rule._converters.items():
+            if type(converter).__name__ == 'IntegerConverter':
+                values[name] = random_id(ID_TABLES.get(name, 'especies'))
+            else:
+                values[name] = (lambda samples: lambda rng: quote(rng.choice(samples)))(PATH_SAMPLES.get(name, ('a',)))
+        path = rule.rule
+        query = ROUTE_QUERIES.get(rule.endpoint)
+        if rule.endpoint == 'arvores.get_arvores_completas':
+            query = lambda rng: 'ids=' + ','.join(str(rng.randint(1, volumes['especies'])) for _ in range(10))
+
+        def build(rng, path=path, values=values, query=query):
+            url = re.sub(r'<(?:\w+:)?(\w+)>', lambda match: str(values[match.group(1)](rng)), path)
+            return f"{url}?{query(rng)}" if query else url
+
+        # Rótulo estável (chave da linha de base): caminho da regra e nomes dos parâmetros
+        cases.append(RouteCase(f"{path}?{re.sub(r'=[^&]*', '=*', query(random.Random(0)))}" if query else path, build))
+
+        for variant in LIST_VARIANTS.get(rule.endpoint, ()):
+            cases.append(RouteCase(
+                f"{path}?{re.sub(r'{[a-z]+}', '*', variant)}",
+                lambda rng, path=path, variant=variant: f"{path}?{variant.format(**sample_values(rng))}"
+            ))
+    if not only or 'stats' in only:
+        cases.extend(RouteCase(url, lambda rng, url=url: url) for url in STATS_CASES)
+    return cases
+
+# ---------------------------------------------------------------- clientes
+
+QUERIES_PATTERN = re.compile(r'desc="(\d+) consultas"')
+
+def queries_of(server_timing):
+    match = QUERIES_PATTERN.search(server_timing or '')
+    return int(match.group(1)) if match else None
+
+class TestClientTransport:
+    """Requisições pelo Flask test client, uma instância por thread"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def get(self, url):
+        client = getattr(self._local, 'client', None)
+        if client is None: client = self._local.client = self.app.test_client()
+        response = client.get(url)
+        response.get_data()
+        response.close()
+        return response.status_code, response.headers.get('Server-Timing')
+
+    def close(self):
+        pass
+
+class HTTPTransport:
+    """Requisições HTTP/1.1 com uma conexão keep-alive por thread"""
+
+    def __init__(self, base_url, timeout=60):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            with self._lock: self._connections.append(connection)
+        return connection
+
+    def get(self, url):
+        for attempt in (1, 2):
+            connection = self._connection()
+            try:
+                connection.request('GET', self.prefix + url)
+                response = connection.getresponse()
+                response.read()
+                return response.status, response.getheader('Server-Timing')
+            except (ConnectionError, http.client.HTTPException):
+                # O servidor fechou a conexão ociosa (keep-alive expirado): reabre uma vez
+                connection.close()
+                self._local.connection = None
+                if attempt == 2: raise
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections: connection.close()
+
+# ---------------------------------------------------------------- servidor
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def production_server_available():
+    for module in ('gunicorn', 'waitress'):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            pass
+    return False
+
+def start_server(env, server, workers, threads):
+    """Inicia a API em outro processo e espera /api/health responder; retorna (processo, URL)"""
+    port = free_port()
+    env = dict(env, SERVER_HOST='127.0.0.1', SERVER_PORT=str(port), SERVER_THREADS=str(threads))
+    if workers: env['WEB_CONCURRENCY'] = str(workers)
+    if server == 'auto': server = 'production' if production_server_available() else 'werkzeug'
+    command = ([sys.executable, os.path.join(ROOT, 'src', 'server.py')] if server == 'production'
+               else [sys.executable, os.path.abspath(__file__), '--serve-werkzeug', str(port)])
+    process = subprocess.Popen(command, env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None: raise RuntimeError(f"O servidor ({server}) terminou com código {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/api/health')
+            if connection.getresponse().status == 200: return process, f"http://127.0.0.1:{port}", server
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("O servidor não respondeu a /api/health em 120 s")
+
+def serve_werkzeug(port):
+    """Processo filho do modo http sem gunicorn/waitress: servidor do Werkzeug com threads"""
+    from werkzeug.serving import make_server
+    from src.main import create_app
+    make_server('127.0.0.1', port, create_app('production'), threaded=True).serve_forever()
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+# ---------------------------------------------------------------- medição
+
+def percentile(ordered, fraction):
+    """Percentil pelo posto mais próximo (amostras ordenadas)"""
+    if not ordered: return None
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def summarize(latencies, elapsed, statuses, queries):
+    ordered = sorted(latencies)
+    counted = [value for value in queries if value is not None]
+    return {
+        'requests': len(latencies),
+        'errors': sum(status >= 500 for status in statuses),
+        'not_found': sum(status == 404 for status in statuses),
+        'throughput': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3) if ordered else None,
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3) if ordered else None,
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3) if ordered else None,
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3) if ordered else None,
+        'max_ms': round(ordered[-1] * 1000, 3) if ordered else None,
+        'queries_per_request': round(sum(counted) / len(counted), 2) if counted else None
+    }
+
+def measure(transport, urls, concurrency):
+    """Executa `urls` com `concurrency` threads; devolve as latências, status e consultas de cada uma"""
+    def call(url):
+        started = time.perf_counter()
+        status, server_timing = transport.get(url)
+        return time.perf_counter() - started, status, queries_of(server_timing)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool: results = list(pool.map(call, urls))
+    elapsed = time.perf_counter() - started
+    return [r[0] for r in results], elapsed, [r[1] for r in results], [r[2] for r in results]
+
+def run_cases(transport, cases, requests, concurrency, warmup, seed_value):
+    report, latencies, statuses, queries, elapsed = {}, [], [], [], 0.0
+    print(f"{'rota':<72} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'cons.':>6} {'erros':>5}")
+    for case in cases:
+        rng = random.Random(f"{seed_value}:{case.label}")
+        if warmup: measure(transport, case.urls(warmup, rng), min(concurrency, warmup))
+        case_latencies, case_elapsed, case_statuses, case_queries = measure(transport, case.urls(requests, rng), concurrency)
+        summary = report[case.label] = summarize(case_latencies, case_elapsed, case_statuses, case_queries)
+        latencies += case_latencies
+        statuses += case_statuses
+        queries += case_queries
+        elapsed += case_elapsed
+        per_request = summary['queries_per_request']
+        print(
+            f"{case.label[:72]:<72} {summary['throughput']:>8.1f} {summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f} "
+            f"{summary['p99_ms']:>8.2f} {per_request if per_request is not None else '-':>6} {summary['errors']:>5}"
+        )
+    return report, summarize(latencies, elapsed, statuses, queries)
+
+# ---------------------------------------------------------------- linha de base
+
+def baseline_path(name):
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, f"{name}.json")
+
+def save_baseline(name, result):
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file: json.dump(result, file, ensure_ascii=False, indent=2)
+    print(f"Linha de base gravada em {path}")
+
+def compare_baseline(name, result, tolerance, min_delta_ms):
+    """Regressões em relação à linha de base: p95 e vazão além da tolerância, mais consultas por requisição"""
+    with open(baseline_path(name), encoding='utf-8') as file: baseline = json.load(file)
+    for key in ('mode', 'volumes', 'seed', 'concurrency'):
+        if baseline.get(key) != result.get(key):
+            print(f"Aviso: '{key}' difere da linha de base ({baseline.get(key)} x {result.get(key)})")
+
+    regressions = []
+    for label, current in result['routes'].items():
+        previous = baseline['routes'].get(label)
+        if previous is None: continue
+        if (previous['p95_ms'] is not None and current['p95_ms'] is not None
+                and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance)
+                and current['p95_ms'] - previous['p95_ms'] > min_delta_ms):
+            regressions.append(f"{label}: p95 {previous['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+        if previous['throughput'] and current['throughput'] < previous['throughput'] * (1 - tolerance):
+            regressions.append(f"{label}: vazão {previous['throughput']:.1f} -> {current['throughput']:.1f} req/s")
+        if (previous['queries_per_request'] is not None and current['queries_per_request'] is not None
+                and current['queries_per_request'] > previous['queries_per_request'] + 0.01):
+            regressions.append(
+                f"{label}: consultas por requisição {previous['queries_per_request']} -> {current['queries_per_request']}"
+            )
+        if current['errors'] > previous['errors']:
+            regressions.append(f"{label}: erros {previous['errors']} -> {current['errors']}")
+
+    missing = sorted(set(baseline['routes']) - set(result['routes']))
+    if missing: print(f"{len(missing)} rota(s) da linha de base não executada(s) nesta rodada")
+    for line in regressions: print(f"REGRESSÃO {line}")
+    print("Sem regressões em relação a " + baseline_path(name) if not regressions else f"{len(regressions)} regressão(ões)")
+    return regressions
+
+# ---------------------------------------------------------------- execução
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=('client', 'http'), default='client')
+    parser.add_argument('--url', help='Servidor já em execução (modo http); sem --url a API é iniciada sobre o banco gerado')
+    parser.add_argument('--server', choices=('auto', 'production', 'werkzeug'), default='auto',
+                        help='Servidor iniciado no modo http (auto: src/server.py se houver gunicorn/waitress)')
+    parser.add_argument('--workers', type=int, help='Processos do servidor iniciado (WEB_CONCURRENCY)')
+    parser.add_argument('--threads', type=int, default=8, help='Threads por processo do servidor iniciado')
+    parser.add_argument('--especies', type=int, default=10000)
+    parser.add_argument('--biomas', type=int, default=6)
+    parser.add_argument('--ocorrencias', type=int, help='Padrão: 10 por espécie')
+    parser.add_argument('--curiosidades', type=int, help='Padrão: 2 por espécie')
+    parser.add_argument('--db', help='Arquivo SQLite (padrão: no diretório temporário, por volume)')
+    parser.add_argument('--reseed', action='store_true', help='Recria o banco mesmo se já existir')
+    parser.add_argument('--requests', type=int, default=200, help='Requisições medidas por rota')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=10, help='Requisições de aquecimento por rota')
+    parser.add_argument('--route', action='append', help='Só os blueprints/endpoints indicados (pode repetir)')
+    parser.add_argument('--exports', action='store_true', help='Inclui as exportações (tabela inteira)')
+    parser.add_argument('--cache', action='store_true', help='Mantém o cache de respostas ligado')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Grava o relatório completo em JSON')
+    parser.add_argument('--save-baseline', metavar='NOME', help='Grava o resultado em bench/baselines/NOME.json')
+    parser.add_argument('--compare', metavar='NOME', help='Compara com bench/baselines/NOME.json')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Piora relativa aceita no p95 e na vazão')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help='Piora absoluta mínima do p95 para regressão')
+    parser.add_argument('--serve-werkzeug', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve_werkzeug: return serve_werkzeug(args.serve_werkzeug)
+    if args.url and args.mode != 'http': parser.error('--url exige --mode http')
+
+    volumes = default_volumes(args.especies, args.biomas, args.ocorrencias, args.curiosidades)
+    env = dict(os.environ)
+    if not args.url:
+        db_path = args.db or database_path(volumes)
+        if args.reseed or not os.path.exists(db_path):
+            started = time.perf_counter()
+            print(f"Gerando {db_path}: " + ', '.join(f"{count} {table}" for table, count in volumes.items()))
+            seed(db_path, volumes, args.seed)
+            print(f"Banco gerado em {time.perf_counter() - started:.1f} s")
+        env.update(DB_ENGINE='sqlite', SQLITE_PATH=db_path, METRICS_ENABLED='true', SERVER_TIMING_ENABLED='true')
+        # O cache de respostas esconderia o custo do banco
+        if not args.cache: env['CACHE_ENABLED'] = 'false'
+        os.environ.update(env)
+
+    cases = route_cases(volumes, args.exports, args.route)
+    process, server = None, None
+    if args.mode == 'client':
+        from src.main import create_app
+        transport = TestClientTransport(create_app('production'))
+    elif args.url:
+        transport = HTTPTransport(args.url)
+    else:
+        process, base_url, server = start_server(env, args.server, args.workers, args.threads)
+        transport = HTTPTransport(base_url)
+
+    target = args.url or f"{args.mode}{f' ({server})' if server else ''}"
+    print(f"{len(cases)} rotas, {args.requests} requisições por rota, {args.concurrency} simultâneas, alvo: {target}")
+    try:
+        routes, overall = run_cases(transport, cases, args.requests, args.concurrency, args.warmup, args.seed)
+    finally:
+        transport.close()
+        if process is not None: stop_server(process)
+
+    print(
+        f"Total: {overall['requests']} requisições, {overall['throughput']:.1f} req/s, p50 {overall['p50_ms']:.2f} ms, "
+        f"p95 {overall['p95_ms']:.2f} ms, p99 {overall['p99_ms']:.2f} ms, "
+        f"{overall['queries_per_request']} consultas por requisição, {overall['errors']} erros"
+    )
+    result = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'mode': args.mode if not server else f"{args.mode}/{server}",
+        'target': args.url,
+        'volumes': None if args.url else volumes,
+        'seed': args.seed,
+        'concurrency': args.concurrency,
+        'requests_per_route': args.requests,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'overall': overall,
+        'routes': routes
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file: json.dump(result, file, ensure_ascii=False, indent=2)
+    if args.save_baseline: save_baseline(args.save_baseline, result)
+    if args.compare and compare_baseline(args.compare, result, args.tolerance, args.min_delta_ms): sys.exit(1)
+
+if __name__ == '__main__':
+    main()
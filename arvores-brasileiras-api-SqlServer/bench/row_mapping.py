@@ -0,0 +1,112 @@
+"""Micro-benchmark da conversão de linhas em dicionários (sem banco)
+
+Compara, sobre linhas sintéticas com o formato das tabelas DadosArvore (inteiros,
+DECIMAL e data) e Ocorrencias (inteiros e texto), o `to_dict` escrito à mão por
+acesso posicional, chamado linha a linha como nos modelos, com os conversores
+compilados de `RowMapper` (por linha e para a lista inteira).
+
+Uso:
+    python bench/row_mapping.py --rows 100000
+"""
+from datetime import datetime
+from decimal import Decimal
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.filters import Field
+from src.models.rows import RowMapper
+
+DADOS_SPECS = {
+    'DadosID': Field(int, indexed=True),
+    'EspecieID': Field(int, indexed=True),
+    'TempoDeVidaEstimado': Field(int),
+    'CrescimentoAnual': Field(Decimal),
+    'RaizProfundidadeMedia': Field(Decimal),
+    'DensidadeMadeira': Field(Decimal),
+    'DataCadastro': Field(datetime)
+}
+
+OCORRENCIAS_SPECS = {
+    'OcorrenciaID': Field(int, indexed=True),
+    'EspecieID': Field(int, indexed=True),
+    'BiomaID': Field(int, indexed=True),
+    'Frequencia': Field(str)
+}
+
+def description(specs):
+    """cursor.description do pyodbc: (nome, tipo Python, ...)"""
+    return tuple((name, spec.type, None, None, None, None, True) for name, spec in specs.items())
+
+def dados_rows(count):
+    cadastro = datetime(2024, 1, 1, 10, 30)
+    return [
+        (i, i % 500, 50 + i % 300, Decimal('0.35') + i % 10, Decimal('1.5'), None if i % 7 == 0 else Decimal('0.72'), cadastro)
+        for i in range(count)
+    ]
+
+def ocorrencias_rows(count):
+    return [(i, i % 500, 1 + i % 6, ('Comum', 'Rara')[i % 2]) for i in range(count)]
+
+class HandWritten:
+    """Estilo anterior dos modelos: acesso posicional e conversão campo a campo"""
+
+    def dados_to_dict(self, row):
+        if not row: return None
+        return {
+            'DadosID': row[0],
+            'EspecieID': row[1],
+            'TempoDeVidaEstimado': row[2],
+            'CrescimentoAnual': float(row[3]) if row[3] is not None else None,
+            'RaizProfundidadeMedia': float(row[4]) if row[4] is not None else None,
+            'DensidadeMadeira': float(row[5]) if row[5] is not None else None,
+            'DataCadastro': row[6].isoformat() if row[6] else None
+        }
+
+    def ocorrencias_to_dict(self, row):
+        if not row: return None
+        return {
+            'OcorrenciaID': row[0],
+            'EspecieID': row[1],
+            'BiomaID': row[2],
+            'Frequencia': row[3]
+        }
+
+def measure(name, function, repeat):
+    best = min(timing(function) for _ in range(repeat))
+    print(f"{name:<32} {best * 1000:9.1f} ms")
+    return best
+
+def timing(function):
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+def compare(table, specs, rows, to_dict, repeat):
+    mapper = RowMapper(specs)
+    cursor_description = description(specs)
+    convert = mapper.converter(cursor_description)
+    assert [to_dict(row) for row in rows[:100]] == mapper.convert_all(cursor_description, rows[:100])
+
+    print(f"-- {table}")
+    baseline = measure('to_dict manual', lambda: [to_dict(row) for row in rows], repeat)
+    per_row = measure('conversor compilado (por linha)', lambda: [convert(row) for row in rows], repeat)
+    whole = measure('conversor compilado (lista)', lambda: mapper.convert_all(cursor_description, rows), repeat)
+    print(f"ganho: {baseline / per_row:.2f}x por linha, {baseline / whole:.2f}x na lista")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{args.rows} linhas, melhor de {args.repeat} execuções")
+    hand_written = HandWritten()
+    compare('DadosArvore', DADOS_SPECS, dados_rows(args.rows), hand_written.dados_to_dict, args.repeat)
+    compare('Ocorrencias', OCORRENCIAS_SPECS, ocorrencias_rows(args.rows), hand_written.ocorrencias_to_dict, args.repeat)
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,19 @@
 Msgbox = [
     "Endpoints disponíveis:", "- GET /api/health - Status da API",
     "- GET /api/info - Informações da API", "- GET /api/database/test - Teste de conexão",
+    "- GET /api/database/pool - Estatísticas do pool de conexões",
+    "- GET /api/database/executor - Estatísticas do executor do caminho ASGI",
+    "- GET /api/cache/stats - Estatísticas do cache de respostas",
+    "- GET /api/compression/stats - Estatísticas da compressão de respostas",
+    "- GET /api/metrics - Consultas por requisição, tempo de banco e histogramas por endpoint",
+    "- GET /api/snapshot/stats - Estado da réplica em memória",
     "- CRUD /api/especies - Gerenciar espécies", "- CRUD /api/biomas - Gerenciar biomas",
     "- CRUD /api/ocorrencias - Gerenciar ocorrências", "- CRUD /api/caracteristicas - Gerenciar características",
     "- CRUD /api/curiosidades - Gerenciar curiosidades", "- CRUD /api/dados-arvore - Gerenciar dados das árvores",
+    "- GET /api/search?q= - Busca textual em espécies e curiosidades",
+    "- GET /api/especies/autocomplete?prefix= - Sugestões de nomes de espécies",
+    "- GET /api/arvores/query - Medidas das árvores por faixas combinadas, com paginação e ordenação",
+    "- GET /api/stats/<recurso> - Contagens, médias, percentis e histogramas por grupo",
+    "- GET /api/<tabela>/export - Exportação em streaming (ndjson, json ou csv)",
     "Documentação disponível em .../api/info",
 ]
\ No newline at end of file
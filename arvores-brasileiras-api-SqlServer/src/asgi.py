@@ -0,0 +1,161 @@
+"""Ponto de entrada ASGI da API (ex.: `uvicorn src.asgi:app --workers 4`)
+
+O loop de eventos cuida das conexões HTTP (keep-alive, clientes lentos, upload do
+corpo) sem ocupar threads; cada requisição é despachada para a aplicação Flask no
+executor limitado do banco, onde as views (e as chamadas bloqueantes do pyodbc)
+rodam. Nesse caminho as consultas independentes de uma requisição, como os
+relacionamentos de `include_relationships`, são feitas em paralelo.
+"""
+from contextvars import copy_context
+from tempfile import SpooledTemporaryFile
+from src.database.executor import db_executor, parallel_queries
+import os
+import sys
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Corpos de requisição maiores que isso vão para um arquivo temporário em vez da memória
+MAX_BODY_IN_MEMORY = 1024 * 1024
+
+class AsgiApp:
+    """Adaptador ASGI para uma aplicação WSGI (Flask) com o trabalho bloqueante no `DatabaseExecutor`
+
+    `max_pending` limita as requisições em andamento no processo; além dele a resposta
+    é 503 imediato, em vez de uma fila crescente de requisições esperando o executor.
+    """
+
+    def __init__(self, wsgi_app, executor=db_executor, max_pending=1000, parallel=True):
+        self.wsgi_app = wsgi_app
+        self.executor = executor
+        self.max_pending = max_pending
+        self.parallel = parallel
+        self._pending = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan': await self._lifespan(receive, send)
+        elif scope['type'] == 'http': await self._http(scope, receive, send)
+        else: raise ValueError(f"Tipo de conexão ASGI não suportado: {scope['type']}")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        if self._pending >= self.max_pending:
+            await self._send_overloaded(send)
+            return
+
+        self._pending += 1
+        try:
+            body = await self._read_body(receive)
+            if body is None: return  # cliente desconectou antes de enviar o corpo
+            with body:
+                await self._respond(self.environ(scope, body), send)
+        finally:
+            self._pending -= 1
+
+    @staticmethod
+    async def _read_body(receive):
+        body = SpooledTemporaryFile(max_size=MAX_BODY_IN_MEMORY)
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                body.close()
+                return None
+            body.write(message.get('body', b''))
+            if not message.get('more_body', False): break
+        body.seek(0)
+        return body
+
+    async def _respond(self, environ, send):
+        # Um único contexto para a requisição inteira: a view e a iteração da resposta
+        # (streaming com stream_with_context) veem as mesmas variáveis de contexto
+        context = copy_context()
+        if self.parallel: context.run(parallel_queries.set, True)
+
+        started = {}
+        def write(data): raise NotImplementedError("write() do WSGI não é suportado; retorne um iterável")
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+            return write
+
+        result = await self.executor.run(context.run, self.wsgi_app, environ, start_response)
+        try:
+            iterator = iter(result)
+            chunk = await self.executor.run(context.run, next, iterator, None)
+            await send({'type': 'http.response.start', 'status': started['status'], 'headers': started['headers']})
+            while chunk is not None:
+                if chunk: await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                chunk = await self.executor.run(context.run, next, iterator, None)
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            close = getattr(result, 'close', None)
+            if close is not None: await self.executor.run(context.run, close)
+
+    @staticmethod
+    async def _send_overloaded(send):
+        body = b'{"error": "Servidor sobrecarregado, tente novamente"}'
+        await send({
+            'type': 'http.response.start', 'status': 503,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode()), (b'retry-after', b'1')]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    def environ(scope, body):
+        """Monta o environ WSGI (PEP 3333) de uma requisição HTTP ASGI"""
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+            # O corpo já foi lido por inteiro: pode ser consumido mesmo sem Content-Length
+            'wsgi.input_terminated': True
+        }
+        for name, value in scope.get('headers', ()):
+            name, value = name.decode('latin-1'), value.decode('latin-1')
+            if name == 'content-type': key = 'CONTENT_TYPE'
+            elif name == 'content-length': key = 'CONTENT_LENGTH'
+            else: key = 'HTTP_' + name.upper().replace('-', '_')
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+def create_asgi_app(config_name=None):
+    """Cria a aplicação Flask e a expõe como aplicação ASGI"""
+    from src.main import create_app
+    flask_app = create_app(config_name or os.environ.get('FLASK_ENV', 'development'))
+    return AsgiApp(
+        flask_app,
+        max_pending=int(os.environ.get('ASGI_MAX_PENDING', 1000)),
+        parallel=os.environ.get('ASGI_PARALLEL_QUERIES', 'true').lower() == 'true'
+    )
+
+def __getattr__(name):
+    # `app` é criada no primeiro acesso (pelo servidor ASGI), e não ao importar o módulo
+    if name == 'app':
+        global app
+        app = create_asgi_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
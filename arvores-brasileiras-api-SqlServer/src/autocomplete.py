@@ -0,0 +1,161 @@
+from bisect import bisect_left, insort
+from src.database.versions import table_versions
+from src.models.filters import fold
+from src.models.especies import especies_model
+from src.models.ocorrencias import ocorrencias_model
+import heapq
+import os
+import re
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+ORDER_POPULARITY = 'popularity'
+ORDER_ALPHA = 'alpha'
+ORDERS = (ORDER_POPULARITY, ORDER_ALPHA)
+
+# Início de cada palavra do nome ("Ipê-amarelo" também é encontrado por "amarelo")
+WORD_START = re.compile(r'(?<![^\W_])\w')
+
+class Autocomplete:
+    """Sugestões por prefixo dos nomes das espécies, servidas de arrays ordenados em memória
+
+    `entries` guarda tuplas (texto normalizado, EspecieID, campo) ordenadas; um prefixo
+    corresponde a um intervalo contíguo do array, localizado com bisect. Cada nome
+    entra uma vez por início de palavra. A popularidade de uma espécie é o número de
+    ocorrências (biomas) registradas para ela.
+    """
+
+    FIELDS = ('NomePopular', 'NomeCientifico')
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.entries = []         # (texto normalizado, EspecieID, campo), em ordem
+        self.species = {}         # EspecieID -> {'EspecieID', 'NomePopular', 'NomeCientifico'}
+        self.popularity = {}      # EspecieID -> número de ocorrências
+        self.name_keys = {}       # (EspecieID, campo) -> chave de ordenação alfabética do nome
+        self.ready = False
+        self._lock = threading.RLock()
+        table_versions.subscribe(self._on_write)
+
+    # Construção e manutenção
+
+    def build(self):
+        """Carrega nomes e popularidade do banco; em caso de falha as sugestões usam o banco"""
+        try:
+            records = [record for chunk in especies_model.iter_rows() for record in chunk]
+            popularity = ocorrencias_model.count_by_especie()
+            with self._lock:
+                self.entries, self.species, self.name_keys = [], {}, {}
+                for record in records:
+                    self._add(record, sort=False)
+                self.entries.sort()
+                self.popularity = popularity
+                self.ready = True
+        except Exception as e:
+            logger.error(f"Erro ao construir autocomplete de espécies: {e}")
+            self.ready = False
+
+    def _on_write(self, table, ids):
+        if not self.ready: return
+        if table == ocorrencias_model.table_name:
+            popularity = ocorrencias_model.count_by_especie()
+            with self._lock: self.popularity = popularity
+        elif table == especies_model.table_name:
+            if ids is None:
+                self.build()
+                return
+            records = especies_model.get_many(ids)
+            with self._lock:
+                for especie_id in ids:
+                    self._remove(especie_id)
+                for record in records:
+                    self._add(record)
+
+    @staticmethod
+    def _keys(record):
+        for field in Autocomplete.FIELDS:
+            name = fold(record.get(field) or '')
+            for match in WORD_START.finditer(name):
+                yield name[match.start():], field
+
+    def _add(self, record, sort=True):
+        especie_id = record['EspecieID']
+        self.species[especie_id] = {
+            'EspecieID': especie_id,
+            'NomePopular': record.get('NomePopular'),
+            'NomeCientifico': record.get('NomeCientifico')
+        }
+        for field in self.FIELDS:
+            # Ordem alfabética de exibição: sem acento/caixa (não é ordenação de paginação)
+            self.name_keys[(especie_id, field)] = fold(record.get(field) or '')
+        for text, field in self._keys(record):
+            if sort: insort(self.entries, (text, especie_id, field))
+            else: self.entries.append((text, especie_id, field))
+
+    def _remove(self, especie_id):
+        record = self.species.pop(especie_id, None)
+        if record is None: return
+        for field in self.FIELDS:
+            self.name_keys.pop((especie_id, field), None)
+        for text, field in self._keys(record):
+            position = bisect_left(self.entries, (text, especie_id, field))
+            if position < len(self.entries) and self.entries[position] == (text, especie_id, field):
+                del self.entries[position]
+
+    # Consulta
+
+    def _matches(self, prefix):
+        """Espécies cujo nome (ou alguma palavra do nome) começa com o prefixo, com o campo casado"""
+        entries = self.entries
+        matches = {}
+        for position in range(bisect_left(entries, (prefix,)), len(entries)):
+            text, especie_id, field = entries[position]
+            if not text.startswith(prefix): break
+            # NomePopular tem preferência quando os dois nomes casam
+            if matches.get(especie_id) != 'NomePopular': matches[especie_id] = field
+        return matches
+
+    def suggest(self, prefix, limit=10, order=ORDER_POPULARITY):
+        """Até `limit` sugestões para o prefixo, por popularidade ou em ordem alfabética"""
+        text = prefix.strip()
+        if not text: return []
+        if not self.ready: return self._fallback(text, limit)
+        prefix = fold(text)
+
+        with self._lock:
+            matches = self._matches(prefix)
+
+            def name_key(especie_id):
+                return self.name_keys[(especie_id, matches[especie_id])]
+
+            if order == ORDER_ALPHA:
+                chosen = heapq.nsmallest(limit, matches, key=lambda especie_id: (name_key(especie_id), especie_id))
+            else:
+                chosen = heapq.nsmallest(limit, matches, key=lambda especie_id: (
+                    -self.popularity.get(especie_id, 0), name_key(especie_id), especie_id
+                ))
+
+            return [
+                dict(self.species[especie_id], match=matches[especie_id], popularity=self.popularity.get(especie_id, 0))
+                for especie_id in chosen
+            ]
+
+    def _fallback(self, prefix, limit):
+        """Sem o índice: prefixo do nome popular no banco (usa o índice da coluna)"""
+        result = especies_model.get_all(per_page=limit, filters={'NomePopular__prefix': prefix}, count='false', sort='NomePopular')
+        return [
+            {
+                'EspecieID': record['EspecieID'], 'NomePopular': record['NomePopular'],
+                'NomeCientifico': record['NomeCientifico'], 'match': 'NomePopular', 'popularity': None
+            }
+            for record in result['data']
+        ]
+
+    def stats(self):
+        with self._lock:
+            return {'enabled': self.enabled, 'ready': self.ready, 'species': len(self.species), 'entries': len(self.entries)}
+
+# Instância global do autocomplete de espécies
+especies_autocomplete = Autocomplete(enabled=os.environ.get('AUTOCOMPLETE_ENABLED', 'true').lower() == 'true')
@@ -0,0 +1,329 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, make_response, request
+from src.database.versions import table_versions
+from src.compression import encoded_etag, response_compressor
+import hashlib
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+def content_etag(body):
+    """ETag forte derivado do conteúdo: igual em todos os processos para o mesmo corpo"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+class Validator:
+    """Validador HTTP (ETag) de uma resposta
+
+    Sem Last-Modified: a data da última escrita só seria conhecida pelo processo
+    que a fez, e um If-Modified-Since comparado com ela poderia confirmar (304)
+    uma representação que outro processo já alterou.
+    """
+    __slots__ = ('etag',)
+
+    def __init__(self, etag):
+        self.etag = etag
+
+    def matches(self):
+        """Verifica se a requisição condicional atual pode ser respondida com 304"""
+        if request.if_none_match:
+            # O cliente pode ter guardado a representação comprimida (ETag com sufixo da codificação)
+            return request.if_none_match.contains(self.etag) or any(
+                request.if_none_match.contains(encoded_etag(self.etag, encoding))
+                for encoding in response_compressor.encodings
+            )
+        return False
+
+    def apply(self, response):
+        response.set_etag(self.etag)
+        # Clientes e proxies podem guardar a resposta, mas devem revalidá-la a cada uso
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def not_modified(self):
+        return self.apply(Response(status=304))
+
+class CachedResponse:
+    """Resposta HTTP armazenada no cache (corpo já serializado e, se grande, já comprimido)"""
+    __slots__ = ('body', 'status', 'mimetype', 'headers', 'validator', 'variants')
+
+    # Cabeçalhos da resposta original preservados no cache
+    KEPT_HEADERS = ('X-Total-Count', 'X-Next-Cursor', 'Link')
+
+    def __init__(self, body, status, mimetype, headers=None, validator=None, variants=None):
+        self.body = body
+        self.status = status
+        self.mimetype = mimetype
+        self.headers = headers or {}
+        self.validator = validator
+        self.variants = variants or {}   # codificação -> corpo comprimido
+
+    @classmethod
+    def from_response(cls, response, validator=None):
+        headers = {name: response.headers[name] for name in cls.KEPT_HEADERS if name in response.headers}
+        body = response.get_data()
+        variants = response_compressor.precompress(body) if response_compressor.compressible(response.mimetype) else None
+        return cls(body, response.status_code, response.mimetype, headers, validator, variants)
+
+    @property
+    def size(self):
+        return len(self.body) + sum(len(variant) for variant in self.variants.values())
+
+    def to_response(self, encoding=None):
+        """Resposta com o corpo na codificação pedida, se houver versão comprimida dela"""
+        variant = self.variants.get(encoding)
+        response = Response(self.body if variant is None else variant, self.status, mimetype=self.mimetype)
+        response.headers.update(self.headers)
+        if self.validator is not None: self.validator.apply(response)
+        if variant is not None: response_compressor.mark(response, encoding)
+        return response
+
+class CacheBackend(ABC):
+    """Interface de armazenamento do cache de respostas
+
+    Implementações compartilhadas entre processos (ex.: Redis, memcached)
+    devem respeitar a mesma semântica: entradas com TTL e marcadas com as
+    tabelas de que dependem, removidas por `invalidate(tabela)`.
+    """
+
+    @abstractmethod
+    def get(self, key): pass
+    @abstractmethod
+    def set(self, key, value, ttl, tags=()): pass
+    @abstractmethod
+    def invalidate(self, tag): pass
+    @abstractmethod
+    def clear(self): pass
+    def stats(self): return {}
+
+class LRUCache(CacheBackend):
+    """Cache em memória do processo com TTL, orçamento em bytes e política LRU"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_entries=10000):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # chave -> (valor, expira_em, tags)
+        self._tags = {}                 # tag -> conjunto de chaves
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, tags = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl, tags=()):
+        size = value.size
+        if size > self.max_bytes: return False
+
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if key in self._entries: self._remove(key)
+
+            while self._entries and (self._bytes + size > self.max_bytes or len(self._entries) >= self.max_entries):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+            self._entries[key] = (value, expires_at, tuple(tags))
+            self._bytes += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+        return True
+
+    def invalidate(self, tag):
+        with self._lock:
+            keys = self._tags.pop(tag, ())
+            for key in list(keys):
+                if key in self._entries:
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        value, _, tags = self._entries.pop(key)
+        self._bytes -= value.size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys: del self._tags[tag]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': 'memory-lru',
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+def tables_of(sources):
+    """Resolve modelos (via cache_tables) ou nomes de tabela para uma tupla de tabelas"""
+    tables = []
+    for source in sources:
+        for table in getattr(source, 'cache_tables', (source,)):
+            if table not in tables: tables.append(table)
+    return tuple(tables)
+
+class ResponseCache:
+    """Cache de respostas GET, invalidado por tabela a cada escrita confirmada"""
+
+    # Validadores lembrados para responder 304 mesmo sem o corpo em cache
+    MAX_VALIDATORS = 10000
+
+    def __init__(self, backend=None, ttl=300, enabled=True):
+        self.backend = backend or LRUCache()
+        self.ttl = ttl
+        self.enabled = enabled
+        self._validators = OrderedDict()   # chave -> (versões das tabelas, expira_em, Validator)
+        self._validators_lock = threading.Lock()
+        self.not_modified_responses = 0
+        table_versions.subscribe(self._on_write)
+
+    def configure(self, backend=None, ttl=None, enabled=None):
+        """Troca o backend (ex.: um cache compartilhado) ou ajusta TTL/ativação"""
+        if backend is not None: self.backend = backend
+        if ttl is not None: self.ttl = ttl
+        if enabled is not None: self.enabled = enabled
+
+    def _on_write(self, table, ids):
+        self.backend.invalidate(table)
+
+    @staticmethod
+    def make_key():
+        """Chave = rota + parâmetros de query normalizados (ordem e repetição não importam)"""
+        args = '&'.join(
+            f"{name}={','.join(sorted(values))}" for name, values in sorted(request.args.lists())
+        )
+        return f"{request.path}?{args}"
+
+    def _remembered_validator(self, key, versions):
+        """Validador da última resposta desta chave, se as tabelas não mudaram desde então"""
+        with self._validators_lock:
+            remembered = self._validators.get(key)
+            if remembered is None: return None
+            remembered_versions, expires_at, validator = remembered
+            if remembered_versions != versions or expires_at <= time.monotonic():
+                del self._validators[key]
+                return None
+            self._validators.move_to_end(key)
+            return validator
+
+    def _remember_validator(self, key, versions, validator):
+        with self._validators_lock:
+            self._validators[key] = (versions, time.monotonic() + self.ttl, validator)
+            self._validators.move_to_end(key)
+            while len(self._validators) > self.MAX_VALIDATORS:
+                self._validators.popitem(last=False)
+
+    def _not_modified(self, validator):
+        with self._validators_lock: self.not_modified_responses += 1
+        return validator.not_modified()
+
+    def serve(self, tables, producer):
+        """Retorna a resposta do cache ou executa `producer` e armazena o resultado
+
+        Requisições condicionais (If-None-Match) recebem 304
+        sem consultar o banco enquanto as tabelas de que a rota depende não mudarem.
+        """
+        if request.method != 'GET':
+            return producer()
+
+        key = self.make_key()
+        versions = table_versions.snapshot(tables)
+
+        validator = self._remembered_validator(key, versions)
+        if validator is not None and validator.matches():
+            return self._not_modified(validator)
+
+        if self.enabled:
+            entry = self.backend.get(key)
+            if entry is not None:
+                if entry.validator is not None and entry.validator.matches():
+                    return self._not_modified(entry.validator)
+                response = entry.to_response(response_compressor.negotiate())
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+        response = make_response(producer())
+        if response.status_code != 200 or response.is_streamed:
+            return response
+
+        validator = Validator(content_etag(response.get_data()))
+        validator.apply(response)
+
+        # Se houver escrita durante a consulta o resultado pode estar desatualizado: não armazena
+        if table_versions.snapshot(tables) == versions:
+            self._remember_validator(key, versions, validator)
+            if self.enabled:
+                entry = CachedResponse.from_response(response, validator)
+                self.backend.set(key, entry, self.ttl, tags=tables)
+                # A resposta desta requisição já sai com a versão comprimida guardada no cache
+                encoding = response_compressor.negotiate()
+                if encoding in entry.variants:
+                    response.set_data(entry.variants[encoding])
+                    response_compressor.mark(response, encoding)
+
+        if self.enabled: response.headers['X-Cache'] = 'MISS'
+        if validator.matches():
+            return self._not_modified(validator)
+        return response
+
+    def cached(self, *sources):
+        """Decorator para rotas GET que dependem das tabelas/modelos informados"""
+        tables = tables_of(sources)
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                return self.serve(tables, lambda: view(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    def stats(self):
+        stats = self.backend.stats()
+        stats.update({'enabled': self.enabled, 'ttl': self.ttl, 'not_modified': self.not_modified_responses})
+        return stats
+
+# Instância global do cache de respostas
+response_cache = ResponseCache(
+    LRUCache(max_bytes=int(os.environ.get('CACHE_MAX_BYTES', 64 * 1024 * 1024))),
+    ttl=float(os.environ.get('CACHE_TTL', 300)),
+    enabled=os.environ.get('CACHE_ENABLED', 'true').lower() == 'true'
+)
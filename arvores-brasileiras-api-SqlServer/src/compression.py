@@ -0,0 +1,164 @@
+from flask import request
+import threading
+import zlib
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tipos de conteúdo comprimidos (além de text/*)
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'application/javascript', 'image/svg+xml')
+
+def encoded_etag(etag, encoding):
+    """ETag da representação comprimida (cada codificação é uma representação diferente)"""
+    return f"{etag}-{encoding}"
+
+class ResponseCompressor:
+    """Compressão das respostas negociada por Accept-Encoding (brotli, se instalado, e gzip)
+
+    Respostas comuns abaixo de `min_size` bytes vão sem compressão (o ganho não paga o
+    custo); respostas em streaming (exportações) são comprimidas bloco a bloco, sem
+    acumular o corpo. O cache de respostas guarda as versões já comprimidas e as entrega
+    com o cabeçalho Content-Encoding definido, o que faz este compressor ignorá-las.
+    """
+
+    def __init__(self, enabled=True, min_size=1024, gzip_level=6, brotli_quality=4):
+        self.enabled = enabled
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        # Ordem de preferência do servidor quando o cliente aceita mais de uma com a mesma qualidade
+        self.encodings = (('br',) if brotli is not None else ()) + ('gzip',)
+        self._lock = threading.Lock()
+        self._compressed = {encoding: 0 for encoding in self.encodings}
+        self._streamed = 0
+        self._skipped_small = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def init_app(self, app):
+        app.after_request(self.compress_response)
+
+    # Negociação
+
+    @staticmethod
+    def compressible(mimetype):
+        return bool(mimetype) and (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES)
+
+    def negotiate(self):
+        """Codificação escolhida para a requisição atual ou None (sem compressão)"""
+        if not self.enabled: return None
+        return request.accept_encodings.best_match(self.encodings)
+
+    # Compressão
+
+    def compress(self, data, encoding):
+        if encoding == 'br': return brotli.compress(data, quality=self.brotli_quality)
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def _stream_compressor(self, encoding):
+        """(comprimir bloco, finalizar) para uma resposta em streaming"""
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        # Z_SYNC_FLUSH a cada bloco: o cliente recebe os registros conforme são lidos do banco
+        return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+    def _stream(self, chunks, encoding):
+        process, finish = self._stream_compressor(encoding)
+        bytes_in = bytes_out = 0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str): chunk = chunk.encode('utf-8')
+                if not chunk: continue
+                data = process(chunk)
+                bytes_in += len(chunk)
+                bytes_out += len(data)
+                if data: yield data
+            data = finish()
+            bytes_out += len(data)
+            yield data
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None: close()
+            self._count(encoding, bytes_in, bytes_out, streamed=True)
+
+    def _count(self, encoding, bytes_in, bytes_out, streamed=False):
+        with self._lock:
+            self._compressed[encoding] += 1
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+            if streamed: self._streamed += 1
+
+    @staticmethod
+    def mark(response, encoding):
+        """Cabeçalhos de uma resposta cujo corpo já está comprimido em `encoding`"""
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag: response.set_etag(encoded_etag(etag, encoding), weak)
+
+    def compress_response(self, response):
+        """after_request: comprime a resposta se o cliente aceitar e valer a pena"""
+        if not self.enabled or not self.compressible(response.mimetype): return response
+        response.vary.add('Accept-Encoding')
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or 'Content-Encoding' in response.headers or response.direct_passthrough):
+            return response
+
+        encoding = self.negotiate()
+        if encoding is None: return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+            self.mark(response, encoding)
+            return response
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            with self._lock: self._skipped_small += 1
+            return response
+
+        compressed = self.compress(data, encoding)
+        self._count(encoding, len(data), len(compressed))
+        response.set_data(compressed)
+        self.mark(response, encoding)
+        return response
+
+    def precompress(self, data):
+        """Versões comprimidas de um corpo para o cache, em todas as codificações; {} se for pequeno"""
+        if not self.enabled or len(data) < self.min_size: return {}
+        variants = {}
+        for encoding in self.encodings:
+            variants[encoding] = self.compress(data, encoding)
+            self._count(encoding, len(data), len(variants[encoding]))
+        return variants
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'encodings': list(self.encodings),
+                'min_size': self.min_size,
+                'compressed': dict(self._compressed),
+                'streamed': self._streamed,
+                'skipped_small': self._skipped_small,
+                'bytes_in': self._bytes_in,
+                'bytes_out': self._bytes_out,
+                'ratio': round(self._bytes_out / self._bytes_in, 4) if self._bytes_in else None
+            }
+
+# Instância global do compressor de respostas
+response_compressor = ResponseCompressor(
+    enabled=os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true',
+    min_size=int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)),
+    gzip_level=int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6)),
+    brotli_quality=int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))
+)
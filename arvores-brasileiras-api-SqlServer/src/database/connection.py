@@ -1,6 +1,8 @@
-import pyodbc
 import os
 from contextlib import contextmanager
+from src.database.dialects import create_dialect
+from src.database.instrumentation import query_instrumentation
+from time import perf_counter
 import logging
 
 # Configurar logging
@@ -8,82 +10,86 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DatabaseConnection:
-    """Classe para gerenciar conexões com SQL Server usando pyodbc"""
+    """Classe para gerenciar conexões com o banco (SQL Server via pyodbc ou SQLite)
+
+    O banco vem de DB_ENGINE (sqlserver, padrão, ou sqlite); o dialeto escolhido
+    fornece as conexões, o tipo de pool e as partes do SQL que mudam entre os bancos.
+    """
     
-    def __init__(self): self.connection_string = self._build_connection_string()
-        
-    def _build_connection_string(self):
-        """Constrói a string de conexão baseada em variáveis de ambiente ou configuração padrão"""
-        
-        # Configurações do SQL Server
-        server = os.environ.get('SQL_SERVER', 'FRA0685193W11-1\SQLEXPRESS')
-        database = os.environ.get('SQL_DATABASE', 'ArvoresBrasileiras')
-        username = os.environ.get('SQL_USERNAME', 'sa')
-        password = os.environ.get('SQL_PASSWORD', '1234567890')
-        driver = os.environ.get('SQL_DRIVER', 'ODBC Driver 17 for SQL Server')
-        
-        # Construir string de conexão
-        connection_string = (
-            f"DRIVER={{{driver}}};"
-            f"SERVER={server};"
-            f"DATABASE={database};"
-            f"UID={username};"
-            f"PWD={password};"
-            f"TrustServerCertificate=yes;"
-            f"Encrypt=no;"
-        )
-        
-        logger.info(f"String de conexão configurada para servidor: {server}, banco: {database}")
-        return connection_string
+    def __init__(self, connect=None, engine=None):
+        self.dialect = create_dialect(engine or os.environ.get('DB_ENGINE', 'sqlserver'))
+        # A fábrica de conexões pode ser substituída (ex.: driver falso em testes)
+        self.pool = self.dialect.create_pool(connect or self.get_connection, self._reset_connection, self._pool_settings())
+    
+    @staticmethod
+    def _pool_settings():
+        """Lê a configuração do pool de conexões das variáveis de ambiente"""
+        return {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 1)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+            'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+            'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', 1800)),
+            'ping_interval': float(os.environ.get('DB_POOL_PING_INTERVAL', 30))
+        }
     
+    @staticmethod
+    def _reset_connection(connection):
+        """Encerra qualquer transação pendente antes de a conexão voltar ao pool"""
+        connection.rollback()
+        
     def get_connection(self):
-        """Retorna uma nova conexão com o banco de dados"""
-        try:
-            connection = pyodbc.connect(self.connection_string)
-            connection.autocommit = False  # Controle manual de transações
-            return connection
-        except pyodbc.Error as e:
-            logger.error(f"Erro ao conectar com o banco de dados: {e}")
-            raise
+        """Retorna uma nova conexão com o banco de dados (fora do pool)"""
+        return self.dialect.connect()
     
     @contextmanager
     def get_cursor(self):
-        """Context manager para obter cursor com gerenciamento automático de conexão"""
-        connection = None
+        """Context manager para obter cursor com conexão emprestada do pool"""
+        connection = self._acquire()
         cursor = None
         try:
-            connection = self.get_connection()
-            cursor = connection.cursor()
+            cursor = query_instrumentation.cursor(connection.cursor())
             yield cursor, connection
         except Exception as e:
-            if connection:
-                connection.rollback()
             logger.error(f"Erro na operação do banco de dados: {e}")
             raise
         finally:
-            if cursor:
-                cursor.close()
-            if connection:
-                connection.close()
+            self._close_cursor(cursor)
+            # O rollback ao devolver a conexão descarta leituras/escritas não confirmadas
+            self.pool.release(connection)
     
     @contextmanager
     def get_transaction(self):
         """Context manager para transações com commit/rollback automático"""
-        connection = None
+        connection = self._acquire()
         cursor = None
         try:
-            connection = self.get_connection()
-            cursor = connection.cursor()
+            cursor = query_instrumentation.cursor(connection.cursor())
             yield cursor
             connection.commit()
         except Exception as e:
-            if connection: connection.rollback()
             logger.error(f"Erro na transação: {e}")
             raise
         finally:
-            if connection or cursor: 
-                cursor.close()
-                connection.close()
+            self._close_cursor(cursor)
+            self.pool.release(connection)
+    
+    def _acquire(self):
+        """Retira uma conexão do pool, somando a espera ao custo de banco da requisição"""
+        started = perf_counter()
+        connection = self.pool.acquire()
+        query_instrumentation.record_acquire(perf_counter() - started)
+        return connection
+    
+    @staticmethod
+    def _close_cursor(cursor):
+        if cursor is None: return
+        try: cursor.close()
+        except Exception as e: logger.warning(f"Falha ao fechar cursor: {e}")
+    
+    def pool_stats(self):
+        """Retorna estatísticas do pool de conexões"""
+        return self.pool.stats()
     
     def test_connection(self):
         """Testa a conexão com o banco de dados"""
@@ -103,11 +109,8 @@ class DatabaseConnection:
             with open(script_path, 'r', encoding='utf-8') as file: script = file.read()
             
             with self.get_transaction() as cursor:
-                # Dividir script em comandos individuais
-                commands = [cmd.strip() for cmd in script.split('GO') if cmd.strip()]
-                
-                for command in commands:
-                    if command: cursor.execute(command)
+                # Dividir script em comandos individuais (separados por GO no SQL Server)
+                for command in self.dialect.script_commands(script): cursor.execute(command)
                         
             logger.info(f"Script {script_path} executado com sucesso")
             return True
@@ -0,0 +1,233 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from decimal import Decimal
+from src.database.pool import ConnectionPool, ThreadLocalPool
+import sqlite3
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+DB_ENGINES = ('sqlserver', 'sqlite')
+
+class Dialect(ABC):
+    """Diferenças de SQL e de conexão entre os bancos suportados
+
+    Os modelos montam o SQL comum (SELECT, WHERE, IN, JOIN, LIKE ... ESCAPE) e pedem ao
+    dialeto só o que muda: paginação, retorno das linhas escritas, contagem estimada,
+    execução em lote e a forma de abrir e guardar conexões.
+    """
+    name = None
+    description = None
+    # Cláusula de paginação depois do ORDER BY; os parâmetros vêm de page_params
+    page_clause = None
+    # ORDER BY em texto igual à comparação de str do Python (ponto de código), reproduzível em memória
+    orders_text_by_code_point = False
+
+    @abstractmethod
+    def page_params(self, offset, limit):
+        pass
+
+    @abstractmethod
+    def returning(self, head, tail, columns, source):
+        """Comando `head ... tail` que devolve `columns` das linhas escritas (source: INSERTED/DELETED)"""
+
+    @abstractmethod
+    def estimate_count(self, table):
+        """(SQL, parâmetros) da contagem aproximada da tabela, sem varrer as linhas"""
+
+    def percentile(self, fraction, column, partition=None):
+        """Expressão de janela com o percentil contínuo de `column` (por `partition`), ou None
+
+        Sem suporte no banco, os percentis são calculados na aplicação a partir dos valores ordenados.
+        """
+        return None
+
+    def prepare_executemany(self, cursor):
+        """Ajustes do cursor antes de um executemany"""
+
+    @abstractmethod
+    def script_commands(self, script):
+        """Divide um script SQL em comandos executáveis um a um"""
+
+    @property
+    @abstractmethod
+    def Error(self):
+        """Classe base das exceções do driver"""
+
+    @abstractmethod
+    def connect(self):
+        pass
+
+    @abstractmethod
+    def create_pool(self, connect, reset, settings):
+        pass
+
+class SQLServerDialect(Dialect):
+    """SQL Server via pyodbc (importado só quando usado)"""
+    name = 'sqlserver'
+    description = 'SQL Server (pyodbc)'
+    page_clause = "OFFSET ? ROWS FETCH NEXT ? ROWS ONLY"
+
+    def __init__(self):
+        self.connection_string = self._build_connection_string()
+
+    @staticmethod
+    def _build_connection_string():
+        """Constrói a string de conexão baseada em variáveis de ambiente ou configuração padrão"""
+
+        # Configurações do SQL Server
+        server = os.environ.get('SQL_SERVER', 'FRA0685193W11-1\SQLEXPRESS')
+        database = os.environ.get('SQL_DATABASE', 'ArvoresBrasileiras')
+        username = os.environ.get('SQL_USERNAME', 'sa')
+        password = os.environ.get('SQL_PASSWORD', '1234567890')
+        driver = os.environ.get('SQL_DRIVER', 'ODBC Driver 17 for SQL Server')
+
+        # Construir string de conexão
+        connection_string = (
+            f"DRIVER={{{driver}}};"
+            f"SERVER={server};"
+            f"DATABASE={database};"
+            f"UID={username};"
+            f"PWD={password};"
+            f"TrustServerCertificate=yes;"
+            f"Encrypt=no;"
+        )
+
+        logger.info(f"String de conexão configurada para servidor: {server}, banco: {database}")
+        return connection_string
+
+    def page_params(self, offset, limit):
+        return [offset, limit]
+
+    def returning(self, head, tail, columns, source):
+        return f"{head} OUTPUT {', '.join(f'{source}.{column}' for column in columns)} {tail}"
+
+    def estimate_count(self, table):
+        # A estimativa vem dos metadados da tabela (linhas por partição do heap/índice clusterizado)
+        return (
+            "SELECT SUM(p.rows) FROM sys.partitions p "
+            "WHERE p.object_id = OBJECT_ID(?) AND p.index_id IN (0, 1)",
+            [table]
+        )
+
+    def percentile(self, fraction, column, partition=None):
+        # A fração precisa ser literal no PERCENTILE_CONT (já validada como número pelo chamador)
+        over = f"PARTITION BY {partition}" if partition else ""
+        return f"PERCENTILE_CONT({float(fraction)!r}) WITHIN GROUP (ORDER BY {column}) OVER ({over})"
+
+    def prepare_executemany(self, cursor):
+        cursor.fast_executemany = True
+
+    def script_commands(self, script):
+        return [command.strip() for command in script.split('GO') if command.strip()]
+
+    @property
+    def Error(self):
+        import pyodbc
+        return pyodbc.Error
+
+    def connect(self):
+        import pyodbc
+        try:
+            connection = pyodbc.connect(self.connection_string)
+            connection.autocommit = False  # Controle manual de transações
+            return connection
+        except pyodbc.Error as e:
+            logger.error(f"Erro ao conectar com o banco de dados: {e}")
+            raise
+
+    def create_pool(self, connect, reset, settings):
+        return ConnectionPool(connect, reset=reset, **settings)
+
+class SQLiteDialect(Dialect):
+    """SQLite embutido (módulo sqlite3): WAL, uma conexão por thread, mmap e cache de páginas
+
+    O esquema (`schema_sqlite.sql`) é criado no primeiro uso, se ainda não existir.
+    Colunas DECIMAL e DATETIME voltam como Decimal e datetime, como no pyodbc, para
+    que a conversão das linhas e os filtros se comportem igual nos dois bancos.
+    """
+    name = 'sqlite'
+    description = 'SQLite (sqlite3)'
+    page_clause = "LIMIT ? OFFSET ?"
+    # Collation BINARY: memcmp do UTF-8, que segue a ordem dos pontos de código
+    orders_text_by_code_point = True
+    SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'schema_sqlite.sql')
+
+    def __init__(self, path=None, mmap_size=256 * 1024 * 1024, cache_kb=16 * 1024, busy_timeout=5.0, create_schema=True):
+        self.path = path or os.path.join(os.path.dirname(__file__), 'app.db')
+        self.mmap_size = mmap_size
+        self.cache_kb = cache_kb
+        self.busy_timeout = busy_timeout
+        self.create_schema = create_schema
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        register_sqlite_types()
+        logger.info(f"Banco SQLite configurado: {self.path}")
+
+    def page_params(self, offset, limit):
+        return [limit, offset]
+
+    def returning(self, head, tail, columns, source):
+        return f"{head} {tail} RETURNING {', '.join(columns)}"
+
+    def estimate_count(self, table):
+        # Maior rowid: exato enquanto não houver exclusões, custo de uma busca no índice
+        return f"SELECT MAX(rowid) FROM {table}", []
+
+    def script_commands(self, script):
+        commands, pending = [], ''
+        for line in script.splitlines(keepends=True):
+            pending += line
+            if sqlite3.complete_statement(pending):
+                commands.append(pending.strip())
+                pending = ''
+        if pending.strip(): commands.append(pending.strip())
+        return commands
+
+    @property
+    def Error(self):
+        return sqlite3.Error
+
+    def connect(self):
+        # check_same_thread=False: uma exportação em streaming pode terminar em outra thread
+        connection = sqlite3.connect(
+            self.path, timeout=self.busy_timeout, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode = WAL")     # leitores não bloqueiam o escritor
+        connection.execute("PRAGMA synchronous = NORMAL")   # seguro com WAL, sem fsync por commit
+        connection.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        connection.execute(f"PRAGMA cache_size = -{int(self.cache_kb)}")
+        connection.execute("PRAGMA temp_store = MEMORY")
+        if self.create_schema and not self._schema_ready: self._ensure_schema(connection)
+        return connection
+
+    def _ensure_schema(self, connection):
+        with self._schema_lock:
+            if self._schema_ready: return
+            with open(self.SCHEMA_PATH, 'r', encoding='utf-8') as file: connection.executescript(file.read())
+            self._schema_ready = True
+
+    def create_pool(self, connect, reset, settings):
+        return ThreadLocalPool(connect, reset=reset)
+
+def register_sqlite_types():
+    """Tipos do sqlite3 equivalentes aos do pyodbc (registro global do módulo, idempotente)"""
+    sqlite3.register_adapter(Decimal, str)
+    sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+    sqlite3.register_converter('DECIMAL', lambda value: Decimal(value.decode()))
+    sqlite3.register_converter('DATETIME', lambda value: datetime.fromisoformat(value.decode()))
+
+def create_dialect(engine):
+    """Dialeto do banco escolhido em DB_ENGINE"""
+    if engine == 'sqlserver': return SQLServerDialect()
+    if engine == 'sqlite':
+        return SQLiteDialect(
+            path=os.environ.get('SQLITE_PATH') or None,
+            mmap_size=int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+            cache_kb=int(os.environ.get('SQLITE_CACHE_KB', 16 * 1024)),
+            busy_timeout=float(os.environ.get('SQLITE_BUSY_TIMEOUT', 5)),
+            create_schema=os.environ.get('SQLITE_CREATE_SCHEMA', 'true').lower() == 'true'
+        )
+    raise ValueError(f"DB_ENGINE inválido: {engine} (use {', '.join(DB_ENGINES)})")
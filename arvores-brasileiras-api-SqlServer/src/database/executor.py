@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from functools import partial
+import asyncio
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Ligado pelo caminho assíncrono (ou por DB_PARALLEL_QUERIES): consultas independentes de uma
+# mesma requisição, como os relacionamentos, rodam em paralelo cada uma com sua conexão
+parallel_queries = ContextVar('parallel_queries', default=os.environ.get('DB_PARALLEL_QUERIES', 'false').lower() == 'true')
+
+class DatabaseExecutor:
+    """Executor limitado para o trabalho bloqueante do banco (pyodbc não tem API assíncrona)
+
+    `run` executa uma função em uma thread do executor e pode ser aguardado no loop de
+    eventos; o contexto (requisição Flask, variáveis de contexto) é copiado para a thread.
+    `fan_out` executa consultas independentes em paralelo a partir de código síncrono, em
+    um executor separado: as tarefas de fan-out nunca esperam umas pelas outras, então uma
+    requisição que ocupa uma thread de `run` não bloqueia o executor de que depende.
+    """
+
+    def __init__(self, max_workers=10, fan_out_workers=8):
+        self.max_workers = max_workers
+        self.fan_out_workers = fan_out_workers
+        self._executor = None
+        self._fan_out_executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._fan_outs = 0
+
+    def _pools(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='db')
+                self._fan_out_executor = ThreadPoolExecutor(self.fan_out_workers, thread_name_prefix='db-fan-out')
+            return self._executor, self._fan_out_executor
+
+    def _call(self, submitted, context, fn, *args, **kwargs):
+        waited = time.monotonic() - submitted
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+            self._wait_time += waited
+            self._max_wait_time = max(self._max_wait_time, waited)
+        try:
+            return context.run(fn, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """Executa `fn` no executor sem bloquear o loop de eventos"""
+        executor, _ = self._pools()
+        with self._lock: self._pending += 1
+        call = partial(self._call, time.monotonic(), copy_context(), fn, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+    async def gather(self, *calls):
+        """Executa várias funções sem argumentos em paralelo; resultados na ordem das chamadas"""
+        return await asyncio.gather(*(self.run(call) for call in calls))
+
+    def fan_out(self, calls):
+        """Executa funções independentes em paralelo (código síncrono); resultados na ordem das chamadas
+
+        Sem paralelismo ativo na requisição, ou com uma única chamada, executa em sequência.
+        """
+        calls = list(calls)
+        if len(calls) < 2 or not parallel_queries.get(): return [call() for call in calls]
+
+        _, executor = self._pools()
+        with self._lock: self._fan_outs += 1
+        futures = [executor.submit(copy_context().run, call) for call in calls]
+        return [future.result() for future in futures]
+
+    def reset_after_fork(self):
+        """Descarta os executores herdados do processo pai (as threads não existem no filho)"""
+        self._lock = threading.Lock()
+        self._executor = self._fan_out_executor = None
+        self._pending = self._running = 0
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executors, self._executor, self._fan_out_executor = (self._executor, self._fan_out_executor), None, None
+        for executor in executors:
+            if executor is not None: executor.shutdown(wait=wait)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'fan_out_workers': self.fan_out_workers,
+                'pending': self._pending,
+                'running': self._running,
+                'completed': self._completed,
+                'wait_time_total': round(self._wait_time, 6),
+                'wait_time_max': round(self._max_wait_time, 6),
+                'fan_outs': self._fan_outs
+            }
+
+# Instância global do executor do banco (por padrão, uma thread por conexão do pool)
+db_executor = DatabaseExecutor(
+    max_workers=int(os.environ.get('DB_EXECUTOR_WORKERS', os.environ.get('DB_POOL_MAX_SIZE', 10))),
+    fan_out_workers=int(os.environ.get('DB_FAN_OUT_WORKERS', 8))
+)
+
+if hasattr(os, 'register_at_fork'): os.register_at_fork(after_in_child=db_executor.reset_after_fork)
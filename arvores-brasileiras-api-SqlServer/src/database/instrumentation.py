@@ -0,0 +1,220 @@
+from contextvars import ContextVar
+from time import perf_counter
+import os
+import threading
+import logging
+
+# Log estruturado das consultas lentas (um registro por consulta, com os campos em `extra`)
+slow_query_logger = logging.getLogger('src.database.slow_queries')
+
+# Limite de caracteres do SQL registrado no log de consultas lentas
+MAX_LOGGED_SQL = 1000
+
+def sql_shape(sql):
+    """Forma da consulta para o log: SQL parametrizado com os espaços normalizados"""
+    shape = ' '.join(sql.split())
+    return shape if len(shape) <= MAX_LOGGED_SQL else shape[:MAX_LOGGED_SQL] + '...'
+
+def params_count(params):
+    """Quantidade de parâmetros de `cursor.execute(sql, *params)` (posicionais ou em uma sequência)"""
+    if len(params) == 1 and isinstance(params[0], (list, tuple)): return len(params[0])
+    return len(params)
+
+class QueryStats:
+    """Custo de banco acumulado por uma requisição (ou outra unidade de trabalho)
+
+    As consultas feitas em paralelo (fan-out dos relacionamentos) somam no mesmo objeto,
+    pois o contexto é copiado para as threads do executor.
+    """
+    __slots__ = ('label', 'queries', 'rows', 'slow_queries', 'acquire_time', 'execute_time', 'fetch_time', '_lock')
+
+    def __init__(self, label=None):
+        self.label = label
+        self.queries = 0
+        self.rows = 0
+        self.slow_queries = 0
+        self.acquire_time = 0.0
+        self.execute_time = 0.0
+        self.fetch_time = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def db_time(self):
+        return self.acquire_time + self.execute_time + self.fetch_time
+
+    def add_acquire(self, elapsed):
+        with self._lock: self.acquire_time += elapsed
+
+    def add_query(self, execute_time, fetch_time, rows, slow):
+        with self._lock:
+            self.queries += 1
+            self.rows += rows
+            self.execute_time += execute_time
+            self.fetch_time += fetch_time
+            if slow: self.slow_queries += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'queries': self.queries,
+                'rows': self.rows,
+                'slow_queries': self.slow_queries,
+                'acquire_ms': round(self.acquire_time * 1000, 3),
+                'execute_ms': round(self.execute_time * 1000, 3),
+                'fetch_ms': round(self.fetch_time * 1000, 3)
+            }
+
+# Custo da requisição em andamento (None fora de uma requisição, ex.: cargas na inicialização)
+current_query_stats = ContextVar('current_query_stats', default=None)
+
+class InstrumentedCursor:
+    """Cursor que mede o tempo de execução e de leitura de cada consulta
+
+    Repassa todo o resto ao cursor do driver. Uma consulta termina quando o cursor
+    executa a próxima ou é fechado: só então o tempo total (execução + leituras) é
+    conhecido e comparado com o limite de consulta lenta.
+    """
+    __slots__ = ('_cursor', '_instrumentation', '_sql', '_params', '_batch', '_execute_time', '_fetch_time', '_rows')
+
+    def __init__(self, cursor, instrumentation):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_instrumentation', instrumentation)
+        object.__setattr__(self, '_sql', None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # Atributos do driver (ex.: fast_executemany) vão para o cursor real
+        if name in InstrumentedCursor.__slots__: object.__setattr__(self, name, value)
+        else: setattr(self._cursor, name, value)
+
+    def _begin(self, sql, params, batch=None):
+        self._finish()
+        self._sql = sql
+        self._params = params
+        self._batch = batch
+        self._execute_time = self._fetch_time = 0.0
+        self._rows = 0
+
+    def _finish(self):
+        if self._sql is None: return
+        sql, self._sql = self._sql, None
+        self._instrumentation.record_query(sql, self._params, self._batch, self._execute_time, self._fetch_time, self._rows)
+
+    def execute(self, sql, *params):
+        self._begin(sql, params_count(params))
+        started = perf_counter()
+        try:
+            result = self._cursor.execute(sql, *params)
+        finally:
+            self._execute_time += perf_counter() - started
+        # pyodbc devolve o próprio cursor (permite cursor.execute(...).fetchall())
+        return self if result is self._cursor else result
+
+    def executemany(self, sql, seq_of_params):
+        seq_of_params = seq_of_params if isinstance(seq_of_params, (list, tuple)) else list(seq_of_params)
+        self._begin(sql, len(seq_of_params[0]) if seq_of_params else 0, len(seq_of_params))
+        started = perf_counter()
+        try:
+            return self._cursor.executemany(sql, seq_of_params)
+        finally:
+            self._execute_time += perf_counter() - started
+
+    def _fetch(self, fetch, *args):
+        started = perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            self._fetch_time += perf_counter() - started
+
+    def fetchone(self):
+        row = self._fetch(self._cursor.fetchone)
+        if row is not None: self._rows += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._fetch(self._cursor.fetchmany, *args)
+        self._rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(self._cursor.fetchall)
+        self._rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None: return
+            yield row
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+class QueryInstrumentation:
+    """Medição das consultas feitas pelo `DatabaseConnection`
+
+    Por requisição (via `current_query_stats`): quantidade de consultas, tempo de
+    checkout no pool, de execução e de leitura. No processo: os mesmos totais e o log
+    estruturado das consultas que passam de `slow_query_ms` (0 desliga o log).
+    """
+
+    def __init__(self, enabled=True, slow_query_ms=500):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self._totals = QueryStats()
+
+    def start(self, label=None):
+        """Começa a medir uma requisição; as consultas seguintes no contexto somam no objeto devolvido"""
+        stats = QueryStats(label)
+        current_query_stats.set(stats)
+        return stats
+
+    def finish(self):
+        current_query_stats.set(None)
+
+    def cursor(self, cursor):
+        return InstrumentedCursor(cursor, self) if self.enabled else cursor
+
+    def record_acquire(self, elapsed):
+        stats = current_query_stats.get()
+        if stats is not None: stats.add_acquire(elapsed)
+        self._totals.add_acquire(elapsed)
+
+    def record_query(self, sql, params, batch, execute_time, fetch_time, rows):
+        elapsed_ms = (execute_time + fetch_time) * 1000
+        slow = bool(self.slow_query_ms) and elapsed_ms >= self.slow_query_ms
+        stats = current_query_stats.get()
+        if stats is not None: stats.add_query(execute_time, fetch_time, rows, slow)
+        self._totals.add_query(execute_time, fetch_time, rows, slow)
+        if slow: self._log_slow_query(sql, params, batch, execute_time, fetch_time, rows, stats)
+
+    def _log_slow_query(self, sql, params, batch, execute_time, fetch_time, rows, stats):
+        record = {
+            'duration_ms': round((execute_time + fetch_time) * 1000, 3),
+            'execute_ms': round(execute_time * 1000, 3),
+            'fetch_ms': round(fetch_time * 1000, 3),
+            'rows': rows,
+            'params': params,
+            'endpoint': stats.label if stats is not None else None,
+            'sql': sql_shape(sql)
+        }
+        if batch is not None: record['batch'] = batch
+        slow_query_logger.warning(
+            f"Consulta lenta ({record['duration_ms']} ms, {rows} linhas, {params} parâmetros, "
+            f"endpoint {record['endpoint']}): {record['sql']}",
+            extra={'slow_query': record}
+        )
+
+    def stats(self):
+        totals = self._totals.to_dict()
+        totals.update(enabled=self.enabled, slow_query_ms=self.slow_query_ms)
+        return totals
+
+# Instância global da instrumentação das consultas (METRICS_ENABLED=false desliga)
+query_instrumentation = QueryInstrumentation(
+    enabled=os.environ.get('METRICS_ENABLED', 'true').lower() == 'true',
+    slow_query_ms=float(os.environ.get('SLOW_QUERY_MS', 500))
+)
@@ -0,0 +1,404 @@
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Pools vivos no processo, reinicializados no filho após um fork (ex.: workers do gunicorn)
+_pools = weakref.WeakSet()
+
+def _reset_pools_after_fork():
+    for pool in list(_pools): pool.reset_after_fork()
+
+if hasattr(os, 'register_at_fork'): os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+class PoolTimeout(Exception):
+    """Nenhuma conexão ficou disponível dentro do tempo limite de checkout"""
+
+class _PooledConnection:
+    """Registro interno de uma conexão física mantida pelo pool"""
+    __slots__ = ('raw', 'created_at', 'last_used', 'generation')
+
+    def __init__(self, raw, generation=0):
+        self.raw = raw
+        self.generation = generation
+        self.created_at = self.last_used = time.monotonic()
+
+class ConnectionPool:
+    """Pool de conexões limitado e thread-safe para qualquer driver DB-API
+
+    A fábrica `connect` é chamada sem argumentos e deve retornar uma conexão
+    nova; isso permite usar o pool com pyodbc, sqlite3 ou um driver falso.
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, timeout=30.0, max_idle=300.0,
+                 max_lifetime=1800.0, ping_interval=30.0, ping_query='SELECT 1', reset=None):
+        if max_size < 1: raise ValueError("max_size deve ser maior ou igual a 1")
+        if min_size < 0 or min_size > max_size: raise ValueError("min_size deve estar entre 0 e max_size")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+        self.ping_query = ping_query
+        self._reset = reset
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()      # LIFO: a conexão usada mais recentemente sai primeiro
+        self._in_use = {}         # id(conexão) -> _PooledConnection
+        self._size = 0            # conexões abertas + reservadas em criação
+        self._generation = 0      # incrementada por close_all; conexões antigas não voltam ao pool
+        self._warmed = False
+
+        self._created = 0
+        self._closed = 0
+        self._acquisitions = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._timeouts = 0
+        self._ping_failures = 0
+        _pools.add(self)
+
+    # ------------------------------------------------------------------ checkout
+    def acquire(self, timeout=None):
+        """Retira uma conexão do pool, criando uma nova se houver espaço"""
+        timeout = self.timeout if timeout is None else timeout
+        if not self._warmed: self.warmup()
+
+        while True:
+            record = self._checkout(timeout)
+            if record.raw is None:
+                record = self._open(record)
+            elif not self._is_alive(record):
+                self._discard(record)
+                continue
+
+            with self._cond:
+                self._in_use[id(record.raw)] = record
+            return record.raw
+
+    def _checkout(self, timeout):
+        """Obtém um registro ocioso válido ou reserva espaço para uma nova conexão"""
+        expired = []
+        started = None
+        deadline = time.monotonic() + timeout
+
+        try:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    while self._idle:
+                        record = self._idle.pop()
+                        if self._is_expired(record, now):
+                            self._size -= 1
+                            expired.append(record)
+                            continue
+                        self._record_acquisition(started)
+                        return record
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        self._record_acquisition(started)
+                        return _PooledConnection(None, self._generation)
+
+                    if started is None:
+                        started = now
+                        self._waits += 1
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        self._record_wait(now - started)
+                        raise PoolTimeout(
+                            f"Tempo limite de {timeout}s esgotado aguardando conexão "
+                            f"({self.max_size} conexões em uso)"
+                        )
+                    self._cond.wait(remaining)
+        finally:
+            for record in expired: self._close(record)
+
+    def _record_acquisition(self, started):
+        self._acquisitions += 1
+        if started is not None: self._record_wait(time.monotonic() - started)
+
+    def _record_wait(self, elapsed):
+        self._wait_time += elapsed
+        self._max_wait_time = max(self._max_wait_time, elapsed)
+
+    def _open(self, record):
+        """Abre a conexão física para um espaço já reservado"""
+        try:
+            record.raw = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        record.created_at = record.last_used = time.monotonic()
+        with self._cond: self._created += 1
+        return record
+
+    def _is_expired(self, record, now):
+        if self.max_lifetime and now - record.created_at >= self.max_lifetime: return True
+        # Conexões ociosas além do mínimo são descartadas após max_idle
+        if self.max_idle and now - record.last_used >= self.max_idle and self._size > self.min_size: return True
+        return False
+
+    def _is_alive(self, record):
+        """Verificação barata de vida: só executa o ping se a conexão ficou ociosa por um tempo"""
+        if self.ping_interval is None or time.monotonic() - record.last_used < self.ping_interval: return True
+
+        cursor = None
+        try:
+            cursor = record.raw.cursor()
+            cursor.execute(self.ping_query)
+            cursor.fetchall()
+            return True
+        except Exception as e:
+            logger.warning(f"Conexão inválida descartada pelo pool: {e}")
+            with self._cond: self._ping_failures += 1
+            return False
+        finally:
+            if cursor is not None:
+                try: cursor.close()
+                except Exception: pass
+
+    # ------------------------------------------------------------------- checkin
+    def release(self, connection, discard=False):
+        """Devolve uma conexão ao pool (ou a descarta se estiver inutilizável)"""
+        with self._cond:
+            record = self._in_use.pop(id(connection), None)
+        if record is None:
+            logger.warning("Tentativa de devolver ao pool uma conexão que não pertence a ele")
+            return
+
+        if not discard and self._reset is not None:
+            try:
+                self._reset(connection)
+            except Exception as e:
+                logger.warning(f"Falha ao reinicializar conexão devolvida ao pool: {e}")
+                discard = True
+
+        if discard or record.generation != self._generation:
+            self._discard(record)
+            return
+
+        record.last_used = time.monotonic()
+        with self._cond:
+            self._idle.append(record)
+            self._cond.notify()
+        self.prune()
+
+    def _discard(self, record):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+        self._close(record)
+
+    def _close(self, record):
+        try:
+            record.raw.close()
+        except Exception:
+            pass
+        with self._cond: self._closed += 1
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager que retira e devolve uma conexão automaticamente"""
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    # ---------------------------------------------------------------- manutenção
+    def warmup(self):
+        """Abre conexões até atingir min_size"""
+        self._warmed = True
+        while True:
+            with self._cond:
+                if self._size >= self.min_size: return
+                self._size += 1
+            try:
+                record = self._open(_PooledConnection(None, self._generation))
+            except Exception as e:
+                logger.warning(f"Falha ao pré-abrir conexões do pool: {e}")
+                return
+            with self._cond:
+                self._idle.appendleft(record)
+                self._cond.notify()
+
+    def prune(self):
+        """Fecha conexões ociosas há mais de max_idle ou mais velhas que max_lifetime"""
+        expired = []
+        now = time.monotonic()
+        with self._cond:
+            # As mais antigas ficam à esquerda da fila
+            for record in list(self._idle):
+                if self._is_expired(record, now):
+                    self._idle.remove(record)
+                    self._size -= 1
+                    expired.append(record)
+        for record in expired: self._close(record)
+        return len(expired)
+
+    def close_all(self):
+        """Fecha todas as conexões ociosas; as em uso são fechadas ao serem devolvidas"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._generation += 1
+            self._warmed = False
+        for record in idle: self._close(record)
+
+    def reset_after_fork(self):
+        """Esquece as conexões herdadas do processo pai, sem fechá-las
+
+        Os sockets são compartilhados com o pai: fechar ou usar essas conexões no filho
+        corromperia as do pai. O filho abre as próprias conexões sob demanda.
+        """
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()
+        self._in_use = {}
+        self._size = 0
+        self._generation += 1
+        self._warmed = False
+
+    def stats(self):
+        """Retorna estatísticas de uso do pool"""
+        with self._cond:
+            return {
+                'size': self._size,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'created': self._created,
+                'closed': self._closed,
+                'acquisitions': self._acquisitions,
+                'waits': self._waits,
+                'wait_time_total': round(self._wait_time, 6),
+                'wait_time_max': round(self._max_wait_time, 6),
+                'timeouts': self._timeouts,
+                'ping_failures': self._ping_failures
+            }
+
+class ThreadLocalPool:
+    """Uma conexão por thread, para bancos embutidos (SQLite) em que abrir conexão é barato
+
+    Cada thread reutiliza a própria conexão; se ela já estiver emprestada (ex.: uma
+    exportação em streaming ainda aberta enquanto a thread atende outra requisição),
+    uma conexão extra é aberta. Uma conexão devolvida por outra thread passa a ser
+    dessa thread. Mesma interface de `ConnectionPool` usada pelo `DatabaseConnection`.
+    """
+
+    def __init__(self, connect, reset=None, max_idle_per_thread=2):
+        self._connect = connect
+        self._reset = reset
+        self.max_idle_per_thread = max_idle_per_thread
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._in_use = {}         # id(conexão) -> geração
+        self._generation = 0
+
+        self._created = 0
+        self._closed = 0
+        self._acquisitions = 0
+        _pools.add(self)
+
+    def _idle(self):
+        idle = getattr(self._local, 'idle', None)
+        if idle is None or getattr(self._local, 'generation', None) != self._generation:
+            # Conexões de uma geração anterior (close_all) são fechadas no primeiro uso da thread
+            for connection in idle or (): self._close(connection)
+            idle = self._local.idle = []
+            self._local.generation = self._generation
+        return idle
+
+    def acquire(self, timeout=None):
+        """Conexão da thread atual (ou uma nova, se ela estiver em uso)"""
+        idle = self._idle()
+        connection = idle.pop() if idle else None
+        if connection is None:
+            connection = self._connect()
+            with self._lock: self._created += 1
+        with self._lock:
+            self._in_use[id(connection)] = self._generation
+            self._acquisitions += 1
+        return connection
+
+    def release(self, connection, discard=False):
+        with self._lock:
+            generation = self._in_use.pop(id(connection), None)
+        if generation is None:
+            logger.warning("Tentativa de devolver ao pool uma conexão que não pertence a ele")
+            return
+
+        if not discard and self._reset is not None:
+            try:
+                self._reset(connection)
+            except Exception as e:
+                logger.warning(f"Falha ao reinicializar conexão devolvida ao pool: {e}")
+                discard = True
+
+        idle = self._idle()
+        if discard or generation != self._generation or len(idle) >= self.max_idle_per_thread:
+            self._close(connection)
+            return
+        idle.append(connection)
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._lock: self._closed += 1
+
+    @contextmanager
+    def connection(self, timeout=None):
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def warmup(self):
+        """Nada a pré-abrir: cada thread abre a sua conexão no primeiro uso"""
+
+    def prune(self):
+        return 0
+
+    def close_all(self):
+        """Fecha as conexões ociosas da thread atual; as das demais threads são descartadas no próximo uso"""
+        idle = self._idle()
+        with self._lock: self._generation += 1
+        for connection in idle: self._close(connection)
+        idle.clear()
+
+    def reset_after_fork(self):
+        """Esquece as conexões herdadas do processo pai (o filho abre as próprias)"""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._in_use = {}
+        self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'mode': 'thread',
+                'in_use': len(self._in_use),
+                'max_idle_per_thread': self.max_idle_per_thread,
+                'created': self._created,
+                'closed': self._closed,
+                'acquisitions': self._acquisitions
+            }
@@ -0,0 +1,68 @@
+-- Esquema do banco SQLite (DB_ENGINE=sqlite): mesmas tabelas e colunas do SQL Server.
+-- DECIMAL e DATETIME são lidos como Decimal e datetime (conversores do sqlite3 registrados
+-- em src/database/dialects.py); os índices cobrem os campos aceitos em ?sort=, nos filtros
+-- e nas faixas de /api/arvores/query.
+
+CREATE TABLE IF NOT EXISTS Especies (
+    EspecieID INTEGER PRIMARY KEY AUTOINCREMENT,
+    NomeCientifico NVARCHAR(200),
+    NomePopular NVARCHAR(200),
+    Familia NVARCHAR(100),
+    Descricao TEXT,
+    DataCadastro DATETIME
+);
+CREATE INDEX IF NOT EXISTS IX_Especies_NomeCientifico ON Especies (NomeCientifico);
+CREATE INDEX IF NOT EXISTS IX_Especies_NomePopular ON Especies (NomePopular);
+CREATE INDEX IF NOT EXISTS IX_Especies_Familia ON Especies (Familia);
+
+CREATE TABLE IF NOT EXISTS Biomas (
+    BiomaID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Nome NVARCHAR(100),
+    Descricao TEXT,
+    Regiao NVARCHAR(100)
+);
+CREATE INDEX IF NOT EXISTS IX_Biomas_Nome ON Biomas (Nome);
+CREATE INDEX IF NOT EXISTS IX_Biomas_Regiao ON Biomas (Regiao);
+
+CREATE TABLE IF NOT EXISTS Ocorrencias (
+    OcorrenciaID INTEGER PRIMARY KEY AUTOINCREMENT,
+    EspecieID INTEGER REFERENCES Especies (EspecieID),
+    BiomaID INTEGER REFERENCES Biomas (BiomaID),
+    Frequencia NVARCHAR(50)
+);
+CREATE INDEX IF NOT EXISTS IX_Ocorrencias_EspecieID ON Ocorrencias (EspecieID);
+CREATE INDEX IF NOT EXISTS IX_Ocorrencias_BiomaID ON Ocorrencias (BiomaID);
+
+CREATE TABLE IF NOT EXISTS Caracteristicas (
+    CaracteristicaID INTEGER PRIMARY KEY AUTOINCREMENT,
+    EspecieID INTEGER REFERENCES Especies (EspecieID),
+    AlturaMedia DECIMAL(10, 2),
+    DiametroMedio DECIMAL(10, 2),
+    TipoFolha NVARCHAR(100),
+    Floracao NVARCHAR(100)
+);
+CREATE INDEX IF NOT EXISTS IX_Caracteristicas_EspecieID ON Caracteristicas (EspecieID);
+CREATE INDEX IF NOT EXISTS IX_Caracteristicas_AlturaMedia ON Caracteristicas (AlturaMedia);
+CREATE INDEX IF NOT EXISTS IX_Caracteristicas_DiametroMedio ON Caracteristicas (DiametroMedio);
+
+CREATE TABLE IF NOT EXISTS Curiosidades (
+    CuriosidadeID INTEGER PRIMARY KEY AUTOINCREMENT,
+    EspecieID INTEGER REFERENCES Especies (EspecieID),
+    Texto TEXT,
+    Fonte NVARCHAR(200)
+);
+CREATE INDEX IF NOT EXISTS IX_Curiosidades_EspecieID ON Curiosidades (EspecieID);
+
+CREATE TABLE IF NOT EXISTS DadosArvore (
+    DadosID INTEGER PRIMARY KEY AUTOINCREMENT,
+    EspecieID INTEGER REFERENCES Especies (EspecieID),
+    TempoDeVidaEstimado INTEGER,
+    CrescimentoAnual DECIMAL(10, 2),
+    RaizProfundidadeMedia DECIMAL(10, 2),
+    DensidadeMadeira DECIMAL(10, 2)
+);
+CREATE INDEX IF NOT EXISTS IX_DadosArvore_EspecieID ON DadosArvore (EspecieID);
+CREATE INDEX IF NOT EXISTS IX_DadosArvore_TempoDeVidaEstimado ON DadosArvore (TempoDeVidaEstimado);
+CREATE INDEX IF NOT EXISTS IX_DadosArvore_CrescimentoAnual ON DadosArvore (CrescimentoAnual);
+CREATE INDEX IF NOT EXISTS IX_DadosArvore_RaizProfundidadeMedia ON DadosArvore (RaizProfundidadeMedia);
+CREATE INDEX IF NOT EXISTS IX_DadosArvore_DensidadeMadeira ON DadosArvore (DensidadeMadeira);
@@ -0,0 +1,45 @@
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TableVersions:
+    """Contador de versão por tabela, incrementado a cada escrita confirmada
+
+    Componentes que mantêm dados derivados do banco (cache de respostas,
+    índices em memória...) se inscrevem com `subscribe` e recebem
+    `(tabela, ids)` após cada commit; `ids` é None quando não se sabe
+    quais registros mudaram.
+    """
+
+    def __init__(self):
+        self._versions = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def bump(self, table, ids=None):
+        """Registra uma escrita na tabela e notifica os inscritos"""
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(table, ids)
+            except Exception as e:
+                logger.error(f"Erro ao notificar escrita na tabela {table}: {e}")
+
+    def get(self, table):
+        return self._versions.get(table, 0)
+
+    def snapshot(self, tables):
+        """Retorna as versões atuais das tabelas informadas"""
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+    def subscribe(self, listener):
+        with self._lock:
+            self._listeners.append(listener)
+        return listener
+
+# Instância global das versões de tabela
+table_versions = TableVersions()
@@ -0,0 +1,135 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+from flask.json.provider import JSONProvider
+import json
+import os
+import re
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKENDS = ('auto', 'orjson', 'stdlib')
+
+class Fragment:
+    """Trecho de JSON já serializado, inserido na resposta sem ser decodificado nem recodificado
+
+    Usado para documentos guardados em cache já codificados: uma resposta que monta
+    vários deles paga apenas a cópia dos bytes.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data.encode('utf-8') if isinstance(data, str) else data
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"Fragment({self.data[:40]!r}{'...' if len(self.data) > 40 else ''})"
+
+def resolve_backend(backend):
+    if backend not in JSON_BACKENDS: raise ValueError(f"JSON_ENCODER inválido: {backend} (use {', '.join(JSON_BACKENDS)})")
+    if backend == 'orjson' and orjson is None: raise ValueError("JSON_ENCODER=orjson, mas o pacote orjson não está instalado")
+    if backend != 'auto': return backend
+    return 'orjson' if orjson is not None else 'stdlib'
+
+# orjson >= 3.9 insere fragmentos nativamente; nas versões anteriores (e no json da
+# biblioteca padrão) cada fragmento vira um marcador trocado pelos bytes após a codificação
+NATIVE_FRAGMENTS = orjson is not None and hasattr(orjson, 'Fragment')
+
+class FastJSONProvider(JSONProvider):
+    """Provedor JSON do Flask com codificador otimizado (orjson) e fallback para o json padrão
+
+    Serializa diretamente os tipos que vêm do banco: `Decimal` (como número), datas e
+    horas (ISO 8601), linhas do pyodbc (`Row`, como objeto pelos nomes das colunas) e
+    `Fragment` (JSON pré-codificado, copiado para a saída).
+    """
+
+    mimetype = 'application/json'
+    # As respostas mantêm a ordem das colunas (mesma intenção de JSON_SORT_KEYS = False)
+    sort_keys = False
+    # Indentação apenas em modo debug (mesmo comportamento do provedor padrão do Flask)
+    compact = None
+
+    def __init__(self, app, backend=None):
+        super().__init__(app)
+        self.backend = resolve_backend(backend or os.environ.get('JSON_ENCODER', 'auto'))
+        # Marcador de fragmento único por processo (não colide com textos dos registros)
+        self._marker = f"__fragment_{uuid.uuid4().hex}_"
+        self._marker_pattern = re.compile(b'"' + re.escape(self._marker.encode('ascii')) + rb'(\d+)"')
+
+    def _indent(self):
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+    @staticmethod
+    def _convert(value):
+        """Tipos não nativos de JSON que aparecem nas respostas"""
+        if isinstance(value, Decimal): return float(value)
+        if isinstance(value, (datetime, date, time)): return value.isoformat()
+        if hasattr(value, 'cursor_description'):
+            return {column[0]: item for column, item in zip(value.cursor_description, value)}
+        if isinstance(value, (set, frozenset)): return list(value)
+        raise TypeError(f"Objeto do tipo {type(value).__name__} não é serializável em JSON")
+
+    def _default(self, fragments):
+        """Função `default` de uma serialização; coleta os fragmentos quando não há suporte nativo"""
+        convert, marker = self._convert, self._marker
+
+        def default(value):
+            if isinstance(value, Fragment):
+                if NATIVE_FRAGMENTS and self.backend == 'orjson': return orjson.Fragment(value.data)
+                fragments.append(value.data)
+                return f"{marker}{len(fragments) - 1}"
+            return convert(value)
+        return default
+
+    def _splice(self, data, fragments):
+        if not fragments: return data
+        return self._marker_pattern.sub(lambda match: fragments[int(match.group(1))], data)
+
+    def dumps_bytes(self, obj, **kwargs):
+        """Serializa `obj` em bytes UTF-8 (caminho usado nas respostas)"""
+        if isinstance(obj, Fragment): return obj.data
+
+        fragments = []
+        default = self._default(fragments)
+        sort_keys = kwargs.pop('sort_keys', self.sort_keys)
+
+        if self.backend == 'orjson' and not kwargs:
+            option = 0
+            if sort_keys: option |= orjson.OPT_SORT_KEYS
+            if self._indent(): option |= orjson.OPT_INDENT_2
+            try:
+                data = orjson.dumps(obj, default=default, option=option)
+            except orjson.JSONEncodeError:
+                # Chaves não textuais (ex.: contagens por ID) são aceitas no caminho mais lento
+                del fragments[:]
+                data = orjson.dumps(obj, default=default, option=option | orjson.OPT_NON_STR_KEYS)
+            return self._splice(data, fragments)
+
+        kwargs.setdefault('ensure_ascii', False)
+        if self._indent(): kwargs.setdefault('indent', 2)
+        else: kwargs.setdefault('separators', (',', ':'))
+        text = json.dumps(obj, default=default, sort_keys=sort_keys, **kwargs)
+        return self._splice(text.encode('utf-8'), fragments)
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj, **kwargs).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if self.backend == 'orjson' and not kwargs: return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+    def encode(self, obj):
+        """Pré-codifica `obj` como Fragment (para guardar em cache e reutilizar em respostas)"""
+        return Fragment(self.dumps_bytes(obj))
@@ -6,6 +6,22 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from flask import Flask, jsonify, render_template
 from flask_cors import CORS
 from src.database.connection import db_connection
+from src.database.executor import db_executor
+from src.models.statements import statement_stats
+from src.cache import response_cache
+from src.compression import response_compressor
+from src.metrics import request_metrics
+from src.models.snapshot import snapshot_store
+from src.search import search_index
+from src.autocomplete import especies_autocomplete
+from src.models.especies import especies_model
+from src.models.biomas import biomas_model
+from src.models.ocorrencias import ocorrencias_model
+from src.models.caracteristicas import caracteristicas_model
+from src.models.curiosidades import curiosidades_model
+from src.models.dados_arvore import dados_arvore_model
+from src.models.arvores import arvores_completas_model
+from src.json_provider import FastJSONProvider
 from src.config import config
 from src.routes.especies import especies_bp
 from src.routes.biomas import biomas_bp
@@ -14,6 +30,8 @@ from src.routes.caracteristicas import caracteristicas_bp
 from src.routes.curiosidades import curiosidades_bp
 from src.routes.dados_arvore import dados_arvore_bp
 from src.routes.arvores import arvores_bp
+from src.routes.search import search_bp
+from src.routes.stats import stats_bp
 import logging
 
 '''Configuração do logger para registrar informações da aplicação'''
@@ -31,8 +49,18 @@ def create_app(config_name: str='default'):
     # Carregar configuração
     app.config.from_object(config[config_name])
     
-    # Configuração CORS para permitir requisições de qualquer origem
-    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    # Serialização JSON com orjson quando instalado (JSON_ENCODER=auto|orjson|stdlib)
+    app.json = FastJSONProvider(app)
+    logger.info(f"Serialização JSON: {app.json.backend}")
+    
+    # Configuração CORS para permitir requisições de qualquer origem (com os cabeçalhos de paginação visíveis)
+    CORS(app, resources={r"/api/*": {"origins": "*", "expose_headers": ["Link", "X-Next-Cursor", "X-Total-Count"]}})
+    
+    # Compressão gzip/brotli negociada por Accept-Encoding (COMPRESSION_ENABLED=false desliga)
+    response_compressor.init_app(app)
+    
+    # Custo de banco por requisição (Server-Timing) e histogramas por endpoint (METRICS_ENABLED=false desliga)
+    request_metrics.init_app(app)
     
     """Registrar blueprints para rotas da API"""
     app.register_blueprint(especies_bp, url_prefix='/api')
@@ -42,6 +70,26 @@ def create_app(config_name: str='default'):
     app.register_blueprint(curiosidades_bp, url_prefix='/api')
     app.register_blueprint(dados_arvore_bp, url_prefix='/api')
     app.register_blueprint(arvores_bp, url_prefix='/api')
+    app.register_blueprint(search_bp, url_prefix='/api')
+    app.register_blueprint(stats_bp, url_prefix='/api')
+    
+    models = [
+        especies_model, biomas_model, ocorrencias_model,
+        caracteristicas_model, curiosidades_model, dados_arvore_model
+    ]
+    
+    # Textos SQL das consultas mais comuns compilados antes da primeira requisição
+    if os.environ.get('STATEMENT_WARMUP', 'true').lower() == 'true':
+        for model in models: model.warm_statements()
+    
+    # Réplica em memória das tabelas de referência (SNAPSHOT_ENABLED=true)
+    if snapshot_store.enabled: snapshot_store.start(models)
+    
+    # Índice de busca textual de /api/search (SEARCH_INDEX_ENABLED=false usa LIKE no banco)
+    if search_index.enabled: search_index.build()
+    
+    # Sugestões de /api/especies/autocomplete (AUTOCOMPLETE_ENABLED=false usa o banco)
+    if especies_autocomplete.enabled: especies_autocomplete.build()
     
     @app.route('/')
     def index_home() -> render_template: return render_template('index.html')
@@ -72,11 +120,11 @@ def create_app(config_name: str='default'):
         info = {
             'name': 'API Árvores Brasileiras', 'version': '2.0.0',
             'description': 'API completa para gerenciamento de dados sobre árvores brasileiras usando pyodbc',
-            'database': 'SQL Server (pyodbc)',
+            'database': db_connection.dialect.description,
             'endpoints': {
                 'especies': '/api/especies', 'biomas': '/api/biomas', 'ocorrencias': '/api/ocorrencias',
                 'caracteristicas': '/api/caracteristicas', 'curiosidades': '/api/curiosidades',
-                'dados_arvore': '/api/dados-arvore'
+                'dados_arvore': '/api/dados-arvore', 'arvores_query': '/api/arvores/query', 'stats': '/api/stats'
             },
             'methods': ['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD'],
             'features': [
@@ -86,6 +134,7 @@ def create_app(config_name: str='default'):
                 'Relacionamentos opcionais',
                 'Rotas auxiliares especializadas',
                 'Conexão direta com SQL Server via pyodbc',
+                'SQLite embutido para execução local (DB_ENGINE=sqlite)',
                 'Gerenciamento automático de transações'
             ],
             'configuration': {
@@ -115,7 +164,49 @@ def create_app(config_name: str='default'):
         except Exception as e:
             logger.error(f"Erro no teste de banco de dados: {e}")
             return jsonify({'status': 'error', 'message': 'Erro ao testar conexão com banco de dados', 'error': str(e)}), 500
-    
+
+    @app.route('/api/database/pool', methods=['GET'])
+    def pool_status():
+        """Endpoint com estatísticas do pool de conexões"""
+        return jsonify(db_connection.pool_stats()), 200
+
+    @app.route('/api/database/executor', methods=['GET'])
+    def executor_status():
+        """Endpoint com estatísticas do executor do banco usado pelo caminho ASGI"""
+        return jsonify(db_executor.stats()), 200
+
+    @app.route('/api/database/statements', methods=['GET'])
+    def statements_status():
+        """Endpoint com estatísticas dos caches de comandos SQL (formas compiladas, acertos)"""
+        return jsonify(statement_stats()), 200
+
+    @app.route('/api/cache/stats', methods=['GET'])
+    def cache_status():
+        """Endpoint com estatísticas do cache de respostas e dos documentos pré-codificados"""
+        stats = response_cache.stats()
+        stats['encoded_documents'] = arvores_completas_model.encoded_stats()
+        return jsonify(stats), 200
+
+    @app.route('/api/compression/stats', methods=['GET'])
+    def compression_status():
+        """Endpoint com estatísticas da compressão de respostas (codificações, bytes, taxa)"""
+        return jsonify(response_compressor.stats()), 200
+
+    @app.route('/api/metrics', methods=['GET'])
+    def metrics_status():
+        """Endpoint com os totais das consultas e os histogramas por endpoint (duração, tempo de banco, consultas)"""
+        return jsonify(request_metrics.stats()), 200
+
+    @app.route('/api/snapshot/stats', methods=['GET'])
+    def snapshot_status():
+        """Endpoint com o estado da réplica em memória (linhas e última carga por tabela)"""
+        return jsonify(snapshot_store.stats()), 200
+
+    @app.route('/api/search/stats', methods=['GET'])
+    def search_status():
+        """Endpoint com o estado dos índices de busca e de autocomplete"""
+        return jsonify({'search': search_index.stats(), 'autocomplete': especies_autocomplete.stats()}), 200
+
     """Handler para rotas não encontradas"""
     @app.errorhandler(404)
     def not_found(error): return jsonify({'error': 'Endpoint não encontrado'}), 404
@@ -139,6 +230,7 @@ def main() -> None:
  
     logger.info("=== API Árvores Brasileiras v2.0.0 (pyodbc) ===")
     logger.info(f"Ambiente: {config_name}")
+    logger.info(f"Banco: {db_connection.dialect.description}")
     logger.info(f"Servidor SQL: {os.environ.get('SQL_SERVER', 'localhost')}")
     logger.info(f"Banco de dados: {os.environ.get('SQL_DATABASE', 'ArvoresBrasileiras')}")
     
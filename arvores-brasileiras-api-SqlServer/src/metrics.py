@@ -0,0 +1,166 @@
+from bisect import bisect_left
+from flask import g, request
+from time import perf_counter
+from src.database.instrumentation import query_instrumentation
+import threading
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Limites superiores (inclusivos) dos buckets dos histogramas
+DURATION_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+class Histogram:
+    """Histograma de buckets fixos; os percentis são estimados pelo limite do bucket"""
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # o último bucket recebe o que passa do maior limite
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max: self.max = value
+
+    def percentile(self, fraction):
+        if not self.count: return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank: return min(bound, round(self.max, 3))
+        return round(self.max, 3)
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else None,
+            'max': round(self.max, 3),
+            'p50': self.percentile(0.50),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'buckets': {
+                **{f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)},
+                'inf': self.counts[-1]
+            }
+        }
+
+class EndpointMetrics:
+    """Histogramas de um endpoint: duração total, tempo de banco e consultas por requisição"""
+    __slots__ = ('requests', 'errors', 'duration', 'db_time', 'queries')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.duration = Histogram(DURATION_BUCKETS_MS)
+        self.db_time = Histogram(DURATION_BUCKETS_MS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'duration_ms': self.duration.to_dict(),
+            'db_time_ms': self.db_time.to_dict(),
+            'queries': self.queries.to_dict()
+        }
+
+class RequestMetrics:
+    """Métricas por requisição: custo de banco no cabeçalho Server-Timing e histogramas por endpoint
+
+    O custo de banco vem da instrumentação do `DatabaseConnection` (quantidade de
+    consultas, checkout no pool, execução e leitura). Em respostas em streaming
+    (exportações) o Server-Timing só cobre o trabalho feito antes do primeiro byte; os
+    histogramas são atualizados quando a resposta é fechada, depois do último bloco.
+    """
+
+    def __init__(self, instrumentation=query_instrumentation, server_timing=True):
+        self.instrumentation = instrumentation
+        self.server_timing = server_timing
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    @property
+    def enabled(self):
+        return self.instrumentation.enabled
+
+    def init_app(self, app):
+        if not self.enabled: return
+        app.before_request(self._start)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown)
+
+    def _start(self):
+        g.metrics_started = perf_counter()
+        g.query_stats = self.instrumentation.start(request.endpoint)
+
+    def _after_request(self, response):
+        stats = g.get('query_stats')
+        if stats is None: return response
+        g.metrics_status = response.status_code
+
+        if self.server_timing:
+            elapsed = perf_counter() - g.metrics_started
+            response.headers.add('Server-Timing', ', '.join((
+                f'db;dur={stats.db_time * 1000:.3f};desc="{stats.queries} consultas"',
+                f'db-acquire;dur={stats.acquire_time * 1000:.3f}',
+                f'db-exec;dur={stats.execute_time * 1000:.3f}',
+                f'db-fetch;dur={stats.fetch_time * 1000:.3f}',
+                f'app;dur={elapsed * 1000:.3f}'
+            )))
+
+        if response.is_streamed:
+            # As consultas de uma exportação rodam enquanto o corpo é enviado, depois do
+            # teardown: a requisição só é contabilizada quando o servidor fecha a resposta
+            g.metrics_deferred = True
+            started, endpoint, status = g.metrics_started, request.endpoint, response.status_code
+            response.call_on_close(lambda: self._complete(stats, started, endpoint, status))
+        return response
+
+    def _teardown(self, error=None):
+        stats = g.pop('query_stats', None)
+        if stats is None or g.pop('metrics_deferred', False): return
+        status = 500 if error is not None else g.get('metrics_status', 500)
+        self._complete(stats, g.metrics_started, request.endpoint, status)
+
+    def _complete(self, stats, started, endpoint, status):
+        self.instrumentation.finish()
+        self.observe(
+            endpoint or 'unmatched', (perf_counter() - started) * 1000,
+            stats.db_time * 1000, stats.queries, status >= 500
+        )
+
+    def observe(self, endpoint, duration_ms, db_time_ms, queries, error=False):
+        with self._lock:
+            metrics = self._endpoints.get(endpoint)
+            if metrics is None: metrics = self._endpoints[endpoint] = EndpointMetrics()
+            metrics.requests += 1
+            if error: metrics.errors += 1
+            metrics.duration.observe(duration_ms)
+            metrics.db_time.observe(db_time_ms)
+            metrics.queries.observe(queries)
+
+    def reset(self):
+        with self._lock: self._endpoints.clear()
+
+    def stats(self):
+        with self._lock:
+            endpoints = {name: metrics.to_dict() for name, metrics in sorted(self._endpoints.items())}
+        return {
+            'enabled': self.enabled,
+            'server_timing': self.server_timing,
+            'queries': self.instrumentation.stats(),
+            'endpoints': endpoints
+        }
+
+# Instância global das métricas de requisição (SERVER_TIMING_ENABLED=false omite o cabeçalho)
+request_metrics = RequestMetrics(
+    server_timing=os.environ.get('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+)
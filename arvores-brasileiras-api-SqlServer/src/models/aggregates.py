@@ -0,0 +1,394 @@
+from datetime import date, datetime
+from decimal import Decimal
+from src.database.connection import db_connection
+from src.models.pagination import InvalidParameter
+from src.models.snapshot import snapshot_store, sort_key
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Dimensões de agrupamento vindas de outra tabela: nome -> (tabela, chave de junção, coluna)
+DIMENSIONS = {
+    'Familia': ('Especies', 'EspecieID', 'Familia'),
+    'Bioma': ('Biomas', 'BiomaID', 'Nome'),
+    'Regiao': ('Biomas', 'BiomaID', 'Regiao')
+}
+
+NUMERIC_TYPES = (int, Decimal, float)
+MAX_PERCENTILES = 10
+MAX_BINS = 100
+DEFAULT_GROUP_LIMIT = 1000
+MAX_GROUP_LIMIT = 10000
+# Casas decimais das médias e percentis (resultados iguais no banco e em memória)
+DECIMALS = 6
+
+# Leitura dos valores ordenados quando o banco não calcula percentis
+FETCH_SIZE = 5000
+
+def numeric_fields(model):
+    """Campos numéricos agregáveis (sem a chave primária e as chaves estrangeiras)"""
+    return [
+        name for name, spec in model.field_specs.items()
+        if spec.type in NUMERIC_TYPES and name != model.primary_key and not (spec.indexed and spec.type is int)
+    ]
+
+def group_fields(model):
+    """Agrupamentos aceitos: colunas da tabela (exceto datas) e dimensões de tabelas relacionadas"""
+    fields = [name for name in model.fields if model.field_specs[name].type not in (datetime, date)]
+    fields.extend(name for name, (table, key, _) in DIMENSIONS.items()
+                  if name not in fields and key in model.fields and table != model.table_name)
+    return fields
+
+def _names(raw):
+    return [name.strip() for name in (raw or '').split(',') if name.strip()]
+
+def _number(raw, name):
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        raise InvalidParameter(f"Valor inválido para {name}: '{raw}'")
+    if not math.isfinite(value): raise InvalidParameter(f"Valor inválido para {name}: '{raw}'")
+    return value
+
+def percentile_cont(ordered, fraction):
+    """Percentil contínuo (interpolação linear entre postos), como o PERCENTILE_CONT do SQL Server"""
+    position = fraction * (len(ordered) - 1)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def _value(value):
+    if isinstance(value, Decimal): value = float(value)
+    return round(value, DECIMALS) if isinstance(value, float) else value
+
+class AggregateSpec:
+    """Agregação pedida em /api/stats/<recurso>, já validada"""
+    __slots__ = ('model', 'group_by', 'dimension', 'metrics', 'distinct', 'percentiles', 'bins', 'bins_min', 'bins_max',
+                 'limit', 'filters')
+
+    def __init__(self, model, group_by=None, metrics=(), distinct=None, percentiles=(), bins=None,
+                 bins_min=None, bins_max=None, limit=DEFAULT_GROUP_LIMIT, filters=None):
+        self.model = model
+        self.group_by = group_by
+        # Agrupamento por coluna de outra tabela (tabela, chave, coluna) ou None
+        self.dimension = DIMENSIONS[group_by] if group_by and group_by not in model.fields else None
+        self.metrics = tuple(metrics)
+        self.distinct = distinct
+        self.percentiles = tuple(percentiles)
+        self.bins = bins
+        self.bins_min = bins_min
+        self.bins_max = bins_max
+        self.limit = limit
+        self.filters = filters or None
+
+    @classmethod
+    def parse(cls, model, args, filters=None):
+        """Valida os parâmetros da query string; erros viram InvalidParameter (HTTP 400)"""
+        group_by = args.get('group_by') or None
+        if group_by is not None and group_by not in group_fields(model):
+            raise InvalidParameter(f"Agrupamento inválido: {group_by} (use {', '.join(group_fields(model))})")
+
+        metrics, allowed = _names(args.get('metrics')), numeric_fields(model)
+        invalid = [name for name in metrics if name not in allowed]
+        if invalid:
+            raise InvalidParameter(
+                f"Métrica inválida: {', '.join(invalid)} " + (f"(use {', '.join(allowed)})" if allowed else "(sem campos numéricos)")
+            )
+
+        distinct = args.get('distinct') or None
+        if distinct is not None and distinct not in model.columns:
+            raise InvalidParameter(f"Campo inválido em distinct: {distinct}")
+
+        percentiles = [_number(raw, 'percentiles') for raw in _names(args.get('percentiles'))]
+        if any(not 0 <= value <= 100 for value in percentiles):
+            raise InvalidParameter("Percentis devem estar entre 0 e 100")
+        if len(percentiles) > MAX_PERCENTILES:
+            raise InvalidParameter(f"Máximo de {MAX_PERCENTILES} percentis")
+
+        bins = args.get('bins')
+        if bins is not None:
+            if not bins.isdigit() or not 1 <= int(bins) <= MAX_BINS:
+                raise InvalidParameter(f"bins deve ser um inteiro entre 1 e {MAX_BINS}")
+            bins = int(bins)
+        bins_min = _number(args['bins_min'], 'bins_min') if args.get('bins_min') else None
+        bins_max = _number(args['bins_max'], 'bins_max') if args.get('bins_max') else None
+        if bins_min is not None and bins_max is not None and bins_min > bins_max:
+            raise InvalidParameter("bins_min maior que bins_max")
+        if (percentiles or bins) and not metrics:
+            raise InvalidParameter("percentiles e bins exigem metrics")
+
+        limit = args.get('limit', DEFAULT_GROUP_LIMIT)
+        if not str(limit).isdigit() or not 1 <= int(limit) <= MAX_GROUP_LIMIT:
+            raise InvalidParameter(f"limit deve ser um inteiro entre 1 e {MAX_GROUP_LIMIT}")
+
+        spec = cls(model, group_by, dict.fromkeys(metrics), distinct, dict.fromkeys(percentiles), bins, bins_min, bins_max,
+                   int(limit), filters)
+        # Filtros inválidos são rejeitados aqui, antes da consulta
+        model.filter_compiler.compile(spec.filters)
+        return spec
+
+    @property
+    def tables(self):
+        """Tabelas de que o resultado depende (escritas nelas invalidam o cache)"""
+        return (self.model.table_name,) + ((self.dimension[0],) if self.dimension else ())
+
+class Aggregator:
+    """Contagens, mínimo, máximo, média, percentis e histogramas por grupo
+
+    Com a réplica em memória carregada (da tabela e da dimensão de agrupamento), os
+    valores são agregados sobre listas por coluna, sem consultar o banco. Caso
+    contrário as agregações vão para o SQL: um GROUP BY com as contagens e as médias,
+    uma consulta por métrica para os histogramas (contagem por faixa) e, nos percentis,
+    PERCENTILE_CONT quando o banco tem (SQL Server) ou a leitura só da coluna ordenada.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.model = spec.model
+
+    def run(self):
+        snapshots = self._snapshots()
+        groups, truncated = self._memory(*snapshots) if snapshots else self._database()
+        if snapshots and truncated and not self._orders_groups_in_memory():
+            # O corte em `limit` segue o ORDER BY do banco, que a memória não reproduz em texto
+            snapshots = None
+            groups, truncated = self._database()
+        histograms = {}
+        if self.spec.bins:
+            for metric in self.spec.metrics:
+                histogram = self._histogram_range(groups, metric)
+                if histogram is not None: histograms[metric] = histogram
+            if snapshots: self._memory_histograms(groups, histograms)
+            else: self._database_histograms(groups, histograms)
+        for group in groups.values(): group.pop('values', None)
+
+        ordered = sorted(groups.items(), key=lambda item: sort_key(item[0]))
+        return {
+            'group_by': self.spec.group_by,
+            'metrics': list(self.spec.metrics),
+            'groups': [self._result(value, group) for value, group in ordered],
+            'histograms': histograms or None,
+            'truncated': truncated,
+            'source': 'memory' if snapshots else 'database'
+        }
+
+    def _result(self, value, group):
+        result = {self.spec.group_by: value} if self.spec.group_by else {}
+        result['count'] = group['count']
+        if self.spec.distinct: result['distinct'] = {self.spec.distinct: group['distinct']}
+        if self.spec.metrics: result['metrics'] = group['metrics']
+        return result
+
+    def _metric(self, metric, count, low, high, average):
+        # Decimais saem como float nos dois caminhos (o banco pode devolver inteiros, ex.: 2.00 no SQLite)
+        if self.model.field_specs[metric].type is not int:
+            low, high = (None if value is None else float(value) for value in (low, high))
+        return {'count': count, 'min': _value(low), 'max': _value(high), 'avg': _value(average) if count else None}
+
+    def _percentiles(self, ordered):
+        return {f"p{percentile:g}": _value(percentile_cont(ordered, percentile / 100)) if ordered else None
+                for percentile in self.spec.percentiles}
+
+    def _histogram_range(self, groups, metric):
+        """Faixas do histograma, iguais em todos os grupos (limites pedidos ou extremos dos dados)"""
+        lows = [group['metrics'][metric]['min'] for group in groups.values() if group['metrics'][metric]['count']]
+        highs = [group['metrics'][metric]['max'] for group in groups.values() if group['metrics'][metric]['count']]
+        low = self.spec.bins_min if self.spec.bins_min is not None else min(lows, default=None)
+        high = self.spec.bins_max if self.spec.bins_max is not None else max(highs, default=None)
+        if low is None or high is None or low > high: return None
+        width = (high - low) / self.spec.bins
+        # Faixa de largura zero (um único valor): tudo na primeira faixa
+        return {'min': low, 'max': high, 'bins': self.spec.bins, 'width': _value(width) if width else 0.0}
+
+    def _bucket(self, value, low, width):
+        return min(int((value - low) / width), self.spec.bins - 1) if width else 0
+
+    # Em memória
+
+    def _orders_groups_in_memory(self):
+        """Os grupos ficam na mesma ordem do banco (chaves numéricas, ou texto no SQLite)"""
+        if self.model.dialect.orders_text_by_code_point or self.spec.group_by is None: return True
+        return self.spec.dimension is None and self.model.field_specs[self.spec.group_by].type is not str
+
+    def _snapshots(self):
+        """(réplica da tabela, réplica da dimensão ou None) se tudo estiver carregado em memória"""
+        snapshot = self.model.active_snapshot()
+        if snapshot is None: return None
+        if self.spec.dimension is None: return snapshot, None
+        dimension = snapshot_store.snapshots.get(self.spec.dimension[0])
+        return (snapshot, dimension) if dimension is not None and dimension.ready else None
+
+    def _memory(self, snapshot, dimension):
+        spec = self.spec
+        key = spec.dimension[1] if spec.dimension else spec.group_by
+        fields = list(dict.fromkeys(
+            [self.model.primary_key] + ([key] if key else []) + list(spec.metrics) + ([spec.distinct] if spec.distinct else [])
+        ))
+        predicate = self.model.filter_compiler.predicate(spec.filters)
+        arrays = dict(zip(fields, snapshot.column_arrays(fields, predicate)))
+
+        # Posições das linhas de cada grupo
+        keys = arrays[key] if key else [None] * len(arrays[self.model.primary_key])
+        if spec.dimension:
+            names = dimension.value_map(spec.dimension[2])
+            keys = [names.get(value) for value in keys]
+        positions = {}
+        for index, value in enumerate(keys): positions.setdefault(value, []).append(index)
+
+        truncated = len(positions) > spec.limit
+        if truncated:
+            positions = dict(sorted(positions.items(), key=lambda item: sort_key(item[0]))[:spec.limit])
+
+        groups = {}
+        for value, rows in positions.items():
+            group = groups[value] = {'count': len(rows), 'metrics': {}, 'values': {}}
+            if spec.distinct:
+                column = arrays[spec.distinct]
+                group['distinct'] = len({column[row] for row in rows if column[row] is not None})
+            for metric in spec.metrics:
+                column = arrays[metric]
+                values = sorted(column[row] for row in rows if column[row] is not None)
+                group['values'][metric] = values
+                group['metrics'][metric] = self._metric(
+                    metric, len(values), values[0] if values else None, values[-1] if values else None,
+                    sum(values) / len(values) if values else None
+                )
+                if spec.percentiles: group['metrics'][metric]['percentiles'] = self._percentiles(values)
+        return groups, truncated
+
+    def _memory_histograms(self, groups, histograms):
+        for group in groups.values():
+            values = group['values']
+            for metric, histogram in histograms.items():
+                counts = [0] * histogram['bins']
+                low, high, width = histogram['min'], histogram['max'], histogram['width']
+                for value in values[metric]:
+                    if low <= value <= high: counts[self._bucket(value, low, width)] += 1
+                group['metrics'][metric]['histogram'] = counts
+
+    # No banco
+
+    def _source(self, where_clauses):
+        """FROM com a tabela filtrada (t) e, se o agrupamento vier de outra tabela, a junção (d)"""
+        spec = self.spec
+        key = spec.dimension[1] if spec.dimension else spec.group_by
+        columns = list(dict.fromkeys(
+            ([key] if key else []) + list(spec.metrics) + ([spec.distinct] if spec.distinct else [])
+        )) or [self.model.primary_key]
+        inner = self.model._where(f"SELECT {', '.join(columns)} FROM {self.model.table_name}", where_clauses)
+        source = f"({inner}) t"
+        if spec.dimension:
+            table, key, _ = spec.dimension
+            source += f" LEFT JOIN {table} d ON t.{key} = d.{key}"
+        return source
+
+    def _group_expression(self):
+        if self.spec.dimension: return f"d.{self.spec.dimension[2]}"
+        return f"t.{self.spec.group_by}" if self.spec.group_by else None
+
+    def _summary_statement(self, shape, where_clauses):
+        spec, group = self.spec, self._group_expression()
+
+        def build():
+            select = ([group] if group else []) + ["COUNT(*)"]
+            if spec.distinct: select.append(f"COUNT(DISTINCT t.{spec.distinct})")
+            for metric in spec.metrics:
+                select += [f"COUNT(t.{metric})", f"MIN(t.{metric})", f"MAX(t.{metric})", f"AVG(CAST(t.{metric} AS FLOAT))"]
+            query = f"SELECT {', '.join(select)} FROM {self._source(where_clauses)}"
+            return query + (f" GROUP BY {group} ORDER BY {group}" if group else "")
+        return self.model.statements.get(('stats', spec.group_by, spec.metrics, spec.distinct, shape), build)
+
+    def _database(self):
+        spec = self.spec
+        shape, where_clauses, params = self.model._build_filters(spec.filters)
+        groups = {}
+        with db_connection.get_cursor() as (cursor, connection):
+            cursor.execute(self._summary_statement(shape, where_clauses), params)
+            rows = cursor.fetchmany(spec.limit + 1)
+            truncated = len(rows) > spec.limit
+            for row in rows[:spec.limit]:
+                row = list(row)
+                value = _value(row.pop(0)) if spec.group_by else None
+                group = groups[value] = {'count': row.pop(0), 'metrics': {}}
+                if spec.distinct: group['distinct'] = row.pop(0)
+                for metric in spec.metrics:
+                    count, low, high, average = row[:4]
+                    del row[:4]
+                    group['metrics'][metric] = self._metric(metric, count, low, high, average)
+
+            if spec.percentiles:
+                for metric in spec.metrics:
+                    self._database_percentiles(cursor, groups, metric, shape, where_clauses, params)
+        return groups, truncated
+
+    def _database_percentiles(self, cursor, groups, metric, shape, where_clauses, params):
+        spec, group = self.spec, self._group_expression()
+        fractions = [percentile / 100 for percentile in spec.percentiles]
+        expressions = [self.model.dialect.percentile(fraction, f"t.{metric}", group) for fraction in fractions]
+
+        if None not in expressions:
+            query = self.model.statements.get(
+                ('stats-percentile', spec.group_by, metric, spec.percentiles, shape),
+                lambda: f"SELECT DISTINCT {', '.join(([group] if group else []) + expressions)} "
+                        f"FROM {self._source(where_clauses)} WHERE t.{metric} IS NOT NULL"
+            )
+            cursor.execute(query, params)
+            for row in cursor.fetchall():
+                row = list(row)
+                value = _value(row.pop(0)) if group else None
+                if value in groups:
+                    groups[value]['metrics'][metric]['percentiles'] = {
+                        f"p{percentile:g}": _value(result) for percentile, result in zip(spec.percentiles, row)
+                    }
+        else:
+            # Sem percentil no banco: lê só (grupo, valor) em ordem e interpola na aplicação
+            query = self.model.statements.get(
+                ('stats-values', spec.group_by, metric, shape),
+                lambda: f"SELECT {', '.join(([group] if group else []) + [f't.{metric}'])} "
+                        f"FROM {self._source(where_clauses)} WHERE t.{metric} IS NOT NULL "
+                        f"ORDER BY {', '.join(([group] if group else []) + [f't.{metric}'])}"
+            )
+            cursor.execute(query, params)
+            values = {}
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows: break
+                for row in rows:
+                    value = _value(row[0]) if group else None
+                    if value in groups: values.setdefault(value, []).append(_value(row[-1]))
+            for value, group_data in groups.items():
+                group_data['metrics'][metric]['percentiles'] = self._percentiles(values.get(value, []))
+
+        for group_data in groups.values():
+            group_data['metrics'][metric].setdefault('percentiles', self._percentiles([]))
+
+    def _database_histograms(self, groups, histograms):
+        spec, group = self.spec, self._group_expression()
+        shape, where_clauses, params = self.model._build_filters(spec.filters)
+        with db_connection.get_cursor() as (cursor, connection):
+            for metric, histogram in histograms.items():
+                low, high, width = histogram['min'], histogram['max'], histogram['width']
+                # Faixa calculada em uma subconsulta: o GROUP BY não repete expressões com parâmetros
+                query = self.model.statements.get(
+                    ('stats-histogram', spec.group_by, metric, shape),
+                    lambda: f"SELECT {'g, ' if group else ''}b, COUNT(*) FROM ("
+                            f"SELECT {f'{group} AS g, ' if group else ''}CAST((t.{metric} - ?) / ? AS INT) AS b "
+                            f"FROM {self._source(where_clauses)} WHERE t.{metric} >= ? AND t.{metric} <= ?"
+                            f") h GROUP BY {'g, ' if group else ''}b"
+                )
+                cursor.execute(query, [low, width or 1.0] + params + [low, high])
+                counts = {value: [0] * histogram['bins'] for value in groups}
+                for row in cursor.fetchall():
+                    value = _value(row[0]) if group else None
+                    if value in counts: counts[value][min(int(row[-2]), histogram['bins'] - 1)] += row[-1]
+                for value, group_data in groups.items():
+                    group_data['metrics'][metric]['histogram'] = counts[value]
+
+def aggregate(spec):
+    """Executa a agregação: em memória se a réplica estiver carregada, senão no banco"""
+    try:
+        return Aggregator(spec).run()
+    except Exception as e:
+        logger.error(f"Erro ao agregar {spec.model.table_name}: {e}")
+        raise
@@ -0,0 +1,183 @@
+from collections import OrderedDict
+from src.database.connection import db_connection
+from src.database.versions import table_versions
+from src.models.relationships import Relationship, chunked, load_relationships
+from src.models.statements import StatementCache, in_bucket, padded, placeholders
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ArvoresCompletasModel:
+    """Documento completo por espécie: dados da espécie + listas de biomas, características,
+    curiosidades e dados da árvore, cada lista buscada em lote (sem produto cartesiano)"""
+
+    # Tabelas lidas pelo documento (usadas na invalidação de cache)
+    cache_tables = ('Especies', 'Ocorrencias', 'Biomas', 'Caracteristicas', 'Curiosidades', 'DadosArvore')
+
+    # Limite de espécies por requisição em lote
+    MAX_IDS = 100
+
+    # Documentos guardados já codificados em JSON (reaproveitados entre requisições com ids diferentes)
+    MAX_ENCODED = int(os.environ.get('ARVORES_ENCODED_CACHE', 5000))
+
+    def __init__(self):
+        self.statements = StatementCache('ArvoresCompletas')
+        self._encoded = OrderedDict()   # EspecieID -> Fragment
+        self._encoded_lock = threading.Lock()
+        table_versions.subscribe(self._on_write)
+        self.relationships = [
+            Relationship(
+                'Biomas',
+                """
+                    SELECT o.EspecieID, b.BiomaID, b.Nome AS NomeBioma, b.Descricao AS DescricaoBioma,
+                           b.Regiao, o.Frequencia
+                    FROM Ocorrencias o
+                    LEFT JOIN Biomas b ON o.BiomaID = b.BiomaID
+                """,
+                foreign_key='o.EspecieID', local_key='EspecieID',
+                to_dict=lambda row: {
+                    'EspecieID': row[0],
+                    'BiomaID': row[1],
+                    'NomeBioma': row[2],
+                    'DescricaoBioma': row[3],
+                    'Regiao': row[4],
+                    'Frequencia': row[5]
+                }
+            ),
+            Relationship(
+                'Caracteristicas',
+                """
+                    SELECT EspecieID, CaracteristicaID, AlturaMedia, DiametroMedio, TipoFolha, Floracao
+                    FROM Caracteristicas
+                """,
+                foreign_key='EspecieID', local_key='EspecieID',
+                to_dict=lambda row: {
+                    'EspecieID': row[0],
+                    'CaracteristicaID': row[1],
+                    'AlturaMedia': float(row[2]) if row[2] is not None else None,
+                    'DiametroMedio': float(row[3]) if row[3] is not None else None,
+                    'TipoFolha': row[4],
+                    'Floracao': row[5]
+                }
+            ),
+            Relationship(
+                'Curiosidades',
+                """
+                    SELECT EspecieID, CuriosidadeID, Texto, Fonte
+                    FROM Curiosidades
+                """,
+                foreign_key='EspecieID', local_key='EspecieID',
+                to_dict=lambda row: {
+                    'EspecieID': row[0],
+                    'CuriosidadeID': row[1],
+                    'Texto': row[2],
+                    'Fonte': row[3]
+                }
+            ),
+            Relationship(
+                'DadosArvore',
+                """
+                    SELECT EspecieID, DadosID, TempoDeVidaEstimado, CrescimentoAnual,
+                           RaizProfundidadeMedia, DensidadeMadeira
+                    FROM DadosArvore
+                """,
+                foreign_key='EspecieID', local_key='EspecieID',
+                to_dict=lambda row: {
+                    'EspecieID': row[0],
+                    'DadosID': row[1],
+                    'TempoDeVidaEstimado': row[2],
+                    'CrescimentoAnual': float(row[3]) if row[3] is not None else None,
+                    'RaizProfundidadeMedia': float(row[4]) if row[4] is not None else None,
+                    'DensidadeMadeira': float(row[5]) if row[5] is not None else None
+                }
+            )
+        ]
+
+    @staticmethod
+    def especie_to_dict(row):
+        return {
+            'EspecieID': row[0],
+            'NomeCientifico': row[1],
+            'NomePopular': row[2],
+            'Familia': row[3],
+            'DescricaoEspecie': row[4],
+            'DataCadastro': row[5].isoformat() if row[5] else None
+        }
+
+    def get_many(self, especie_ids):
+        """Retorna os documentos das espécies informadas, na ordem pedida (ausentes são omitidos)"""
+        try:
+            especie_ids = list(dict.fromkeys(especie_ids))
+            documentos = {}
+
+            with db_connection.get_cursor() as (cursor, connection):
+                for chunk in chunked(especie_ids):
+                    size = in_bucket(len(chunk))
+                    query = self.statements.get(('especies', size), lambda: f"""
+                        SELECT EspecieID, NomeCientifico, NomePopular, Familia, Descricao, DataCadastro
+                        FROM Especies
+                        WHERE EspecieID IN ({placeholders(size)})
+                    """)
+                    cursor.execute(query, padded(chunk))
+                    for row in cursor.fetchall():
+                        documentos[row[0]] = self.especie_to_dict(row)
+
+            arvores = [documentos[especie_id] for especie_id in especie_ids if especie_id in documentos]
+            return load_relationships(arvores, self.relationships)
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar árvores completas {especie_ids}: {e}")
+            raise
+
+    def _on_write(self, table, ids):
+        if table not in self.cache_tables: return
+        with self._encoded_lock:
+            # Escritas em Especies identificam os documentos; nas demais tabelas os ids não são EspecieID
+            if table == 'Especies' and ids is not None:
+                for especie_id in ids: self._encoded.pop(especie_id, None)
+            else:
+                self._encoded.clear()
+
+    def get_many_encoded(self, especie_ids, encode):
+        """Como `get_many`, mas retorna {EspecieID: Fragment} com cada documento já codificado
+
+        Os documentos ficam em cache (até MAX_ENCODED, invalidados a cada escrita nas tabelas
+        lidas) e só as espécies ausentes são buscadas no banco; `encode` é o `encode` do
+        provedor JSON da aplicação.
+        """
+        especie_ids = list(dict.fromkeys(especie_ids))
+        with self._encoded_lock:
+            encoded = {especie_id: self._encoded[especie_id] for especie_id in especie_ids if especie_id in self._encoded}
+            for especie_id in encoded: self._encoded.move_to_end(especie_id)
+
+        missing = [especie_id for especie_id in especie_ids if especie_id not in encoded]
+        if missing:
+            versions = table_versions.snapshot(self.cache_tables)
+            fetched = {arvore['EspecieID']: encode(arvore) for arvore in self.get_many(missing)}
+            encoded.update(fetched)
+
+            # Se houver escrita durante a consulta os documentos podem estar desatualizados: não armazena
+            if self.MAX_ENCODED and table_versions.snapshot(self.cache_tables) == versions:
+                with self._encoded_lock:
+                    self._encoded.update(fetched)
+                    while len(self._encoded) > self.MAX_ENCODED: self._encoded.popitem(last=False)
+
+        return {especie_id: encoded[especie_id] for especie_id in especie_ids if especie_id in encoded}
+
+    def encoded_stats(self):
+        with self._encoded_lock:
+            return {
+                'documents': len(self._encoded),
+                'bytes': sum(len(fragment) for fragment in self._encoded.values()),
+                'max_documents': self.MAX_ENCODED
+            }
+
+    def get_by_id(self, especie_id):
+        """Retorna o documento completo de uma espécie ou None"""
+        arvores = self.get_many([especie_id])
+        return arvores[0] if arvores else None
+
+# Instância global do modelo
+arvores_completas_model = ArvoresCompletasModel()
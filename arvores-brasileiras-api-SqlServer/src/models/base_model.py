@@ -1,16 +1,49 @@
 from abc import ABC, abstractmethod
 from src.database.connection import db_connection
+from src.database.versions import table_versions
+from src.models.relationships import chunked, load_relationships
+from src.models.filters import Field, FilterCompiler
+from src.models.statements import StatementCache, in_bucket, padded, placeholders
+from src.models.rows import RowMapper
+from src.models.projection import resolve_projection
+from src.models.pagination import (
+    COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE, InvalidParameter,
+    decode_cursor, encode_cursor, parse_count_mode
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Retornos aceitos nas operações em lote: registros completos, apenas IDs ou só a contagem
+BULK_RETURN_MODES = ('records', 'ids', 'none')
+
 class BaseModel(ABC):
-    """Classe base para todos os modelos de dados usando pyodbc"""
+    """Classe base para todos os modelos de dados (SQL comum; o que muda entre bancos vem do dialeto)"""
+    
+    # Limites do SQL Server por comando: 2100 parâmetros e 1000 linhas em um VALUES (o SQLite aceita mais)
+    MAX_STATEMENT_PARAMS = 2000
+    MAX_VALUES_ROWS = 1000
     
     def __init__(self):
         self.table_name = self.get_table_name()
         self.primary_key = self.get_primary_key()
         self.fields = self.get_fields()
+        self.field_specs = self.get_field_specs()
+        self.filter_compiler = FilterCompiler(self.field_specs)
+        # Lista explícita de colunas (a conversão não depende da ordem física da tabela)
+        self.columns = [self.primary_key] + list(self.fields)
+        self.select_list = ', '.join(self.columns)
+        self.row_mapper = RowMapper(self.field_specs)
+        self.relationships = self.get_relationships()
+        # Tabelas cujas escritas invalidam respostas deste modelo (inclui relacionamentos)
+        self.cache_tables = tuple(dict.fromkeys(
+            [self.table_name] + [table for relationship in self.relationships for table in relationship.tables]
+        ))
+        # Réplica em memória da tabela (TableSnapshot), atribuída quando o modo snapshot está ativo
+        self.snapshot = None
+        # Textos SQL por forma de consulta (mesmo texto => mesmo plano em cache no SQL Server)
+        self.statements = StatementCache(self.table_name)
+        self.dialect = db_connection.dialect
     
     @abstractmethod
     def get_table_name(self): pass
@@ -22,100 +55,285 @@ class BaseModel(ABC):
     def get_fields(self): pass
     """Retorna lista de campos da tabela (exceto chave primária)"""
     @abstractmethod
-    def to_dict(self, row): pass
-    """Converte uma linha do banco para dicionário"""
-    @abstractmethod
     def from_dict(self, data): pass
     """Converte dicionário para formato de inserção no banco"""
     
-    def get_all(self, page=1, per_page=100, filters=None, include_relationships=False):
-        """Retorna todos os registros com paginação e filtros"""
+    def to_dict(self, row, description=None):
+        """Converte uma linha do banco para dicionário (conversor compilado pela descrição do cursor)
+        
+        Sem `description`, usa a da própria linha (Row do pyodbc); linhas do sqlite3 são tuplas.
+        """
+        if not row: return None
+        return self.row_mapper.converter(description or row.cursor_description)(row)
+    
+    def to_dicts(self, cursor, rows):
+        """Converte todas as linhas de um resultado de uma vez"""
+        return self.row_mapper.convert_all(cursor.description, rows)
+    
+    def active_snapshot(self):
+        """Retorna a réplica em memória se estiver carregada; caso contrário as consultas vão ao banco"""
+        snapshot = self.snapshot
+        return snapshot if snapshot is not None and snapshot.ready else None
+    
+    def _sorts_in_memory(self, sort):
+        """A réplica ordena como o banco, exceto texto quando o dialeto não ordena por ponto de código
+        
+        Assim um cursor gerado num caminho continua válido no outro (recarga, réplica indisponível).
+        """
+        return self.dialect.orders_text_by_code_point or self.field_specs[sort].type is not str
+    
+    def get_relationships(self):
+        """Retorna a lista de relacionamentos (Relationship) carregados com include_relationships"""
+        return []
+    
+    def get_field_specs(self):
+        """Retorna os metadados (Field) de cada campo, usados pelos filtros e pela ordenação
+        
+        O padrão trata a chave primária como inteiro indexado e os demais campos como texto
+        sem índice; os modelos sobrescrevem com os tipos reais das colunas.
+        """
+        specs = {self.primary_key: Field(int, indexed=True)}
+        specs.update((field, Field(str)) for field in self.fields)
+        return specs
+    
+    def get_sort_fields(self):
+        """Retorna os campos indexados aceitos em ?sort= (além da chave primária)"""
+        return [name for name, spec in self.field_specs.items() if spec.indexed and name != self.primary_key]
+    
+    def resolve_fields(self, fields=None, relationship_fields=None):
+        """Valida ?fields= e fields[relacionamento]=; retorna a Projection ou None (todos os campos)"""
+        return resolve_projection(self, fields, relationship_fields)
+    
+    def query_columns(self, projection, include_relationships=False, *extra):
+        """Colunas a selecionar para a projeção (None = todas), com as chaves dos relacionamentos carregados"""
+        if projection is None: return None
+        keys = [relationship.local_key for relationship in self._relationships_for(projection)] if include_relationships else []
+        return projection.query_columns(self.columns, *keys, *extra)
+    
+    def project(self, items, projection, include_relationships=False):
+        """Recorta os itens para os campos pedidos (mantendo os relacionamentos carregados)"""
+        if projection is None: return items
+        names = [relationship.name for relationship in self._relationships_for(projection)] if include_relationships else []
+        return projection.apply(items, names)
+    
+    def _select_list(self, columns):
+        return self.select_list if columns is None else ', '.join(columns)
+    
+    def _select(self, name, columns, condition, order_by=None):
+        """SELECT das colunas pedidas com uma condição fixa, em cache por forma"""
+        return self.statements.get(
+            (name, columns),
+            lambda: f"SELECT {self._select_list(columns)} FROM {self.table_name} WHERE {condition}"
+                    + (f" ORDER BY {order_by}" if order_by else "")
+        )
+    
+    def get_all(self, page=1, per_page=100, filters=None, include_relationships=False,
+                after=None, count=None, sort=None, projection=None, condition=None):
+        """Retorna todos os registros com paginação e filtros
+        
+        Com `after` (token opaco, vazio para a primeira página) usa paginação por cursor:
+        a consulta busca a partir da última chave vista, com custo constante por página.
+        `count` controla o total retornado: exact, estimate ou false. `projection`
+        (de `resolve_fields`) limita as colunas lidas do banco e devolvidas. `condition`
+        (`Condition`) é a condição fixa das rotas auxiliares, somada aos filtros.
+        """
+        if page < 1 or per_page < 1: raise InvalidParameter("page e per_page devem ser inteiros positivos")
         try:
-            offset = (page - 1) * per_page
-            
-            # Construir query base
-            query = f"SELECT * FROM {self.table_name}"
-            params = []
-            
-            # Adicionar filtros se fornecidos
-            if filters:
-                where_clauses = []
-                for field, value in filters.items():
-                    if field in self.fields or field == self.primary_key:
-                        where_clauses.append(f"{field} LIKE ?")
-                        params.append(f"%{value}%")
-                
-                if where_clauses:
-                    query += " WHERE " + " AND ".join(where_clauses)
+            cursor_mode = after is not None
+            sort = self._resolve_sort(sort or (condition.sort if condition is not None else None))
+            count = parse_count_mode(count, COUNT_NONE if cursor_mode else COUNT_EXACT)
+            seek = decode_cursor(after, sort) if cursor_mode and after else None
+            offset = 0 if cursor_mode else (page - 1) * per_page
+            # O cursor precisa do campo de ordenação mesmo que ele não tenha sido pedido
+            columns = self.query_columns(projection, include_relationships, *((sort,) if cursor_mode else ()))
             
-            # Adicionar paginação
-            query += f" ORDER BY {self.primary_key} OFFSET ? ROWS FETCH NEXT ? ROWS ONLY"
-            params.extend([offset, per_page])
+            # Buscar um registro a mais para saber se existe próxima página sem contar
+            snapshot = self.active_snapshot() if self._sorts_in_memory(sort) else None
+            if snapshot is not None:
+                items, total = snapshot.select(
+                    self._predicate(filters, condition), sort, seek, offset, per_page + 1, count != COUNT_NONE,
+                    within=condition.lookup if condition is not None else None
+                )
+            else:
+                items, total = self._fetch_page(filters, sort, seek, offset, per_page + 1, count, columns, condition)
             
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-                
-                # Contar total de registros
-                count_query = f"SELECT COUNT(*) FROM {self.table_name}"
-                count_params = []
-                
-                if filters:
-                    where_clauses = []
-                    for field, value in filters.items():
-                        if field in self.fields or field == self.primary_key:
-                            where_clauses.append(f"{field} LIKE ?")
-                            count_params.append(f"%{value}%")
-                    
-                    if where_clauses:
-                        count_query += " WHERE " + " AND ".join(where_clauses)
-                
-                cursor.execute(count_query, count_params)
-                total = cursor.fetchone()[0]
-                
-                # Converter resultados
-                items = [self.to_dict(row) for row in rows]
-                
-                # Adicionar relacionamentos se solicitado
-                if include_relationships:
-                    items = [self.add_relationships(item) for item in items]
-                
-                # Calcular informações de paginação
-                pages = (total + per_page - 1) // per_page
-                has_next = page < pages
-                has_prev = page > 1
-                
+            has_next = len(items) > per_page
+            items = items[:per_page]
+            
+            # Adicionar relacionamentos se solicitado (uma consulta por relacionamento para a página toda)
+            if include_relationships:
+                items = self.load_relationships(items, projection)
+            
+            if cursor_mode:
+                last = items[-1] if items else None
                 return {
-                    'data': items,
+                    'data': self.project(items, projection, include_relationships),
                     'pagination': {
-                        'page': page,
-                        'pages': pages,
                         'per_page': per_page,
-                        'total': total,
+                        'sort': sort,
+                        'next_cursor': encode_cursor(sort, last[sort], last[self.primary_key]) if has_next else None,
                         'has_next': has_next,
-                        'has_prev': has_prev
+                        'total': total
                     }
                 }
+            
+            # Calcular informações de paginação
+            pages = (total + per_page - 1) // per_page if count == COUNT_EXACT else None
+            has_prev = page > 1
+            
+            return {
+                'data': self.project(items, projection, include_relationships),
+                'pagination': {
+                    'page': page,
+                    'pages': pages,
+                    'per_page': per_page,
+                    'total': total,
+                    'has_next': has_next,
+                    'has_prev': has_prev
+                }
+            }
                 
         except Exception as e:
             logger.error(f"Erro ao buscar registros de {self.table_name}: {e}")
             raise
     
-    def get_by_id(self, record_id, include_relationships=False):
+    def _fetch_page(self, filters, sort, seek, offset, limit, count, columns=None, condition=None):
+        """Busca uma página no banco; retorna (registros, total conforme o modo de contagem)"""
+        shape, filter_clauses, filter_params = self._build_filters(filters, condition)
+        seek_kind, seek_params = self._build_seek(sort, *seek) if seek is not None else (None, [])
+        
+        query = self.statements.get(
+            ('page', shape, sort, seek_kind, columns), lambda: self._page_statement(filter_clauses, sort, seek_kind, columns)
+        )
+        params = filter_params + seek_params + self.dialect.page_params(offset, limit)
+        
+        with db_connection.get_cursor() as (cursor, connection):
+            cursor.execute(query, params)
+            # Converter antes da contagem, que reutiliza o cursor (e troca a sua descrição)
+            items = self.to_dicts(cursor, cursor.fetchall())
+            
+            total = self._count_rows(cursor, count, shape, filter_clauses, filter_params)
+        
+        return items, total
+    
+    def _resolve_sort(self, sort):
+        """Valida o campo de ordenação; apenas campos indexados são aceitos"""
+        if not sort: return self.primary_key
+        if sort != self.primary_key and sort not in self.get_sort_fields():
+            allowed = ', '.join([self.primary_key] + self.get_sort_fields())
+            raise InvalidParameter(f"Ordenação por '{sort}' não suportada (use {allowed})")
+        return sort
+    
+    def _page_statement(self, filter_clauses, sort, seek_kind, columns=None):
+        """SELECT de uma página: filtros, posição do cursor e ordenação estável (campo + chave primária)"""
+        where_clauses = list(filter_clauses)
+        if seek_kind is not None: where_clauses.append(self._seek_clause(sort, seek_kind))
+        
+        query = f"SELECT {self._select_list(columns)} FROM {self.table_name}"
+        if where_clauses:
+            query += " WHERE " + " AND ".join(where_clauses)
+        
+        order_by = self.primary_key if sort == self.primary_key else f"{sort}, {self.primary_key}"
+        return query + f" ORDER BY {order_by} {self.dialect.page_clause}"
+    
+    def _build_seek(self, sort, sort_value, pk_value):
+        """Forma e parâmetros da condição que posiciona a consulta logo após o último registro visto"""
+        if sort == self.primary_key: return 'pk', [pk_value]
+        if sort_value is None: return 'null', [pk_value]
+        return 'value', [sort_value, sort_value, pk_value]
+    
+    def _seek_clause(self, sort, seek_kind):
+        if seek_kind == 'pk':
+            return f"{self.primary_key} > ?"
+        
+        # NULLs vêm primeiro na ordenação ascendente (SQL Server e SQLite)
+        if seek_kind == 'null':
+            return f"({sort} IS NOT NULL OR ({sort} IS NULL AND {self.primary_key} > ?))"
+        return f"({sort} > ? OR ({sort} = ? AND {self.primary_key} > ?))"
+    
+    def _build_filters(self, filters, condition=None):
+        """Converte os filtros da query string (e a condição fixa) em (forma, cláusulas WHERE, parâmetros)"""
+        shape, clauses, params = self.filter_compiler.compile_shaped(filters)
+        if condition is None: return shape, clauses, params
+        return shape + (condition.shape,), clauses + condition.clauses, params + condition.params
+    
+    def _predicate(self, filters, condition=None):
+        """Filtros e condição fixa avaliados em memória (None = todos os registros)"""
+        predicate = self.filter_compiler.predicate(filters)
+        if condition is None or condition.predicate is None: return predicate
+        if predicate is None: return condition.predicate
+        return lambda record: condition.predicate(record) and predicate(record)
+    
+    def _where(self, query, where_clauses):
+        return query + " WHERE " + " AND ".join(where_clauses) if where_clauses else query
+    
+    def _count_rows(self, cursor, mode, shape, where_clauses, params):
+        """Conta os registros de acordo com o modo solicitado"""
+        if mode == COUNT_NONE: return None
+        
+        if mode == COUNT_ESTIMATE:
+            # A estimativa vem dos metadados da tabela e ignora filtros
+            if where_clauses: return None
+            cursor.execute(*self.dialect.estimate_count(self.table_name))
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] is not None else None
+        
+        query = self.statements.get(
+            ('count', shape), lambda: self._where(f"SELECT COUNT(*) FROM {self.table_name}", where_clauses)
+        )
+        cursor.execute(query, params)
+        return cursor.fetchone()[0]
+    
+    def iter_rows(self, filters=None, chunk_size=1000, columns=None, condition=None):
+        """Percorre a tabela inteira (com filtros e condição opcionais) em blocos de `chunk_size` registros
+
+        Os filtros são validados na chamada; a consulta só é executada ao consumir o
+        gerador, que lê o resultado com fetchmany e mantém uma conexão do pool até o fim.
+        Com `condition`, os registros saem na ordenação padrão da condição.
+        """
+        shape, where_clauses, params = self._build_filters(filters, condition)
+        sort = self._resolve_sort(condition.sort if condition is not None else None)
+        order_by = self.primary_key if sort == self.primary_key else f"{sort}, {self.primary_key}"
+        query = self.statements.get(
+            ('scan', shape, sort, columns),
+            lambda: self._where(f"SELECT {self._select_list(columns)} FROM {self.table_name}", where_clauses)
+                    + f" ORDER BY {order_by}"
+        )
+
+        def chunks():
+            try:
+                with db_connection.get_cursor() as (cursor, connection):
+                    cursor.execute(query, params)
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows: break
+                        yield self.to_dicts(cursor, rows)
+            except Exception as e:
+                logger.error(f"Erro ao exportar registros de {self.table_name}: {e}")
+                raise
+
+        return chunks()
+
+    def get_by_id(self, record_id, include_relationships=False, projection=None):
         """Retorna um registro específico por ID"""
         try:
-            query = f"SELECT * FROM {self.table_name} WHERE {self.primary_key} = ?"
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [record_id])
-                row = cursor.fetchone()
+            snapshot = self.active_snapshot()
+            if snapshot is not None:
+                result = snapshot.get(record_id)
+            else:
+                columns = self.query_columns(projection, include_relationships)
+                query = self._select('get', columns, f"{self.primary_key} = ?")
                 
-                if row:
-                    result = self.to_dict(row)
-                    if include_relationships:
-                        result = self.add_relationships(result)
-                    return result
-                return None
+                with db_connection.get_cursor() as (cursor, connection):
+                    cursor.execute(query, [record_id])
+                    row = cursor.fetchone()
+                    result = self.to_dict(row, cursor.description) if row else None
+            
+            if result:
+                if include_relationships:
+                    result = self.add_relationships(result, projection)
+                return self.project([result], projection, include_relationships)[0]
+            return None
                 
         except Exception as e:
             logger.error(f"Erro ao buscar registro {record_id} de {self.table_name}: {e}")
@@ -127,23 +345,16 @@ class BaseModel(ABC):
             # Preparar dados para inserção
             insert_data = self.from_dict(data)
             
-            # Construir query de inserção
-            fields = list(insert_data.keys())
-            placeholders = ', '.join(['?' for _ in fields])
-            field_names = ', '.join(fields)
-            
-            query = f"INSERT INTO {self.table_name} ({field_names}) VALUES ({placeholders})"
+            # Query de inserção por conjunto de colunas (OUTPUT/RETURNING devolve o registro criado na mesma ida ao banco)
+            query = self._insert_statement(tuple(insert_data.keys()), self._bulk_output('records'))
             values = list(insert_data.values())
             
             with db_connection.get_transaction() as cursor:
                 cursor.execute(query, values)
-                
-                # Obter ID do registro inserido
-                cursor.execute("SELECT @@IDENTITY")
-                new_id = cursor.fetchone()[0]
-                
-                # Retornar o registro criado
-                return self.get_by_id(new_id)
+                record = self.to_dict(cursor.fetchone(), cursor.description)
+            
+            self.notify_write([record[self.primary_key]])
+            return record
                 
         except Exception as e:
             logger.error(f"Erro ao criar registro em {self.table_name}: {e}")
@@ -155,9 +366,8 @@ class BaseModel(ABC):
             # Preparar dados para atualização
             update_data = self.from_dict(data)
             
-            # Construir query de atualização
-            set_clauses = [f"{field} = ?" for field in update_data.keys()]
-            query = f"UPDATE {self.table_name} SET {', '.join(set_clauses)} WHERE {self.primary_key} = ?"
+            # Query de atualização por conjunto de colunas
+            query = self._update_statement(tuple(update_data.keys()))
             
             values = list(update_data.values()) + [record_id]
             
@@ -165,9 +375,11 @@ class BaseModel(ABC):
                 cursor.execute(query, values)
                 
                 if cursor.rowcount == 0: return None # Se nenhum registro foi afetado, retornar None
-                
-                # Retornar o registro atualizado
-                return self.get_by_id(record_id)
+            
+            self.notify_write([record_id])
+            
+            # Retornar o registro atualizado
+            return self.get_by_id(record_id)
                 
         except Exception as e:
             logger.error(f"Erro ao atualizar registro {record_id} em {self.table_name}: {e}")
@@ -176,20 +388,269 @@ class BaseModel(ABC):
     def delete(self, record_id):
         """Remove um registro"""
         try:
-            query = f"DELETE FROM {self.table_name} WHERE {self.primary_key} = ?"
+            query = self.statements.get(
+                ('delete',), lambda: f"DELETE FROM {self.table_name} WHERE {self.primary_key} = ?"
+            )
             
             with db_connection.get_transaction() as cursor:
                 cursor.execute(query, [record_id])
-                return cursor.rowcount > 0
+                deleted = cursor.rowcount > 0
+            
+            if deleted: self.notify_write([record_id])
+            return deleted
                 
         except Exception as e:
             logger.error(f"Erro ao deletar registro {record_id} de {self.table_name}: {e}")
             raise
     
+    def get_many(self, record_ids):
+        """Retorna os registros dos IDs informados, em blocos de IN (ordem da chave primária)"""
+        try:
+            records = []
+            with db_connection.get_cursor() as (cursor, connection):
+                for chunk in chunked(list(dict.fromkeys(record_ids))):
+                    cursor.execute(self._in_statement('get_many', f"SELECT {self.select_list} FROM {self.table_name}", len(chunk)), padded(chunk))
+                    records.extend(self.to_dicts(cursor, cursor.fetchall()))
+            return sorted(records, key=lambda record: record[self.primary_key])
+                
+        except Exception as e:
+            logger.error(f"Erro ao buscar registros de {self.table_name}: {e}")
+            raise
+    
+    def create_many(self, records, batch_size=500, returning='records'):
+        """Insere vários registros em uma única transação
+        
+        `records` pode ser qualquer iterável (ex.: linhas NDJSON lidas sob demanda); ele é
+        consumido em lotes de `batch_size`, agrupados pelo conjunto de colunas. Com
+        `returning` igual a 'records' ou 'ids' cada lote vira INSERTs de várias linhas com
+        OUTPUT INSERTED (RETURNING no SQLite); com 'none' usa executemany (com fast_executemany
+        no SQL Server) e só conta as linhas.
+        """
+        try:
+            output = self._bulk_output(returning)
+            created, total = [], 0
+            
+            with db_connection.get_transaction() as cursor:
+                for offset, batch in self._batches(records, batch_size):
+                    for columns, entries in self._group_by_columns(batch, offset, self.from_dict):
+                        rows = [values for record, values in entries]
+                        
+                        if output is None:
+                            self.dialect.prepare_executemany(cursor)
+                            cursor.executemany(self._insert_statement(columns), rows)
+                        else:
+                            rows_per_statement = max(1, min(self.MAX_VALUES_ROWS, self.MAX_STATEMENT_PARAMS // len(columns)))
+                            for chunk in chunked(rows, rows_per_statement):
+                                # Blocos incompletos viram comandos de 2^n linhas: poucas formas de comando
+                                for part in self._row_buckets(chunk, rows_per_statement):
+                                    cursor.execute(
+                                        self._insert_statement(columns, output, len(part)),
+                                        [value for row in part for value in row]
+                                    )
+                                    rows_created = cursor.fetchall()
+                                    created.extend(self.to_dicts(cursor, rows_created) if returning == 'records' else rows_created)
+                        total += len(rows)
+            
+            result = self._bulk_result(created, returning)
+            self.notify_write(result.get('ids') if output is not None else None)
+            return dict(result, created=total)
+                
+        except Exception as e:
+            logger.error(f"Erro ao inserir registros em lote em {self.table_name}: {e}")
+            raise
+    
+    def update_many(self, records, batch_size=500, returning='records'):
+        """Atualiza parcialmente vários registros em uma única transação
+        
+        Cada registro traz a chave primária e apenas os campos a alterar (campos ausentes
+        não são tocados). IDs inexistentes são ignorados e devolvidos em `not_found`.
+        """
+        try:
+            self._bulk_output(returning)   # valida o modo de retorno
+            updated, not_found = [], []
+            
+            with db_connection.get_transaction() as cursor:
+                for offset, batch in self._batches(records, batch_size):
+                    for index, record in enumerate(batch, offset):
+                        if not isinstance(record, dict) or not isinstance(record.get(self.primary_key), int):
+                            raise InvalidParameter(f"Registro {index} deve ser um objeto com {self.primary_key} inteiro")
+                    groups = self._group_by_columns(batch, offset, self._update_values)
+                    
+                    existing = self._existing_ids(cursor, [record[self.primary_key] for record in batch])
+                    not_found.extend(record[self.primary_key] for record in batch if record[self.primary_key] not in existing)
+                    
+                    for columns, entries in groups:
+                        entries = [(record, values) for record, values in entries if record[self.primary_key] in existing]
+                        if not entries: continue
+                        self.dialect.prepare_executemany(cursor)
+                        cursor.executemany(
+                            self._update_statement(columns),
+                            [values + (record[self.primary_key],) for record, values in entries]
+                        )
+                    updated.extend(record[self.primary_key] for record in batch if record[self.primary_key] in existing)
+            
+            updated = list(dict.fromkeys(updated))
+            if updated: self.notify_write(updated)
+            
+            result = {'updated': len(updated), 'not_found': list(dict.fromkeys(not_found))}
+            if returning == 'records': result['data'] = self.get_many(updated)
+            elif returning == 'ids': result['ids'] = updated
+            return result
+                
+        except Exception as e:
+            logger.error(f"Erro ao atualizar registros em lote em {self.table_name}: {e}")
+            raise
+    
+    def delete_many(self, record_ids):
+        """Remove vários registros por ID em uma única transação (DELETE ... IN em blocos)"""
+        try:
+            record_ids = list(dict.fromkeys(record_ids))
+            deleted = []
+            
+            with db_connection.get_transaction() as cursor:
+                for chunk in chunked(record_ids):
+                    cursor.execute(
+                        self._delete_in_statement(len(chunk)),
+                        padded(chunk)
+                    )
+                    deleted.extend(row[0] for row in cursor.fetchall())
+            
+            if deleted: self.notify_write(deleted)
+            
+            removed = set(deleted)
+            return {
+                'deleted': len(deleted),
+                'ids': sorted(deleted),
+                'not_found': [record_id for record_id in record_ids if record_id not in removed]
+            }
+                
+        except Exception as e:
+            logger.error(f"Erro ao remover registros em lote de {self.table_name}: {e}")
+            raise
+    
+    def _bulk_output(self, returning):
+        """Colunas devolvidas (OUTPUT/RETURNING) de acordo com o modo de retorno da operação em lote"""
+        if returning not in BULK_RETURN_MODES:
+            raise InvalidParameter(f"Retorno '{returning}' não suportado (use {', '.join(BULK_RETURN_MODES)})")
+        if returning == 'records': return tuple(self.columns)
+        if returning == 'ids': return (self.primary_key,)
+        return None
+    
+    def _bulk_result(self, rows, returning):
+        if returning == 'records':
+            data = sorted(rows, key=lambda record: record[self.primary_key])
+            return {'data': data, 'ids': [record[self.primary_key] for record in data]}
+        if returning == 'ids':
+            return {'ids': sorted(row[0] for row in rows)}
+        return {}
+    
+    @staticmethod
+    def _batches(records, batch_size):
+        """Divide os registros em lotes, informando a posição do primeiro registro de cada lote"""
+        offset = 0
+        for batch in chunked(records, batch_size):
+            yield offset, batch
+            offset += len(batch)
+    
+    @staticmethod
+    def _group_by_columns(batch, offset, convert):
+        """Agrupa (registro, valores convertidos) pelo conjunto de colunas preenchidas"""
+        groups = {}
+        for index, record in enumerate(batch, offset):
+            if not isinstance(record, dict):
+                raise InvalidParameter(f"Registro {index} deve ser um objeto JSON")
+            values = convert(record)
+            if not values:
+                raise InvalidParameter(f"Registro {index} não possui campos válidos")
+            groups.setdefault(tuple(values.keys()), []).append((record, tuple(values.values())))
+        return groups.items()
+    
+    def _insert_statement(self, columns, output=None, rows=1):
+        """INSERT para um conjunto de colunas, com `rows` linhas no VALUES e as colunas `output` devolvidas"""
+        def build():
+            row_placeholders = f"({placeholders(len(columns))})"
+            head = f"INSERT INTO {self.table_name} ({', '.join(columns)})"
+            values = "VALUES " + ', '.join(row_placeholders for _ in range(rows))
+            return self.dialect.returning(head, values, output, 'INSERTED') if output else f"{head} {values}"
+        return self.statements.get(('insert', columns, output, rows), build)
+    
+    def _update_statement(self, columns):
+        """UPDATE por chave primária para um conjunto de colunas"""
+        return self.statements.get(
+            ('update', columns),
+            lambda: f"UPDATE {self.table_name} SET {', '.join(f'{field} = ?' for field in columns)} WHERE {self.primary_key} = ?"
+        )
+    
+    def _in_statement(self, operation, head, count):
+        """`<head> WHERE pk IN (...)` com a lista completada até o bucket de `count`"""
+        size = in_bucket(count)
+        return self.statements.get(
+            (operation, size), lambda: f"{head} WHERE {self.primary_key} IN ({placeholders(size)})"
+        )
+    
+    def _delete_in_statement(self, count):
+        """DELETE ... WHERE pk IN (...) que devolve as chaves removidas"""
+        size = in_bucket(count)
+        return self.statements.get(
+            ('delete_many', size),
+            lambda: self.dialect.returning(
+                f"DELETE FROM {self.table_name}", f"WHERE {self.primary_key} IN ({placeholders(size)})",
+                (self.primary_key,), 'DELETED'
+            )
+        )
+    
+    @staticmethod
+    def _row_buckets(rows, full_size):
+        """Divide um bloco de linhas em partes de 2^n linhas (blocos completos ficam inteiros)"""
+        if len(rows) == full_size:
+            yield rows
+            return
+        start = 0
+        while start < len(rows):
+            size = 1 << ((len(rows) - start).bit_length() - 1)
+            yield rows[start:start + size]
+            start += size
+    
+    def warm_statements(self):
+        """Compila de antemão as formas de comando mais comuns (não vai ao banco)"""
+        for sort in [self.primary_key] + self.get_sort_fields():
+            for seek_kind in ((None, 'pk') if sort == self.primary_key else (None, 'null', 'value')):
+                self.statements.get(('page', (), sort, seek_kind, None), lambda: self._page_statement([], sort, seek_kind))
+        self.statements.get(('count', ()), lambda: f"SELECT COUNT(*) FROM {self.table_name}")
+        self.statements.get(('scan', (), self.primary_key, None), lambda: f"SELECT {self.select_list} FROM {self.table_name} ORDER BY {self.primary_key}")
+        self._select('get', None, f"{self.primary_key} = ?")
+        self.statements.get(('exists',), lambda: f"SELECT 1 FROM {self.table_name} WHERE {self.primary_key} = ?")
+        self.statements.get(('delete',), lambda: f"DELETE FROM {self.table_name} WHERE {self.primary_key} = ?")
+        
+        # INSERT/UPDATE com todas as colunas, na ordem produzida por from_dict
+        try:
+            columns = tuple(self.from_dict({field: None for field in self.fields}).keys())
+        except Exception as e:
+            logger.warning(f"Formas de escrita de {self.table_name} não pré-compiladas: {e}")
+            return
+        self._insert_statement(columns, self._bulk_output('records'))
+        self._update_statement(columns)
+    
+    def _update_values(self, record):
+        """Campos a atualizar: apenas os presentes no registro (sem valores padrão de from_dict)"""
+        return {field: value for field, value in self.from_dict(record).items() if field in record}
+    
+    def _existing_ids(self, cursor, record_ids):
+        existing = set()
+        for chunk in chunked(list(dict.fromkeys(record_ids))):
+            cursor.execute(self._in_statement('existing', f"SELECT {self.primary_key} FROM {self.table_name}", len(chunk)), padded(chunk))
+            existing.update(row[0] for row in cursor.fetchall())
+        return existing
+    
     def exists(self, record_id):
         """Verifica se um registro existe"""
         try:
-            query = f"SELECT 1 FROM {self.table_name} WHERE {self.primary_key} = ?"
+            snapshot = self.active_snapshot()
+            if snapshot is not None: return snapshot.get(record_id) is not None
+            
+            query = self.statements.get(
+                ('exists',), lambda: f"SELECT 1 FROM {self.table_name} WHERE {self.primary_key} = ?"
+            )
             
             with db_connection.get_cursor() as (cursor, connection):
                 cursor.execute(query, [record_id])
@@ -202,27 +663,42 @@ class BaseModel(ABC):
     def count(self, filters=None):
         """Conta o total de registros"""
         try:
-            query = f"SELECT COUNT(*) FROM {self.table_name}"
-            params = []
-            
-            if filters:
-                where_clauses = []
-                for field, value in filters.items():
-                    if field in self.fields or field == self.primary_key:
-                        where_clauses.append(f"{field} LIKE ?")
-                        params.append(f"%{value}%")
-                
-                if where_clauses:
-                    query += " WHERE " + " AND ".join(where_clauses)
+            snapshot = self.active_snapshot()
+            if snapshot is not None:
+                return snapshot.select(self.filter_compiler.predicate(filters), limit=0, count=True)[1]
+            
+            shape, where_clauses, params = self._build_filters(filters)
             
             with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, params)
-                return cursor.fetchone()[0]
+                return self._count_rows(cursor, COUNT_EXACT, shape, where_clauses, params)
                 
         except Exception as e:
             logger.error(f"Erro ao contar registros de {self.table_name}: {e}")
             raise
     
-    def add_relationships(self, item):
-        """Adiciona relacionamentos ao item (implementar nas classes filhas se necessário)"""
-        return item
\ No newline at end of file
+    def notify_write(self, ids=None):
+        """Avisa caches e índices em memória de uma escrita já confirmada na tabela"""
+        # O snapshot é atualizado antes do cache ser invalidado, para que nenhuma
+        # resposta nova seja montada (e guardada) a partir da cópia antiga
+        if self.snapshot is not None: self.snapshot.apply(ids)
+        table_versions.bump(self.table_name, ids)
+    
+    def add_relationships(self, item, projection=None):
+        """Adiciona relacionamentos a um único item"""
+        return self.load_relationships([item], projection)[0]
+    
+    def _relationships_for(self, projection):
+        if projection is None: return self.relationships
+        return [relationship for relationship in self.relationships if projection.includes(relationship.name)]
+    
+    def load_relationships(self, items, projection=None):
+        """Adiciona relacionamentos a uma lista de itens, buscando os filhos de todos de uma vez
+        
+        Com `projection`, só os relacionamentos pedidos são buscados, e cada um só com os campos pedidos.
+        """
+        try:
+            fields = projection.relationship_fields if projection is not None else None
+            return load_relationships(items, self._relationships_for(projection), fields)
+        except Exception as e:
+            logger.error(f"Erro ao buscar relacionamentos de {self.table_name}: {e}")
+            return items
\ No newline at end of file
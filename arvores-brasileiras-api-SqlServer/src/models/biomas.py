@@ -1,5 +1,6 @@
 from src.models.base_model import BaseModel
-from src.database.connection import db_connection
+from src.models.filters import Condition, Field
+from src.models.relationships import Relationship
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,15 +14,12 @@ class BiomasModel(BaseModel):
     
     def get_fields(self): return ["Nome", "Descricao", "Regiao"]
     
-    def to_dict(self, row):
-        """Converte linha do banco para dicionário"""
-        if not row: return None
-        
+    def get_field_specs(self):
         return {
-            'BiomaID': row[0],
-            'Nome': row[1],
-            'Descricao': row[2],
-            'Regiao': row[3]
+            'BiomaID': Field(int, indexed=True),
+            'Nome': Field(str, indexed=True, searchable=True),
+            'Descricao': Field(str, searchable=True),
+            'Regiao': Field(str, indexed=True)
         }
     
     def from_dict(self, data):
@@ -37,69 +35,42 @@ class BiomasModel(BaseModel):
         
         return result
     
-    def add_relationships(self, item):
-        """Adiciona relacionamentos do bioma"""
-        try:
-            bioma_id = item['BiomaID']
-            
-            # Buscar ocorrências
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute("""
+    def get_relationships(self):
+        """Relacionamentos do bioma, carregados em lote para todos os itens da página"""
+        return [
+            Relationship(
+                'ocorrencias',
+                """
                     SELECT o.OcorrenciaID, o.EspecieID, o.BiomaID, o.Frequencia,
                            e.NomeCientifico, e.NomePopular, e.Familia
                     FROM Ocorrencias o
                     LEFT JOIN Especies e ON o.EspecieID = e.EspecieID
-                    WHERE o.BiomaID = ?
-                """, [bioma_id])
-                
-                ocorrencias = []
-                for row in cursor.fetchall():
-                    ocorrencias.append({
-                        'OcorrenciaID': row[0],
-                        'EspecieID': row[1],
-                        'BiomaID': row[2],
-                        'Frequencia': row[3],
-                        'Especie': {
-                            'NomeCientifico': row[4],
-                            'NomePopular': row[5],
-                            'Familia': row[6]
-                        } if row[4] else None
-                    })
-                
-                item['ocorrencias'] = ocorrencias
-                return item
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar relacionamentos do bioma {item['BiomaID']}: {e}")
-            return item
+                """,
+                foreign_key='o.BiomaID', local_key='BiomaID',
+                fields=('OcorrenciaID', 'EspecieID', 'BiomaID', 'Frequencia', 'Especie'),
+                to_dict=lambda row: {
+                    'OcorrenciaID': row[0],
+                    'EspecieID': row[1],
+                    'BiomaID': row[2],
+                    'Frequencia': row[3],
+                    'Especie': {
+                        'NomeCientifico': row[4],
+                        'NomePopular': row[5],
+                        'Familia': row[6]
+                    } if row[4] else None
+                }
+            )
+        ]
+    
+    # Condições das rotas auxiliares, paginadas por get_all(condition=...)
     
-    def search_by_name(self, nome):
-        """Busca biomas por nome"""
-        try:
-            query = "SELECT * FROM Biomas WHERE Nome LIKE ? ORDER BY Nome"
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [f"%{nome}%"])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar biomas por nome '{nome}': {e}")
-            raise
+    def by_name(self, nome):
+        """Biomas com o trecho no nome, por nome"""
+        return Condition.contains(('Nome',), nome, sort='Nome')
     
-    def get_by_regiao(self, regiao):
-        """Busca biomas por região"""
-        try:
-            query = "SELECT * FROM Biomas WHERE Regiao LIKE ? ORDER BY Nome"
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [f"%{regiao}%"])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar biomas por região '{regiao}': {e}")
-            raise
+    def by_regiao(self, regiao):
+        """Biomas da região (trecho do nome), por nome"""
+        return Condition.contains(('Regiao',), regiao, sort='Nome')
 
 # Instância global do modelo
 biomas_model = BiomasModel()
@@ -1,5 +1,7 @@
 from src.models.base_model import BaseModel
-from src.database.connection import db_connection
+from src.models.filters import Condition, Field
+from src.models.especies import especie_resumo
+from decimal import Decimal
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,18 +18,14 @@ class CaracteristicasModel(BaseModel):
     def get_fields(self):
         return ["EspecieID", "AlturaMedia", "DiametroMedio", "TipoFolha", "Floracao"]
     
-    def to_dict(self, row):
-        """Converte linha do banco para dicionário"""
-        if not row:
-            return None
-        
+    def get_field_specs(self):
         return {
-            'CaracteristicaID': row[0],
-            'EspecieID': row[1],
-            'AlturaMedia': float(row[2]) if row[2] else None,
-            'DiametroMedio': float(row[3]) if row[3] else None,
-            'TipoFolha': row[4],
-            'Floracao': row[5]
+            'CaracteristicaID': Field(int, indexed=True),
+            'EspecieID': Field(int, indexed=True),
+            'AlturaMedia': Field(Decimal),
+            'DiametroMedio': Field(Decimal),
+            'TipoFolha': Field(str),
+            'Floracao': Field(str)
         }
     
     def from_dict(self, data):
@@ -47,80 +45,23 @@ class CaracteristicasModel(BaseModel):
         
         return result
     
-    def add_relationships(self, item):
-        """Adiciona relacionamentos da característica"""
-        try:
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute("""
-                    SELECT EspecieID, NomeCientifico, NomePopular, Familia
-                    FROM Especies WHERE EspecieID = ?
-                """, [item['EspecieID']])
-                
-                especie_row = cursor.fetchone()
-                if especie_row:
-                    item['especie'] = {
-                        'EspecieID': especie_row[0],
-                        'NomeCientifico': especie_row[1],
-                        'NomePopular': especie_row[2],
-                        'Familia': especie_row[3]
-                    }
-                
-                return item
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar relacionamentos da característica {item['CaracteristicaID']}: {e}")
-            return item
+    def get_relationships(self):
+        """Relacionamentos da característica, carregados em lote para todos os itens da página"""
+        return [especie_resumo()]
+    
+    # Condições das rotas auxiliares, paginadas por get_all(condition=...)
     
-    def get_by_especie(self, especie_id):
-        """Busca características por espécie"""
-        try:
-            query = "SELECT * FROM Caracteristicas WHERE EspecieID = ?"
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [especie_id])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar características por espécie {especie_id}: {e}")
-            raise
+    def by_especie(self, especie_id):
+        """Características da espécie"""
+        return Condition.equals('EspecieID', especie_id)
     
-    def get_by_tipo_folha(self, tipo_folha):
-        """Busca características por tipo de folha"""
-        try:
-            query = "SELECT * FROM Caracteristicas WHERE TipoFolha LIKE ?"
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [f"%{tipo_folha}%"])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar características por tipo de folha '{tipo_folha}': {e}")
-            raise
+    def by_tipo_folha(self, tipo_folha):
+        """Características com o tipo de folha (trecho do texto)"""
+        return Condition.contains(('TipoFolha',), tipo_folha)
     
-    def get_by_altura_range(self, altura_min=None, altura_max=None):
-        """Busca características por faixa de altura"""
-        try:
-            query = "SELECT * FROM Caracteristicas WHERE 1=1"
-            params = []
-            
-            if altura_min is not None:
-                query += " AND AlturaMedia >= ?"
-                params.append(altura_min)
-            
-            if altura_max is not None:
-                query += " AND AlturaMedia <= ?"
-                params.append(altura_max)
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar características por faixa de altura: {e}")
-            raise
+    def by_altura_range(self, altura_min=None, altura_max=None):
+        """Características na faixa de altura média"""
+        return Condition.between('AlturaMedia', altura_min, altura_max)
 
 # Instância global do modelo
 caracteristicas_model = CaracteristicasModel()
@@ -1,5 +1,6 @@
 from src.models.base_model import BaseModel
-from src.database.connection import db_connection
+from src.models.filters import Condition, Field
+from src.models.especies import especie_resumo
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,16 +17,12 @@ class CuriosidadesModel(BaseModel):
     def get_fields(self):
         return ["EspecieID", "Texto", "Fonte"]
     
-    def to_dict(self, row):
-        """Converte linha do banco para dicionário"""
-        if not row:
-            return None
-        
+    def get_field_specs(self):
         return {
-            'CuriosidadeID': row[0],
-            'EspecieID': row[1],
-            'Texto': row[2],
-            'Fonte': row[3]
+            'CuriosidadeID': Field(int, indexed=True),
+            'EspecieID': Field(int, indexed=True),
+            'Texto': Field(str, searchable=True),
+            'Fonte': Field(str)
         }
     
     def from_dict(self, data):
@@ -41,71 +38,23 @@ class CuriosidadesModel(BaseModel):
         
         return result
     
-    def add_relationships(self, item):
-        """Adiciona relacionamentos da curiosidade"""
-        try:
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute("""
-                    SELECT EspecieID, NomeCientifico, NomePopular, Familia
-                    FROM Especies WHERE EspecieID = ?
-                """, [item['EspecieID']])
-                
-                especie_row = cursor.fetchone()
-                if especie_row:
-                    item['especie'] = {
-                        'EspecieID': especie_row[0],
-                        'NomeCientifico': especie_row[1],
-                        'NomePopular': especie_row[2],
-                        'Familia': especie_row[3]
-                    }
-                
-                return item
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar relacionamentos da curiosidade {item['CuriosidadeID']}: {e}")
-            return item
+    def get_relationships(self):
+        """Relacionamentos da curiosidade, carregados em lote para todos os itens da página"""
+        return [especie_resumo()]
+    
+    # Condições das rotas auxiliares, paginadas por get_all(condition=...)
     
-    def get_by_especie(self, especie_id):
-        """Busca curiosidades por espécie"""
-        try:
-            query = "SELECT * FROM Curiosidades WHERE EspecieID = ?"
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [especie_id])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar curiosidades por espécie {especie_id}: {e}")
-            raise
+    def by_especie(self, especie_id):
+        """Curiosidades da espécie"""
+        return Condition.equals('EspecieID', especie_id)
     
-    def search_by_text(self, texto):
-        """Busca curiosidades por texto"""
-        try:
-            query = "SELECT * FROM Curiosidades WHERE Texto LIKE ?"
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [f"%{texto}%"])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar curiosidades por texto '{texto}': {e}")
-            raise
+    def by_text(self, texto):
+        """Curiosidades com o trecho no texto"""
+        return Condition.contains(('Texto',), texto)
     
-    def get_by_fonte(self, fonte):
-        """Busca curiosidades por fonte"""
-        try:
-            query = "SELECT * FROM Curiosidades WHERE Fonte LIKE ?"
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [f"%{fonte}%"])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar curiosidades por fonte '{fonte}': {e}")
-            raise
+    def by_fonte(self, fonte):
+        """Curiosidades da fonte (trecho do nome)"""
+        return Condition.contains(('Fonte',), fonte)
 
 # Instância global do modelo
 curiosidades_model = CuriosidadesModel()
@@ -1,5 +1,7 @@
 from src.models.base_model import BaseModel
-from src.database.connection import db_connection
+from src.models.filters import Condition, Field
+from src.models.especies import especie_resumo
+from decimal import Decimal
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,18 +18,14 @@ class DadosArvoreModel(BaseModel):
     def get_fields(self):
         return ["EspecieID", "TempoDeVidaEstimado", "CrescimentoAnual", "RaizProfundidadeMedia", "DensidadeMadeira"]
     
-    def to_dict(self, row):
-        """Converte linha do banco para dicionário"""
-        if not row:
-            return None
-        
+    def get_field_specs(self):
         return {
-            'DadosID': row[0],
-            'EspecieID': row[1],
-            'TempoDeVidaEstimado': row[2],
-            'CrescimentoAnual': float(row[3]) if row[3] else None,
-            'RaizProfundidadeMedia': float(row[4]) if row[4] else None,
-            'DensidadeMadeira': float(row[5]) if row[5] else None
+            'DadosID': Field(int, indexed=True),
+            'EspecieID': Field(int, indexed=True),
+            'TempoDeVidaEstimado': Field(int),
+            'CrescimentoAnual': Field(Decimal),
+            'RaizProfundidadeMedia': Field(Decimal),
+            'DensidadeMadeira': Field(Decimal)
         }
     
     def from_dict(self, data):
@@ -47,112 +45,27 @@ class DadosArvoreModel(BaseModel):
         
         return result
     
-    def add_relationships(self, item):
-        """Adiciona relacionamentos dos dados da árvore"""
-        try:
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute("""
-                    SELECT EspecieID, NomeCientifico, NomePopular, Familia
-                    FROM Especies WHERE EspecieID = ?
-                """, [item['EspecieID']])
-                
-                especie_row = cursor.fetchone()
-                if especie_row:
-                    item['especie'] = {
-                        'EspecieID': especie_row[0],
-                        'NomeCientifico': especie_row[1],
-                        'NomePopular': especie_row[2],
-                        'Familia': especie_row[3]
-                    }
-                
-                return item
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar relacionamentos dos dados da árvore {item['DadosID']}: {e}")
-            return item
+    def get_relationships(self):
+        """Relacionamentos dos dados da árvore, carregados em lote para todos os itens da página"""
+        return [especie_resumo()]
+    
+    # Condições das rotas auxiliares, paginadas por get_all(condition=...)
     
-    def get_by_especie(self, especie_id):
-        """Busca dados da árvore por espécie"""
-        try:
-            query = "SELECT * FROM DadosArvore WHERE EspecieID = ?"
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [especie_id])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar dados da árvore por espécie {especie_id}: {e}")
-            raise
+    def by_especie(self, especie_id):
+        """Dados da árvore da espécie"""
+        return Condition.equals('EspecieID', especie_id)
     
-    def get_by_tempo_vida_range(self, tempo_min=None, tempo_max=None):
-        """Busca dados por faixa de tempo de vida"""
-        try:
-            query = "SELECT * FROM DadosArvore WHERE 1=1"
-            params = []
-            
-            if tempo_min is not None:
-                query += " AND TempoDeVidaEstimado >= ?"
-                params.append(tempo_min)
-            
-            if tempo_max is not None:
-                query += " AND TempoDeVidaEstimado <= ?"
-                params.append(tempo_max)
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar dados por faixa de tempo de vida: {e}")
-            raise
+    def by_tempo_vida_range(self, tempo_min=None, tempo_max=None):
+        """Dados na faixa de tempo de vida estimado"""
+        return Condition.between('TempoDeVidaEstimado', tempo_min, tempo_max)
     
-    def get_by_crescimento_range(self, crescimento_min=None, crescimento_max=None):
-        """Busca dados por faixa de crescimento anual"""
-        try:
-            query = "SELECT * FROM DadosArvore WHERE 1=1"
-            params = []
-            
-            if crescimento_min is not None:
-                query += " AND CrescimentoAnual >= ?"
-                params.append(crescimento_min)
-            
-            if crescimento_max is not None:
-                query += " AND CrescimentoAnual <= ?"
-                params.append(crescimento_max)
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar dados por faixa de crescimento: {e}")
-            raise
+    def by_crescimento_range(self, crescimento_min=None, crescimento_max=None):
+        """Dados na faixa de crescimento anual"""
+        return Condition.between('CrescimentoAnual', crescimento_min, crescimento_max)
     
-    def get_by_densidade_range(self, densidade_min=None, densidade_max=None):
-        """Busca dados por faixa de densidade da madeira"""
-        try:
-            query = "SELECT * FROM DadosArvore WHERE 1=1"
-            params = []
-            
-            if densidade_min is not None:
-                query += " AND DensidadeMadeira >= ?"
-                params.append(densidade_min)
-            
-            if densidade_max is not None:
-                query += " AND DensidadeMadeira <= ?"
-                params.append(densidade_max)
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar dados por faixa de densidade: {e}")
-            raise
+    def by_densidade_range(self, densidade_min=None, densidade_max=None):
+        """Dados na faixa de densidade da madeira"""
+        return Condition.between('DensidadeMadeira', densidade_min, densidade_max)
 
 # Instância global do modelo
 dados_arvore_model = DadosArvoreModel()
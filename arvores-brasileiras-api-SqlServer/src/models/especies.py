@@ -1,10 +1,22 @@
 from src.models.base_model import BaseModel
-from src.database.connection import db_connection
+from src.models.filters import Condition, Field
+from src.models.relationships import Relationship
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+def especie_resumo(name='especie'):
+    """Relacionamento com o resumo da espécie, usado pelas tabelas que referenciam EspecieID"""
+    return Relationship(
+        name,
+        """
+            SELECT EspecieID, NomeCientifico, NomePopular, Familia
+            FROM Especies
+        """,
+        foreign_key='EspecieID', local_key='EspecieID', many=False
+    )
+
 class EspeciesModel(BaseModel):
     """Modelo para a tabela Especies"""
     
@@ -14,17 +26,14 @@ class EspeciesModel(BaseModel):
     
     def get_fields(self): return ["NomeCientifico", "NomePopular", "Familia", "Descricao", "DataCadastro"]
     
-    def to_dict(self, row):
-        """Converte linha do banco para dicionário"""
-        if not row: return None
-        
+    def get_field_specs(self):
         return {
-            'EspecieID': row[0],
-            'NomeCientifico': row[1],
-            'NomePopular': row[2],
-            'Familia': row[3],
-            'Descricao': row[4],
-            'DataCadastro': row[5].isoformat() if row[5] else None
+            'EspecieID': Field(int, indexed=True),
+            'NomeCientifico': Field(str, indexed=True, searchable=True),
+            'NomePopular': Field(str, indexed=True, searchable=True),
+            'Familia': Field(str, indexed=True),
+            'Descricao': Field(str, searchable=True),
+            'DataCadastro': Field(datetime)
         }
     
     def from_dict(self, data):
@@ -47,135 +56,67 @@ class EspeciesModel(BaseModel):
         
         return result
     
-    def add_relationships(self, item):
-        """Adiciona relacionamentos da espécie"""
-        try:
-            especie_id = item['EspecieID']
-            
-            # Buscar ocorrências
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute("""
+    def get_relationships(self):
+        """Relacionamentos da espécie, carregados em lote para todos os itens da página"""
+        return [
+            Relationship(
+                'ocorrencias',
+                """
                     SELECT o.OcorrenciaID, o.EspecieID, o.BiomaID, o.Frequencia,
                            b.Nome as BiomaNome, b.Descricao as BiomaDescricao, b.Regiao
                     FROM Ocorrencias o
                     LEFT JOIN Biomas b ON o.BiomaID = b.BiomaID
-                    WHERE o.EspecieID = ?
-                """, [especie_id])
-                
-                ocorrencias = []
-                for row in cursor.fetchall():
-                    ocorrencias.append({
-                        'OcorrenciaID': row[0],
-                        'EspecieID': row[1],
-                        'BiomaID': row[2],
-                        'Frequencia': row[3],
-                        'Bioma': {
-                            'Nome': row[4],
-                            'Descricao': row[5],
-                            'Regiao': row[6]
-                        } if row[4] else None
-                    })
-                
-                # Buscar características
-                cursor.execute("""
+                """,
+                foreign_key='o.EspecieID', local_key='EspecieID',
+                fields=('OcorrenciaID', 'EspecieID', 'BiomaID', 'Frequencia', 'Bioma'),
+                to_dict=lambda row: {
+                    'OcorrenciaID': row[0],
+                    'EspecieID': row[1],
+                    'BiomaID': row[2],
+                    'Frequencia': row[3],
+                    'Bioma': {
+                        'Nome': row[4],
+                        'Descricao': row[5],
+                        'Regiao': row[6]
+                    } if row[4] else None
+                }
+            ),
+            Relationship(
+                'caracteristicas',
+                """
                     SELECT CaracteristicaID, EspecieID, AlturaMedia, DiametroMedio, TipoFolha, Floracao
                     FROM Caracteristicas
-                    WHERE EspecieID = ?
-                """, [especie_id])
-                
-                caracteristicas = []
-                for row in cursor.fetchall():
-                    caracteristicas.append({
-                        'CaracteristicaID': row[0],
-                        'EspecieID': row[1],
-                        'AlturaMedia': float(row[2]) if row[2] else None,
-                        'DiametroMedio': float(row[3]) if row[3] else None,
-                        'TipoFolha': row[4],
-                        'Floracao': row[5]
-                    })
-                
-                # Buscar curiosidades
-                cursor.execute("""
+                """,
+                foreign_key='EspecieID', local_key='EspecieID'
+            ),
+            Relationship(
+                'curiosidades',
+                """
                     SELECT CuriosidadeID, EspecieID, Texto, Fonte
                     FROM Curiosidades
-                    WHERE EspecieID = ?
-                """, [especie_id])
-                
-                curiosidades = []
-                for row in cursor.fetchall():
-                    curiosidades.append({
-                        'CuriosidadeID': row[0],
-                        'EspecieID': row[1],
-                        'Texto': row[2],
-                        'Fonte': row[3]
-                    })
-                
-                # Buscar dados da árvore
-                cursor.execute("""
-                    SELECT DadosID, EspecieID, TempoDeVidaEstimado, CrescimentoAnual, 
+                """,
+                foreign_key='EspecieID', local_key='EspecieID'
+            ),
+            Relationship(
+                'dados_arvore',
+                """
+                    SELECT DadosID, EspecieID, TempoDeVidaEstimado, CrescimentoAnual,
                            RaizProfundidadeMedia, DensidadeMadeira
                     FROM DadosArvore
-                    WHERE EspecieID = ?
-                """, [especie_id])
-                
-                dados_arvore = []
-                for row in cursor.fetchall():
-                    dados_arvore.append({
-                        'DadosID': row[0],
-                        'EspecieID': row[1],
-                        'TempoDeVidaEstimado': row[2],
-                        'CrescimentoAnual': float(row[3]) if row[3] else None,
-                        'RaizProfundidadeMedia': float(row[4]) if row[4] else None,
-                        'DensidadeMadeira': float(row[5]) if row[5] else None
-                    })
-                
-                # Adicionar relacionamentos ao item
-                item['ocorrencias'] = ocorrencias
-                item['caracteristicas'] = caracteristicas
-                item['curiosidades'] = curiosidades
-                item['dados_arvore'] = dados_arvore
-                
-                return item
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar relacionamentos da espécie {item['EspecieID']}: {e}")
-            return item
+                """,
+                foreign_key='EspecieID', local_key='EspecieID'
+            )
+        ]
+    
+    # Condições das rotas auxiliares, paginadas por get_all(condition=...)
     
-    def search_by_name(self, nome):
-        """Busca espécies por nome científico ou popular"""
-        try:
-            query = """
-                SELECT * FROM Especies 
-                WHERE NomeCientifico LIKE ? OR NomePopular LIKE ?
-                ORDER BY NomePopular
-            """
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [f"%{nome}%", f"%{nome}%"])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar espécies por nome '{nome}': {e}")
-            raise
+    def by_name(self, nome):
+        """Espécies com o trecho no nome científico ou popular, por nome popular"""
+        return Condition.contains(('NomeCientifico', 'NomePopular'), nome, sort='NomePopular')
     
-    def get_by_familia(self, familia):
-        """Busca espécies por família"""
-        try:
-            query = """
-                SELECT * FROM Especies 
-                WHERE Familia LIKE ?
-                ORDER BY NomePopular
-            """
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [f"%{familia}%"])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar espécies por família '{familia}': {e}")
-            raise
+    def by_familia(self, familia):
+        """Espécies da família (trecho do nome), por nome popular"""
+        return Condition.contains(('Familia',), familia, sort='NomePopular')
 
 # Instância global do modelo
 especies_model = EspeciesModel()
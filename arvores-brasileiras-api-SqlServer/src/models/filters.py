@@ -0,0 +1,238 @@
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from src.models.pagination import InvalidParameter
+from src.models.statements import padded
+import operator as op
+import threading
+import unicodedata
+
+# Operadores aceitos como sufixo do filtro: ?Campo__gte=10
+OPERATORS = ('eq', 'in', 'gt', 'gte', 'lt', 'lte', 'prefix', 'contains')
+RANGE_OPERATORS = {'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+RANGE_FUNCTIONS = {'gt': op.gt, 'gte': op.ge, 'lt': op.lt, 'lte': op.le}
+ORDERED_TYPES = (int, Decimal, float, datetime, date)
+LIKE_ESCAPE = '\\'
+
+class Field:
+    """Metadados de um campo usados pelo compilador de filtros
+
+    - `type`: tipo Python do valor (int, Decimal, str, datetime...)
+    - `indexed`: existe índice no banco; o campo pode ser usado em ?sort=
+    - `searchable`: permite busca por trecho (__contains, LIKE '%x%')
+    """
+    __slots__ = ('type', 'indexed', 'searchable')
+
+    def __init__(self, type=str, indexed=False, searchable=False):
+        self.type = type
+        self.indexed = indexed
+        self.searchable = searchable
+
+    @property
+    def default_operator(self):
+        # Texto usa prefixo (aproveita índice); demais tipos usam igualdade
+        return 'prefix' if self.type is str else 'eq'
+
+def escape_like(value):
+    """Escapa curingas do LIKE para que o valor seja comparado literalmente"""
+    for char in (LIKE_ESCAPE, '%', '_', '['):
+        value = value.replace(char, LIKE_ESCAPE + char)
+    return value
+
+def _convert(field_name, field, raw):
+    """Converte o valor textual da query string para o tipo do campo"""
+    try:
+        if field.type is int: return int(raw)
+        if field.type is Decimal: return Decimal(raw)
+        if field.type is float: return float(raw)
+        if field.type is datetime: return datetime.fromisoformat(raw)
+        if field.type is date: return date.fromisoformat(raw)
+    except (ValueError, InvalidOperation):
+        raise InvalidParameter(f"Valor inválido para o filtro {field_name}: '{raw}'")
+    return raw
+
+def fold(text):
+    """Texto sem acentos e sem diferença de maiúsculas ("Ipê" -> "ipe")"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+def comparable(value):
+    """Normaliza um valor para comparação em memória com os registros de to_dict
+
+    to_dict entrega decimais como float e datas como texto ISO; texto é comparado
+    sem diferenciar maiúsculas, como na collation padrão do SQL Server.
+    """
+    if isinstance(value, str): return value.casefold()
+    if isinstance(value, Decimal): return float(value)
+    if isinstance(value, (datetime, date)): return value.isoformat()
+    return value
+
+class FilterCompiler:
+    """Compila filtros da query string em cláusulas WHERE parametrizadas
+
+    O SQL gerado depende apenas da "forma" do filtro (campos, operadores e
+    quantidade de valores em IN), então o template é compilado uma vez por
+    forma e reutilizado; os valores sempre vão como parâmetros.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def parse(self, filters):
+        """Separa campo/operador e valores; campos desconhecidos são ignorados"""
+        terms = []
+        for key, raw in (filters or {}).items():
+            name, _, operator = key.partition('__')
+            field = self.fields.get(name)
+            if field is None: continue
+
+            operator = operator or field.default_operator
+            if operator not in OPERATORS:
+                raise InvalidParameter(f"Operador de filtro inválido: {key} (use {', '.join(OPERATORS)})")
+
+            values = [raw]
+            if operator == 'eq' and field.type is not str and ',' in raw: operator = 'in'
+            if operator == 'in': values = [value.strip() for value in raw.split(',') if value.strip()]
+            if not values: raise InvalidParameter(f"Filtro {key} sem valores")
+            # Listas IN de tamanhos próximos compartilham o mesmo template (e o mesmo plano no banco)
+            if operator == 'in': values = padded(values)
+
+            terms.append((name, operator, values))
+
+        terms.sort(key=lambda term: (term[0], term[1]))
+        return terms
+
+    def compile(self, filters):
+        """Retorna (cláusulas WHERE, parâmetros) para os filtros informados"""
+        _, clauses, params = self.compile_shaped(filters)
+        return clauses, params
+
+    def compile_shaped(self, filters):
+        """Como `compile`, retornando também a forma dos filtros (chave dos caches de comandos)"""
+        terms = self.parse(filters)
+        if not terms: return (), [], []
+
+        shape = tuple((name, operator, len(values)) for name, operator, values in terms)
+        clauses = self._templates.get(shape)
+        if clauses is None:
+            clauses = [self._clause(*term) for term in shape]
+            with self._lock: self._templates[shape] = clauses
+
+        params = []
+        for name, operator, values in terms:
+            params.extend(self._params(name, operator, values))
+        return shape, list(clauses), params
+
+    def _clause(self, name, operator, arity):
+        field = self.fields[name]
+        if operator == 'eq': return f"{name} = ?"
+        if operator == 'in': return f"{name} IN ({', '.join('?' for _ in range(arity))})"
+        if operator in RANGE_OPERATORS:
+            if field.type not in ORDERED_TYPES:
+                raise InvalidParameter(f"Filtro por faixa não suportado em {name}")
+            return f"{name} {RANGE_OPERATORS[operator]} ?"
+
+        if field.type is not str:
+            raise InvalidParameter(f"Filtro {operator} só é suportado em campos de texto ({name})")
+        if operator == 'contains' and not field.searchable:
+            raise InvalidParameter(f"Busca por trecho não permitida em {name}; use {name}__prefix")
+        return f"{name} LIKE ? ESCAPE '{LIKE_ESCAPE}'"
+
+    def _params(self, name, operator, values):
+        field = self.fields[name]
+        if operator == 'prefix': return [escape_like(values[0]) + '%']
+        if operator == 'contains': return ['%' + escape_like(values[0]) + '%']
+        return [_convert(name, field, value) for value in values]
+
+    def predicate(self, filters):
+        """Versão em Python dos filtros, avaliada sobre registros já convertidos (to_dict)
+
+        Usada quando a consulta é atendida em memória. Aplica a mesma validação do SQL;
+        como no banco, um campo NULL nunca satisfaz o filtro. Retorna None sem filtros.
+        """
+        self.compile(filters)
+        tests = [self._test(name, operator, values) for name, operator, values in self.parse(filters)]
+        if not tests: return None
+        return lambda record: all(test(record) for test in tests)
+
+    def _test(self, name, operator, values):
+        field = self.fields[name]
+        targets = [comparable(value if field.type is str else _convert(name, field, value)) for value in values]
+
+        def value_of(record):
+            value = record.get(name)
+            return None if value is None else comparable(value)
+
+        if operator == 'prefix':
+            return lambda record: record.get(name) is not None and value_of(record).startswith(targets[0])
+        if operator == 'contains':
+            return lambda record: record.get(name) is not None and targets[0] in value_of(record)
+        if operator in RANGE_FUNCTIONS:
+            compare, target = RANGE_FUNCTIONS[operator], targets[0]
+            return lambda record: record.get(name) is not None and compare(value_of(record), target)
+
+        targets = set(targets)
+        return lambda record: value_of(record) in targets
+
+    def cache_size(self):
+        return len(self._templates)
+
+class Condition:
+    """Condição fixa de uma rota auxiliar (?nome=, /familia/<familia>, faixas...), paginada como as listagens
+
+    - `shape`: identifica o texto SQL no cache de comandos (nome e forma da condição)
+    - `clauses`/`params`: cláusulas WHERE e parâmetros, somados aos filtros
+    - `predicate`: a mesma condição avaliada sobre registros em memória (snapshot)
+    - `lookup`: (campo, valor) quando a condição é igualdade em chave estrangeira indexada
+    - `sort`: ordenação padrão da rota (None = chave primária)
+    """
+    __slots__ = ('shape', 'clauses', 'params', 'predicate', 'lookup', 'sort')
+
+    def __init__(self, shape, clauses, params, predicate, lookup=None, sort=None):
+        self.shape = shape
+        self.clauses = clauses
+        self.params = params
+        self.predicate = predicate
+        self.lookup = lookup
+        self.sort = sort
+
+    @classmethod
+    def equals(cls, field, value, sort=None):
+        """`field` = `value`"""
+        return cls(('equals', field), [f"{field} = ?"], [value],
+                   lambda record: record.get(field) == value, lookup=(field, value), sort=sort)
+
+    @classmethod
+    def contains(cls, fields, text, sort=None):
+        """Algum dos campos contém `text` (LIKE '%texto%', sem diferenciar maiúsculas)"""
+        needle = text.casefold()
+        clause = ' OR '.join(f"{field} LIKE ? ESCAPE '{LIKE_ESCAPE}'" for field in fields)
+        return cls(
+            ('contains',) + tuple(fields), [f"({clause})" if len(fields) > 1 else clause],
+            ['%' + escape_like(text) + '%'] * len(fields),
+            lambda record: any(record.get(field) is not None and needle in record[field].casefold() for field in fields),
+            sort=sort
+        )
+
+    @classmethod
+    def between(cls, field, low=None, high=None, sort=None):
+        """`field` entre `low` e `high` (inclusive; limites None são ignorados)"""
+        clauses, params = [], []
+        if low is not None:
+            clauses.append(f"{field} >= ?")
+            params.append(low)
+        if high is not None:
+            clauses.append(f"{field} <= ?")
+            params.append(high)
+        low_value = None if low is None else comparable(low)
+        high_value = None if high is None else comparable(high)
+
+        def predicate(record):
+            value = record.get(field)
+            if value is None: return False
+            value = comparable(value)
+            return (low_value is None or value >= low_value) and (high_value is None or value <= high_value)
+        # Sem limites, como no banco, todos os registros (inclusive NULL) satisfazem a condição
+        return cls(('between', field, low is not None, high is not None), clauses, params,
+                   predicate if clauses else None, sort=sort)
@@ -0,0 +1,493 @@
+from bisect import bisect_left, bisect_right
+from decimal import Decimal, InvalidOperation
+from heapq import nlargest, nsmallest
+from src.database.connection import db_connection
+from src.database.versions import table_versions
+from src.models.caracteristicas import caracteristicas_model
+from src.models.dados_arvore import dados_arvore_model
+from src.models.especies import especies_model
+from src.models.filters import comparable
+from src.models.pagination import (
+    COUNT_EXACT, COUNT_NONE, InvalidParameter, decode_cursor, encode_cursor, parse_count_mode
+)
+from src.models.rows import RowMapper
+from src.models.snapshot import sort_key
+from src.models.statements import StatementCache
+import math
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Campos de medida aceitos nas faixas e na ordenação: nome -> alias da tabela na consulta
+MEASURES = {
+    'TempoDeVidaEstimado': 'd',
+    'CrescimentoAnual': 'd',
+    'RaizProfundidadeMedia': 'd',
+    'DensidadeMadeira': 'd',
+    'AlturaMedia': 'c',
+    'DiametroMedio': 'c'
+}
+
+# Colunas de cada registro, na ordem da resposta: (alias da tabela, coluna)
+COLUMNS = (
+    ('d', 'DadosID'), ('c', 'CaracteristicaID'), ('d', 'EspecieID'),
+    ('e', 'NomeCientifico'), ('e', 'NomePopular'), ('e', 'Familia')
+) + tuple((alias, name) for name, alias in MEASURES.items())
+
+# Operadores das faixas: ?AlturaMedia__gte=10&AlturaMedia__lt=20 (sem sufixo = igualdade)
+OPERATORS = ('eq', 'gt', 'gte', 'lt', 'lte')
+
+# Chave estável de cada registro (desempate da ordenação e posição do cursor)
+KEY_COLUMNS = ('d.DadosID', 'COALESCE(c.CaracteristicaID, 0)')
+
+# Parâmetros de paginação; os demais são faixas
+RESERVED_PARAMS = ('page', 'per_page', 'after', 'count', 'sort')
+MAX_PER_PAGE = 1000
+
+def record_key(record):
+    return (record['DadosID'], record['CaracteristicaID'] or 0)
+
+class Bound:
+    """Limite de uma faixa: valor (no tipo da coluna) e se o próprio valor está incluído"""
+    __slots__ = ('value', 'inclusive')
+
+    def __init__(self, value, inclusive):
+        self.value = value
+        self.inclusive = inclusive
+
+class MeasurementQuery:
+    """Consulta pedida em /api/arvores/query, já validada
+
+    `ranges` = {campo: (limite inferior, limite superior)}, com None no lado sem limite;
+    várias condições no mesmo campo são combinadas na faixa mais estreita.
+    """
+    __slots__ = ('ranges', 'sort', 'descending', 'page', 'per_page', 'after', 'count')
+
+    def __init__(self, ranges=None, sort=None, descending=False, page=1, per_page=100, after=None, count=None):
+        self.ranges = ranges or {}
+        self.sort = sort
+        self.descending = descending
+        self.page = page
+        self.per_page = per_page
+        self.after = after
+        self.count = count
+
+    @classmethod
+    def parse(cls, args):
+        """Valida os parâmetros da query string; erros viram InvalidParameter (HTTP 400)"""
+        ranges = {}
+        for key, raw in args.items():
+            if key in RESERVED_PARAMS: continue
+            name, _, operator = key.partition('__')
+            if name not in MEASURES:
+                raise InvalidParameter(f"Campo de medida inválido: {name} (use {', '.join(MEASURES)})")
+            operator = operator or 'eq'
+            if operator not in OPERATORS:
+                raise InvalidParameter(f"Operador inválido: {key} (use {', '.join(OPERATORS)})")
+            low, high = ranges.get(name, (None, None))
+            value = cls._convert(name, raw)
+            if operator in ('eq', 'gt', 'gte'): low = cls._tighter(low, Bound(value, operator != 'gt'), max)
+            if operator in ('eq', 'lt', 'lte'): high = cls._tighter(high, Bound(value, operator != 'lt'), min)
+            ranges[name] = (low, high)
+
+        sort, descending = args.get('sort') or None, False
+        if sort is not None:
+            descending = sort.startswith('-')
+            sort = sort.lstrip('-')
+            if sort not in MEASURES:
+                raise InvalidParameter(f"Ordenação por '{sort}' não suportada (use {', '.join(MEASURES)}, com '-' para decrescente)")
+
+        page = args.get('page', 1, type=int)
+        per_page = args.get('per_page', 100, type=int)
+        if page < 1 or per_page < 1: raise InvalidParameter("page e per_page devem ser inteiros positivos")
+
+        after = args.get('after')
+        count = parse_count_mode(args.get('count'), COUNT_NONE if after is not None else COUNT_EXACT)
+        return cls(ranges, sort, descending, page, min(per_page, MAX_PER_PAGE), after, count)
+
+    @staticmethod
+    def _convert(name, raw):
+        """Valor da faixa no tipo da coluna (o parâmetro vai ao banco sem conversão implícita da coluna)"""
+        spec = dados_arvore_model.field_specs.get(name) or caracteristicas_model.field_specs[name]
+        try:
+            value = spec.type(raw)
+        except (ValueError, InvalidOperation):
+            raise InvalidParameter(f"Valor inválido para {name}: '{raw}'")
+        if isinstance(value, Decimal) and not value.is_finite():
+            raise InvalidParameter(f"Valor inválido para {name}: '{raw}'")
+        return value
+
+    @staticmethod
+    def _tighter(current, bound, choose):
+        if current is None: return bound
+        if bound.value == current.value:
+            return bound if current.inclusive and not bound.inclusive else current
+        return bound if choose(bound.value, current.value) == bound.value else current
+
+    @property
+    def sort_token(self):
+        """Nome da ordenação guardado no cursor (um cursor só vale para a mesma ordenação)"""
+        return ('-' if self.descending else '') + (self.sort or 'DadosID')
+
+    @property
+    def empty(self):
+        """Alguma faixa sem valores possíveis (ex.: gte maior que lte)"""
+        for low, high in self.ranges.values():
+            if low is None or high is None: continue
+            if low.value > high.value or (low.value == high.value and not (low.inclusive and high.inclusive)):
+                return True
+        return False
+
+    def seek(self):
+        """Posição após o último registro visto: (valor de ordenação, chave) ou None"""
+        if not self.after: return None
+        sort_value, key = decode_cursor(self.after, self.sort_token)
+        try:
+            key = (int(key[0]), int(key[1]))
+            if sort_value is not None and self.sort is not None: sort_value = self._convert(self.sort, str(sort_value))
+        except (TypeError, ValueError, IndexError, InvalidParameter):
+            raise InvalidParameter("Cursor inválido")
+        return sort_value, key
+
+class _Order:
+    """Registros ordenados por (campo, chave), com os valores não nulos para busca binária das faixas"""
+    __slots__ = ('positions', 'sort_keys', 'rank', 'values', 'nulls')
+
+    def __init__(self, rows, field):
+        keys = [record_key(record) for record in rows]
+        if field is None:
+            self.positions = list(range(len(rows)))
+            self.sort_keys = [(sort_key(None), key) for key in keys]
+            self.nulls = len(rows)
+            self.values = []
+        else:
+            self.positions = sorted(range(len(rows)), key=lambda position: (sort_key(rows[position][field]), keys[position]))
+            self.sort_keys = [(sort_key(rows[position][field]), keys[position]) for position in self.positions]
+            # NULLs vêm primeiro; os demais valores ficam em ordem crescente
+            self.nulls = sum(1 for record in rows if record[field] is None)
+            self.values = [comparable(rows[position][field]) for position in self.positions[self.nulls:]]
+        self.rank = [0] * len(rows)
+        for rank, position in enumerate(self.positions): self.rank[position] = rank
+
+    def between(self, low, high):
+        """Intervalo [início, fim) das posições em `positions` cujos valores estão na faixa"""
+        start, stop = 0, len(self.values)
+        if low is not None:
+            value = comparable(low.value)
+            start = (bisect_left if low.inclusive else bisect_right)(self.values, value)
+        if high is not None:
+            value = comparable(high.value)
+            stop = (bisect_right if high.inclusive else bisect_left)(self.values, value)
+        return self.nulls + start, self.nulls + max(start, stop)
+
+class MeasurementIndex:
+    """Índice em memória das medidas, montado a partir dos snapshots das três tabelas
+
+    Cada campo tem uma ordenação própria (calculada no primeiro uso): a faixa de um campo
+    é um intervalo contíguo encontrado por busca binária. Com várias faixas, a mais
+    seletiva define os candidatos e as demais são conferidas só neles, sobre listas de
+    valores por campo; a página é escolhida entre os candidatos pela posição na ordenação
+    pedida, sem ordenar tudo. Sem total (count=false), se a página tende a se completar
+    antes, a ordenação pedida é percorrida até preenchê-la.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows   # registros em ordem de chave
+        self._orders = {}
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    def order(self, field):
+        order = self._orders.get(field)
+        if order is None:
+            with self._lock:
+                order = self._orders.get(field)
+                if order is None: order = self._orders[field] = _Order(self.rows, field)
+        return order
+
+    def column(self, field):
+        """Valores do campo por posição, com NaN no lugar de NULL (nenhuma comparação com NaN é verdadeira)"""
+        column = self._columns.get(field)
+        if column is None:
+            column = self._columns[field] = [
+                math.nan if record[field] is None else float(comparable(record[field])) for record in self.rows
+            ]
+        return column
+
+    def select(self, query, seek, offset, limit, count=True):
+        """Registros da página e total nas faixas (None quando `count` é falso e a página sai da varredura)"""
+        order = self.order(query.sort)
+        first, last = 0, len(self.rows)
+        if seek is not None:
+            position = (sort_key(seek[0]), seek[1])
+            if query.descending: last = bisect_left(order.sort_keys, position)
+            else: first = bisect_right(order.sort_keys, position)
+
+        if not query.ranges:
+            ranks = range(last - 1, first - 1, -1) if query.descending else range(first, last)
+            return [self.rows[order.positions[rank]] for rank in ranks[offset:offset + limit]], len(self.rows)
+
+        # Intervalo de cada faixa na ordenação do seu campo; o menor define os candidatos
+        slices = {field: self.order(field).between(low, high) for field, (low, high) in query.ranges.items()}
+        field = min(slices, key=lambda name: slices[name][1] - slices[name][0])
+        start, stop = slices[field]
+        if start == stop: return [], 0
+
+        if not count:
+            # A faixa do campo de ordenação também limita o trecho percorrido
+            window = (first, last)
+            if query.sort in slices:
+                window = (max(first, slices[query.sort][0]), min(last, slices[query.sort][1]))
+            # Registros lidos até completar a página, supondo as faixas independentes
+            if (offset + limit) * max(window[1] - window[0], 0) < (stop - start) ** 2:
+                return self._scan(query, order, window, offset, limit), None
+
+        matches = self._filter(self.order(field).positions[start:stop], query, field)
+        rank = order.rank
+        visible = [position for position in matches if first <= rank[position] < last] if seek is not None else matches
+        choose = nlargest if query.descending else nsmallest
+        page = choose(offset + limit, visible, key=rank.__getitem__)[offset:]
+        return [self.rows[position] for position in page], len(matches)
+
+    def _filter(self, positions, query, skip):
+        """Posições que satisfazem as faixas dos demais campos"""
+        for field, (low, high) in query.ranges.items():
+            if field == skip: continue
+            column = self.column(field)
+            if low is not None:
+                value = float(comparable(low.value))
+                if low.inclusive: positions = [position for position in positions if column[position] >= value]
+                else: positions = [position for position in positions if column[position] > value]
+            if high is not None:
+                value = float(comparable(high.value))
+                if high.inclusive: positions = [position for position in positions if column[position] <= value]
+                else: positions = [position for position in positions if column[position] < value]
+        return positions
+
+    def _scan(self, query, order, window, offset, limit):
+        """Percorre a ordenação pedida no trecho `window` até reunir offset + limit registros nas faixas"""
+        tests = []
+        for field, (low, high) in query.ranges.items():
+            # O trecho já está dentro da faixa do campo de ordenação
+            if field == query.sort: continue
+            tests.append((
+                self.column(field),
+                -math.inf if low is None else float(comparable(low.value)), low is None or low.inclusive,
+                math.inf if high is None else float(comparable(high.value)), high is None or high.inclusive
+            ))
+
+        first, last = window
+        ranks = range(last - 1, first - 1, -1) if query.descending else range(first, last)
+        positions, found = order.positions, []
+        for rank in ranks:
+            position = positions[rank]
+            for column, low, low_inclusive, high, high_inclusive in tests:
+                value = column[position]
+                if not ((value > low or (low_inclusive and value == low)) and (value < high or (high_inclusive and value == high))):
+                    break
+            else:
+                found.append(position)
+                if len(found) >= offset + limit: break
+        return [self.rows[position] for position in found[offset:]]
+
+class MeasurementsModel:
+    """Busca por faixas combinadas das medidas das árvores (DadosArvore + Caracteristicas)
+
+    Cada registro é um par (DadosArvore, Caracteristicas) da mesma espécie, com os nomes
+    da espécie; espécies sem Caracteristicas aparecem com as medidas de altura e diâmetro
+    nulas. Com os snapshots das três tabelas carregados a consulta usa o índice em memória
+    (`MeasurementIndex`); caso contrário vai ao banco, com as faixas escritas como
+    comparações diretas nas colunas (aproveitam os índices IX_<Tabela>_<Campo>).
+    """
+
+    cache_tables = ('DadosArvore', 'Caracteristicas', 'Especies')
+
+    def __init__(self):
+        self.statements = StatementCache('Medidas')
+        self.row_mapper = RowMapper({
+            **especies_model.field_specs, **caracteristicas_model.field_specs, **dados_arvore_model.field_specs
+        })
+        self._index = None
+        self._generation = 0
+        self._index_lock = threading.Lock()
+        table_versions.subscribe(self._on_write)
+
+    def _on_write(self, table, ids):
+        if table not in self.cache_tables: return
+        with self._index_lock:
+            self._generation += 1
+            self._index = None
+
+    def active_index(self):
+        """Índice em memória atualizado, ou None se algum snapshot não estiver carregado"""
+        snapshots = [model.active_snapshot() for model in (dados_arvore_model, caracteristicas_model, especies_model)]
+        if any(snapshot is None for snapshot in snapshots): return None
+
+        generation = self._generation
+        index = self._index
+        if index is not None: return index
+
+        index = MeasurementIndex(self._join(*snapshots))
+        with self._index_lock:
+            # Uma escrita durante a montagem deixa o índice desatualizado: ele serve esta consulta, mas não é guardado
+            if generation == self._generation: self._index = index
+        return index
+
+    @staticmethod
+    def _join(dados, caracteristicas, especies):
+        """Registros da consulta montados a partir dos snapshots, na ordem da chave"""
+        by_especie = {}
+        for record in caracteristicas.select()[0]:
+            by_especie.setdefault(record['EspecieID'], []).append(record)
+        nomes = {record['EspecieID']: record for record in especies.select()[0]}
+
+        rows = []
+        for dado in dados.select()[0]:
+            especie = nomes.get(dado['EspecieID'], {})
+            for caracteristica in by_especie.get(dado['EspecieID']) or [{}]:
+                sources = {'d': dado, 'c': caracteristica, 'e': especie}
+                rows.append({name: sources[alias].get(name) for alias, name in COLUMNS})
+        rows.sort(key=record_key)
+        return rows
+
+    def query(self, query):
+        """Página de registros nas faixas pedidas, no formato da paginação das listagens"""
+        try:
+            cursor_mode = query.after is not None
+            seek = query.seek() if cursor_mode else None
+            offset = 0 if cursor_mode else (query.page - 1) * query.per_page
+            per_page = query.per_page
+
+            if query.empty:
+                items, total = [], 0
+            else:
+                index = self.active_index()
+                if index is not None:
+                    items, total = index.select(query, seek, offset, per_page + 1, query.count != COUNT_NONE)
+                else:
+                    items, total = self._fetch_page(query, seek, offset, per_page + 1)
+            if query.count == COUNT_NONE: total = None
+
+            has_next = len(items) > per_page
+            items = items[:per_page]
+
+            if cursor_mode:
+                last = items[-1] if items else None
+                next_cursor = None
+                if has_next:
+                    next_cursor = encode_cursor(query.sort_token, last[query.sort] if query.sort else None, record_key(last))
+                return {
+                    'data': items,
+                    'pagination': {
+                        'per_page': per_page,
+                        'sort': query.sort_token,
+                        'next_cursor': next_cursor,
+                        'has_next': has_next,
+                        'total': total
+                    }
+                }
+
+            return {
+                'data': items,
+                'pagination': {
+                    'page': query.page,
+                    'pages': (total + per_page - 1) // per_page if total is not None else None,
+                    'per_page': per_page,
+                    'total': total,
+                    'has_next': has_next,
+                    'has_prev': query.page > 1
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"Erro na consulta por medidas: {e}")
+            raise
+
+    # Banco
+
+    def _fetch_page(self, query, seek, offset, limit):
+        shape, clauses, params = self._where(query)
+        seek_kind, seek_params = self._build_seek(query, seek) if seek is not None else (None, [])
+        statement = self.statements.get(
+            ('page', shape, query.sort, query.descending, seek_kind), lambda: self._page_statement(query, clauses, seek_kind)
+        )
+        dialect = db_connection.dialect
+
+        with db_connection.get_cursor() as (cursor, connection):
+            cursor.execute(statement, params + seek_params + dialect.page_params(offset, limit))
+            items = self.row_mapper.convert_all(cursor.description, cursor.fetchall())
+
+            total = None
+            if query.count != COUNT_NONE:
+                # Sem estimativa para junções: count=estimate conta como exact
+                cursor.execute(self.statements.get(('count', shape), lambda: self._count_statement(clauses)), params)
+                total = cursor.fetchone()[0]
+        return items, total
+
+    @staticmethod
+    def _where(query):
+        """Forma, cláusulas e parâmetros das faixas (cada limite é uma comparação direta com a coluna)"""
+        shape, clauses, params = [], [], []
+        for name, (low, high) in sorted(query.ranges.items()):
+            column = f"{MEASURES[name]}.{name}"
+            for bound, strict, loose in ((low, '>', '>='), (high, '<', '<=')):
+                if bound is None: continue
+                operator = loose if bound.inclusive else strict
+                shape.append((name, operator))
+                clauses.append(f"{column} {operator} ?")
+                params.append(bound.value)
+        return tuple(shape), clauses, params
+
+    @staticmethod
+    def _source():
+        select_list = ', '.join(f"{alias}.{name}" for alias, name in COLUMNS)
+        return (
+            f"SELECT {select_list} FROM DadosArvore d "
+            "LEFT JOIN Caracteristicas c ON c.EspecieID = d.EspecieID "
+            "LEFT JOIN Especies e ON e.EspecieID = d.EspecieID"
+        )
+
+    def _page_statement(self, query, clauses, seek_kind):
+        clauses = list(clauses)
+        if seek_kind is not None: clauses.append(self._seek_clause(query, seek_kind))
+
+        statement = self._source()
+        if clauses: statement += " WHERE " + " AND ".join(clauses)
+
+        direction = " DESC" if query.descending else ""
+        order_by = ([f"{MEASURES[query.sort]}.{query.sort}"] if query.sort else []) + list(KEY_COLUMNS)
+        return statement + " ORDER BY " + ", ".join(column + direction for column in order_by) + " " + db_connection.dialect.page_clause
+
+    @staticmethod
+    def _count_statement(clauses):
+        statement = (
+            "SELECT COUNT(*) FROM DadosArvore d "
+            "LEFT JOIN Caracteristicas c ON c.EspecieID = d.EspecieID"
+        )
+        return statement + (" WHERE " + " AND ".join(clauses) if clauses else "")
+
+    @staticmethod
+    def _build_seek(query, seek):
+        sort_value, (dados_id, caracteristica_id) = seek
+        key_params = [dados_id, dados_id, caracteristica_id]
+        if query.sort is None: return 'key', key_params
+        if sort_value is None: return 'null', key_params
+        return 'value', [sort_value, sort_value] + key_params
+
+    @staticmethod
+    def _seek_clause(query, seek_kind):
+        """Registros após (valor, chave) na ordenação pedida; NULLs vêm primeiro na ordem crescente"""
+        after = '<' if query.descending else '>'
+        key = f"({KEY_COLUMNS[0]} {after} ? OR ({KEY_COLUMNS[0]} = ? AND {KEY_COLUMNS[1]} {after} ?))"
+        if seek_kind == 'key': return key
+
+        column = f"{MEASURES[query.sort]}.{query.sort}"
+        if query.descending:
+            if seek_kind == 'null': return f"({column} IS NULL AND {key})"
+            return f"({column} < ? OR {column} IS NULL OR ({column} = ? AND {key}))"
+        if seek_kind == 'null': return f"({column} IS NOT NULL OR ({column} IS NULL AND {key}))"
+        return f"({column} > ? OR ({column} = ? AND {key}))"
+
+# Instância global
+measurements_model = MeasurementsModel()
@@ -1,4 +1,7 @@
 from src.models.base_model import BaseModel
+from src.models.filters import Condition, Field
+from src.models.relationships import Relationship
+from src.models.especies import especie_resumo
 from src.database.connection import db_connection
 import logging
 
@@ -13,15 +16,12 @@ class OcorrenciasModel(BaseModel):
     
     def get_fields(self): return ["EspecieID", "BiomaID", "Frequencia"]
     
-    def to_dict(self, row):
-        """Converte linha do banco para dicionário"""
-        if not row: return None
-        
+    def get_field_specs(self):
         return {
-            'OcorrenciaID': row[0],
-            'EspecieID': row[1],
-            'BiomaID': row[2],
-            'Frequencia': row[3]
+            'OcorrenciaID': Field(int, indexed=True),
+            'EspecieID': Field(int, indexed=True),
+            'BiomaID': Field(int, indexed=True),
+            'Frequencia': Field(str)
         }
     
     def from_dict(self, data):
@@ -37,86 +37,45 @@ class OcorrenciasModel(BaseModel):
         
         return result
     
-    def add_relationships(self, item):
-        """Adiciona relacionamentos da ocorrência"""
-        try:
-            with db_connection.get_cursor() as (cursor, connection):
-                # Buscar dados da espécie
-                cursor.execute("""
-                    SELECT EspecieID, NomeCientifico, NomePopular, Familia
-                    FROM Especies WHERE EspecieID = ?
-                """, [item['EspecieID']])
-                
-                especie_row = cursor.fetchone()
-                if especie_row:
-                    item['especie'] = {
-                        'EspecieID': especie_row[0],
-                        'NomeCientifico': especie_row[1],
-                        'NomePopular': especie_row[2],
-                        'Familia': especie_row[3]
-                    }
-                
-                # Buscar dados do bioma
-                cursor.execute("""
+    def get_relationships(self):
+        """Relacionamentos da ocorrência, carregados em lote para todos os itens da página"""
+        return [
+            especie_resumo(),
+            Relationship(
+                'bioma',
+                """
                     SELECT BiomaID, Nome, Descricao, Regiao
-                    FROM Biomas WHERE BiomaID = ?
-                """, [item['BiomaID']])
-                
-                bioma_row = cursor.fetchone()
-                if bioma_row:
-                    item['bioma'] = {
-                        'BiomaID': bioma_row[0],
-                        'Nome': bioma_row[1],
-                        'Descricao': bioma_row[2],
-                        'Regiao': bioma_row[3]
-                    }
-                
-                return item
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar relacionamentos da ocorrência {item['OcorrenciaID']}: {e}")
-            return item
+                    FROM Biomas
+                """,
+                foreign_key='BiomaID', local_key='BiomaID', many=False
+            )
+        ]
     
-    def get_by_especie(self, especie_id):
-        """Busca ocorrências por espécie"""
-        try:
-            query = "SELECT * FROM Ocorrencias WHERE EspecieID = ?"
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [especie_id])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar ocorrências por espécie {especie_id}: {e}")
-            raise
+    # Condições das rotas auxiliares, paginadas por get_all(condition=...)
     
-    def get_by_bioma(self, bioma_id):
-        """Busca ocorrências por bioma"""
-        try:
-            query = "SELECT * FROM Ocorrencias WHERE BiomaID = ?"
-            
-            with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [bioma_id])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
-                
-        except Exception as e:
-            logger.error(f"Erro ao buscar ocorrências por bioma {bioma_id}: {e}")
-            raise
+    def by_especie(self, especie_id):
+        """Ocorrências da espécie"""
+        return Condition.equals('EspecieID', especie_id)
     
-    def get_by_frequencia(self, frequencia):
-        """Busca ocorrências por frequência"""
+    def by_bioma(self, bioma_id):
+        """Ocorrências no bioma"""
+        return Condition.equals('BiomaID', bioma_id)
+    
+    def by_frequencia(self, frequencia):
+        """Ocorrências com a frequência (trecho do texto)"""
+        return Condition.contains(('Frequencia',), frequencia)
+
+    def count_by_especie(self):
+        """Retorna {EspecieID: número de ocorrências} (em quantos biomas cada espécie aparece)"""
         try:
-            query = "SELECT * FROM Ocorrencias WHERE Frequencia LIKE ?"
+            query = "SELECT EspecieID, COUNT(*) FROM Ocorrencias GROUP BY EspecieID"
             
             with db_connection.get_cursor() as (cursor, connection):
-                cursor.execute(query, [f"%{frequencia}%"])
-                rows = cursor.fetchall()
-                return [self.to_dict(row) for row in rows]
+                cursor.execute(query)
+                return {row[0]: row[1] for row in cursor.fetchall()}
                 
         except Exception as e:
-            logger.error(f"Erro ao buscar ocorrências por frequência '{frequencia}': {e}")
+            logger.error(f"Erro ao contar ocorrências por espécie: {e}")
             raise
 
 # Instância global do modelo
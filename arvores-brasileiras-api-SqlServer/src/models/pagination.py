@@ -0,0 +1,37 @@
+import base64
+import binascii
+import json
+
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'false'
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+
+class InvalidParameter(ValueError):
+    """Parâmetro de consulta inválido informado pelo cliente (HTTP 400)"""
+
+def encode_cursor(sort_field, sort_value, pk_value):
+    """Gera o token opaco que aponta para a posição após o último registro da página"""
+    payload = json.dumps([sort_field, sort_value, pk_value], separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token, sort_field):
+    """Decodifica o token de cursor, validando que ele pertence à ordenação atual"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        field, sort_value, pk_value = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, binascii.Error):
+        raise InvalidParameter("Cursor inválido")
+
+    if field != sort_field:
+        raise InvalidParameter("Cursor gerado para outra ordenação")
+    return sort_value, pk_value
+
+def parse_count_mode(value, default):
+    """Normaliza o parâmetro ?count= (exact, estimate ou false)"""
+    if value is None or value == '': return default
+    value = value.lower()
+    if value in ('true', COUNT_EXACT): return COUNT_EXACT
+    if value in ('none', '0', COUNT_NONE): return COUNT_NONE
+    if value == COUNT_ESTIMATE: return COUNT_ESTIMATE
+    raise InvalidParameter(f"Valor inválido para count: {value} (use {', '.join(COUNT_MODES)})")
@@ -0,0 +1,72 @@
+from src.models.pagination import InvalidParameter
+
+def field_list(value):
+    """Campos de `?fields=a,b` (texto separado por vírgulas ou lista); vazio = nenhum"""
+    if value is None: return []
+    names = value.split(',') if isinstance(value, str) else value
+    return [name.strip() for name in names if name and name.strip()]
+
+class Projection:
+    """Campos pedidos com ?fields= (e fields[relacionamento]=...), já validados
+
+    `columns` são as colunas devolvidas, na ordem do modelo e sempre com a chave
+    primária (None = todas); `relationship_fields` mapeia relacionamento -> campos
+    pedidos; `relationship_names` são os relacionamentos citados em `fields`.
+    """
+    __slots__ = ('columns', 'relationship_fields', 'relationship_names')
+
+    def __init__(self, columns=None, relationship_fields=None, relationship_names=()):
+        self.columns = columns
+        self.relationship_fields = relationship_fields or {}
+        self.relationship_names = frozenset(relationship_names)
+
+    def includes(self, relationship):
+        """Com `fields` informado, só os relacionamentos citados (em fields ou fields[nome]) são carregados"""
+        return self.columns is None or relationship in self.relationship_names or relationship in self.relationship_fields
+
+    def query_columns(self, all_columns, *extra):
+        """Colunas a selecionar: as pedidas e as necessárias internamente (ordenação, chaves de ligação)"""
+        if self.columns is None: return None
+        needed = set(self.columns).union(extra)
+        return tuple(column for column in all_columns if column in needed)
+
+    def apply(self, items, relationships=()):
+        """Remove dos itens as colunas que só foram buscadas para uso interno"""
+        if self.columns is None: return items
+        keep = self.columns + tuple(relationships)
+        return [{name: item[name] for name in keep if name in item} for item in items]
+
+def resolve_projection(model, fields=None, relationship_fields=None):
+    """Valida os campos pedidos contra `get_fields()` e os relacionamentos do modelo
+
+    Retorna None quando nada foi pedido (todas as colunas, caminho sem recorte).
+    """
+    requested = field_list(fields)
+    nested = {name: field_list(value) for name, value in (relationship_fields or {}).items()}
+    if not requested and not nested: return None
+
+    relationships = {relationship.name: relationship for relationship in model.relationships}
+    allowed = list(model.columns) + list(relationships)
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise InvalidParameter(f"Campo(s) inválido(s) em fields: {', '.join(unknown)} (use {', '.join(allowed)})")
+
+    for name, names in nested.items():
+        relationship = relationships.get(name)
+        if relationship is None:
+            options = ', '.join(relationships) or 'nenhum relacionamento disponível'
+            raise InvalidParameter(f"Relacionamento inválido em fields[{name}] (use {options})")
+        unknown = [field for field in names if field not in relationship.fields]
+        if unknown:
+            raise InvalidParameter(
+                f"Campo(s) inválido(s) em fields[{name}]: {', '.join(unknown)} (use {', '.join(relationship.fields)})"
+            )
+
+    columns = None
+    if requested:
+        columns = tuple(column for column in model.columns if column == model.primary_key or column in requested)
+    return Projection(
+        columns,
+        {name: tuple(names) for name, names in nested.items() if names},
+        [name for name in requested if name in relationships]
+    )
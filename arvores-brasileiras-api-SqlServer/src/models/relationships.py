@@ -0,0 +1,140 @@
+from src.database.connection import db_connection
+from src.database.executor import db_executor, parallel_queries
+from src.models.statements import StatementCache, in_bucket, padded, placeholders
+from src.models.rows import RowMapper
+from functools import partial
+from itertools import islice
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# SQL Server aceita no máximo 2100 parâmetros por comando
+IN_CHUNK_SIZE = 1000
+
+class Relationship:
+    """Declaração de um relacionamento carregado em lote
+
+    `query` é um SELECT sem cláusula WHERE; o carregador acrescenta
+    `WHERE <foreign_key> IN (...)` com as chaves de todos os itens da página.
+    Sem `to_dict`, cada linha vira um dicionário pelos nomes das colunas do
+    SELECT (e `fields=` do filho é aplicado na própria lista de colunas); com
+    `to_dict` (ex.: objetos aninhados), `fields` declara as chaves produzidas.
+    Cada filho é associado ao item cujo `local_key` é igual ao valor `key` do filho.
+    """
+    __slots__ = (
+        'name', 'query', 'foreign_key', 'local_key', 'key', 'to_dict', 'many', 'tables',
+        'select_items', 'source', 'fields', 'row_mapper'
+    )
+
+    def __init__(self, name, query, foreign_key, local_key, to_dict=None, key=None, many=True, fields=None):
+        self.name = name
+        self.query = query
+        self.foreign_key = foreign_key
+        self.local_key = local_key
+        self.key = key or local_key
+        self.to_dict = to_dict
+        self.many = many
+        # Tabelas lidas pela consulta (usadas na invalidação de cache)
+        self.tables = tuple(dict.fromkeys(re.findall(r'\b(?:FROM|JOIN)\s+(\w+)', query, re.IGNORECASE)))
+        # Colunas do SELECT como (nome no dicionário, expressão SQL) e o restante da consulta (FROM ...)
+        self.select_items, self.source = split_select(query)
+        self.fields = tuple(fields) if fields else tuple(name for name, expression in self.select_items)
+        self.row_mapper = RowMapper({})
+
+    def columns_for(self, fields):
+        """Colunas do SELECT para os campos pedidos (sempre com a chave de ligação); None = todas"""
+        if fields is None or self.to_dict is not None: return None
+        return tuple(name for name, expression in self.select_items if name in fields or name == self.key)
+
+    def select(self, columns):
+        if columns is None: return self.query
+        expressions = ', '.join(expression for name, expression in self.select_items if name in columns)
+        return f"SELECT {expressions} {self.source}"
+
+    def convert(self, cursor, rows):
+        if self.to_dict is not None: return [self.to_dict(row) for row in rows]
+        return self.row_mapper.convert_all(cursor.description, rows)
+
+def split_select(query):
+    """Separa `SELECT a, b AS c FROM ...` em ([(nome, expressão)...], 'FROM ...')"""
+    match = re.match(r'\s*SELECT\s+(.+?)\s+(FROM\s.+)$', query, re.IGNORECASE | re.DOTALL)
+    items = []
+    for expression in match.group(1).split(','):
+        expression = ' '.join(expression.split())
+        alias = re.search(r'\s+AS\s+(\w+)$', expression, re.IGNORECASE)
+        items.append((alias.group(1) if alias else expression.rsplit('.', 1)[-1], expression))
+    return items, match.group(2).strip()
+
+def chunked(values, size=IN_CHUNK_SIZE):
+    """Divide uma sequência (ou iterável, consumido sob demanda) em blocos de no máximo `size` elementos"""
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk: return
+        yield chunk
+
+# Textos das consultas de relacionamento, por consulta e tamanho (bucket) da lista IN
+relationship_statements = StatementCache('relationships')
+
+def fetch_grouped(cursor, relationship, keys, fields=None):
+    """Busca os filhos de todas as chaves e os agrupa pela chave do item pai
+
+    `fields` limita os campos de cada filho (a chave de ligação é sempre mantida).
+    """
+    columns = relationship.columns_for(fields)
+    # Sem lista de colunas no SQL (to_dict próprio) os campos são recortados após a conversão
+    keep = None if fields is None or columns is not None else set(fields) | {relationship.key}
+    grouped = {}
+    for chunk in chunked(keys):
+        size = in_bucket(len(chunk))
+        query = relationship_statements.get(
+            ('relationship', relationship.query, relationship.foreign_key, size, columns),
+            lambda: f"{relationship.select(columns)} WHERE {relationship.foreign_key} IN ({placeholders(size)})"
+        )
+        cursor.execute(query, padded(chunk))
+        for child in relationship.convert(cursor, cursor.fetchall()):
+            if keep is not None: child = {name: value for name, value in child.items() if name in keep}
+            grouped.setdefault(child[relationship.key], []).append(child)
+    return grouped
+
+def load_relationships(items, relationships, fields=None):
+    """Preenche os relacionamentos de uma lista de itens com uma consulta por relacionamento
+
+    `fields` mapeia nome do relacionamento -> campos pedidos (ausente = todos).
+    Com consultas paralelas ativas (caminho assíncrono), cada relacionamento é buscado
+    ao mesmo tempo em sua própria conexão; caso contrário, em sequência na mesma conexão.
+    """
+    if not items or not relationships: return items
+    fields = fields or {}
+
+    keys = [
+        list(dict.fromkeys(item[relationship.local_key] for item in items if item.get(relationship.local_key) is not None))
+        for relationship in relationships
+    ]
+
+    if parallel_queries.get() and len(relationships) > 1:
+        def fetch(relationship, relationship_keys):
+            if not relationship_keys: return {}
+            with db_connection.get_cursor() as (cursor, connection):
+                return fetch_grouped(cursor, relationship, relationship_keys, fields.get(relationship.name))
+
+        groups = db_executor.fan_out(
+            partial(fetch, relationship, relationship_keys) for relationship, relationship_keys in zip(relationships, keys)
+        )
+    else:
+        with db_connection.get_cursor() as (cursor, connection):
+            groups = [
+                fetch_grouped(cursor, relationship, relationship_keys, fields.get(relationship.name)) if relationship_keys else {}
+                for relationship, relationship_keys in zip(relationships, keys)
+            ]
+
+    for relationship, grouped in zip(relationships, groups):
+        for item in items:
+            children = grouped.get(item.get(relationship.local_key), [])
+            if relationship.many:
+                item[relationship.name] = [dict(child) for child in children]
+            elif children:
+                item[relationship.name] = dict(children[0])
+
+    return items
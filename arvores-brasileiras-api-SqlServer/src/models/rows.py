@@ -0,0 +1,74 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Conversão de cada tipo do banco para um valor serializável em JSON; {0} é a variável da coluna
+CONVERSIONS = {
+    Decimal: "(None if {0} is None else _float({0}))",
+    datetime: "(None if {0} is None else {0}.isoformat())",
+    date: "(None if {0} is None else {0}.isoformat())",
+    time: "(None if {0} is None else {0}.isoformat())"
+}
+
+def compile_converter(names, types):
+    """Gera as funções (convert, convert_all) que transformam linhas em dicionários
+
+    A linha é desempacotada em variáveis locais e o corpo é um literal de dicionário
+    com a conversão de cada coluna escrita em linha (sem chamadas por campo);
+    `convert_all` converte uma lista inteira em uma única compreensão.
+    """
+    variables = [f"c{index}" for index in range(len(names))]
+    items = []
+    for name, type_, variable in zip(names, types, variables):
+        conversion = CONVERSIONS.get(type_)
+        items.append(f"{name!r}: {conversion.format(variable) if conversion else variable}")
+    literal = '{' + ', '.join(items) + '}'
+    target = ', '.join(variables) + (',' if len(variables) == 1 else '')
+
+    source = (
+        f"def convert(row):\n    {target} = row\n    return {literal}\n"
+        f"def convert_all(rows):\n    return [{literal} for {target} in rows]\n"
+    )
+    namespace = {'_float': float}
+    exec(compile(source, f"<conversor de linhas {', '.join(names)}>", 'exec'), namespace)
+    return namespace['convert'], namespace['convert_all']
+
+class RowMapper:
+    """Conversores de linha para dicionário, compilados uma vez por forma de resultado
+
+    A forma é a sequência de nomes de colunas de `cursor.description`. O tipo de cada
+    coluna vem da descrição do cursor (o pyodbc informa o tipo Python) e, quando ela
+    não informa, dos metadados `Field` do modelo.
+    """
+
+    def __init__(self, field_specs):
+        self.field_specs = field_specs
+        self._converters = {}
+        self._lock = threading.Lock()
+
+    def _compiled(self, description):
+        names = tuple(column[0] for column in description)
+        compiled = self._converters.get(names)
+        if compiled is None:
+            types = []
+            for column in description:
+                type_ = column[1] if isinstance(column[1], type) else None
+                spec = self.field_specs.get(column[0])
+                types.append(type_ if type_ in CONVERSIONS or spec is None else spec.type)
+            compiled = compile_converter(names, types)
+            with self._lock: self._converters[names] = compiled
+        return compiled
+
+    def converter(self, description):
+        """Função que converte uma linha com esta descrição"""
+        return self._compiled(description)[0]
+
+    def convert_all(self, description, rows):
+        """Converte todas as linhas de um resultado"""
+        return self._compiled(description)[1](rows)
+
+    def cache_size(self):
+        return len(self._converters)
@@ -0,0 +1,279 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from itertools import islice
+from src.database.versions import table_versions
+from src.models.filters import comparable
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+def sort_key(value):
+    """Chave de ordenação do ORDER BY: NULL primeiro, texto por ponto de código
+
+    Só coincide com o banco em texto quando `Dialect.orders_text_by_code_point` (SQLite);
+    nos demais, ordenações por campos de texto não são atendidas pela réplica.
+    """
+    if value is None: return (0, '')
+    if isinstance(value, str): return (1, value)
+    return (1, comparable(value))
+
+class TableSnapshot:
+    """Cópia em memória de uma tabela, com os registros já convertidos por `to_dict`
+
+    Cada registro é guardado como tupla de valores (as colunas são compartilhadas),
+    indexado pela chave primária e pelas chaves estrangeiras inteiras indexadas do
+    modelo. Ordenações por outros campos são calculadas sob demanda e reaproveitadas
+    até a próxima alteração.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.primary_key = model.primary_key
+        self.foreign_keys = [
+            name for name, spec in model.field_specs.items()
+            if spec.indexed and spec.type is int and name != model.primary_key
+        ]
+        self.columns = ()
+        self.rows = {}       # pk -> tupla de valores na ordem de `columns`
+        self.keys = []       # pks em ordem crescente
+        self.foreign = {}    # campo -> valor -> pks em ordem crescente
+        self._orders = {}    # campo -> (chaves de ordenação, pks) ordenados por (campo, pk)
+        self._lock = threading.RLock()
+        # Serializa recargas e atualizações incrementais (uma recarga lenta não sobrescreve uma escrita)
+        self._refresh_lock = threading.Lock()
+        self.ready = False
+        self.loaded_at = None
+        self.loads = 0
+        self.updates = 0
+
+    # Manutenção
+
+    def load(self):
+        """Recarrega a tabela inteira; retorna os IDs alterados desde a carga anterior"""
+        with self._refresh_lock:
+            return self._load()
+
+    def _load(self):
+        columns, rows = self.columns, {}
+        for chunk in self.model.iter_rows():
+            for item in chunk:
+                if not columns: columns = tuple(item)
+                rows[item[self.primary_key]] = tuple(item.values())
+        # Tabela vazia na primeira carga: as colunas são as do SELECT do modelo
+        if not columns: columns = tuple(self.model.columns)
+
+        with self._lock:
+            changed = None
+            if self.ready:
+                previous = self.rows
+                changed = [pk for pk, values in rows.items() if previous.get(pk) != values]
+                changed.extend(pk for pk in previous if pk not in rows)
+
+            self.columns = columns
+            self.rows = rows
+            self.keys = sorted(rows)
+            self.foreign = {field: {} for field in self.foreign_keys}
+            for field in self.foreign_keys:
+                position = columns.index(field)
+                index = self.foreign[field]
+                for pk in self.keys:
+                    index.setdefault(rows[pk][position], []).append(pk)
+            self._orders = {}
+            self.ready = True
+            self.loaded_at = datetime.now()
+            self.loads += 1
+        return changed
+
+    def apply(self, ids=None):
+        """Atualiza os registros informados a partir do banco (todos, se `ids` for None)"""
+        if not self.ready: return
+        try:
+            with self._refresh_lock:
+                if ids is None:
+                    self._load()
+                    return
+
+                fresh = {record[self.primary_key]: record for record in self.model.get_many(ids)}
+                with self._lock:
+                    for pk in dict.fromkeys(ids):
+                        self._remove(pk)
+                        record = fresh.get(pk)
+                        if record is not None: self._insert(record)
+                    self._orders = {}
+                    self.updates += 1
+        except Exception as e:
+            # Sem a atualização a cópia ficaria desatualizada: volta a consultar o banco até a próxima recarga
+            logger.error(f"Erro ao atualizar snapshot da tabela {self.model.table_name}: {e}")
+            self.ready = False
+
+    def _remove(self, pk):
+        values = self.rows.pop(pk, None)
+        if values is None: return
+        del self.keys[bisect_left(self.keys, pk)]
+        for field in self.foreign_keys:
+            pks = self.foreign[field].get(values[self.columns.index(field)])
+            if pks: pks.remove(pk)
+
+    def _insert(self, record):
+        if not self.columns: self.columns = tuple(record)
+        pk = record[self.primary_key]
+        values = tuple(record.get(column) for column in self.columns)
+        self.rows[pk] = values
+        insort(self.keys, pk)
+        for field in self.foreign_keys:
+            insort(self.foreign[field].setdefault(values[self.columns.index(field)], []), pk)
+
+    # Consultas
+
+    def record(self, values):
+        return dict(zip(self.columns, values))
+
+    def get(self, pk):
+        with self._lock:
+            values = self.rows.get(pk)
+            return self.record(values) if values is not None else None
+
+    def _order(self, field):
+        """Chaves de ordenação e pks ordenados por (campo, pk)"""
+        if field == self.primary_key: return self.keys, self.keys
+
+        order = self._orders.get(field)
+        if order is None:
+            position = self.columns.index(field)
+            pairs = sorted((sort_key(values[position]), pk) for pk, values in self.rows.items())
+            order = self._orders[field] = (pairs, [pk for _, pk in pairs])
+        return order
+
+    def select(self, predicate=None, sort=None, seek=None, offset=0, limit=None, count=False, within=None):
+        """Registros filtrados e ordenados por (sort, pk)
+
+        `seek` = (valor de ordenação, pk) do último registro visto, como no cursor de
+        paginação. `within` = (campo, valor) restringe a busca aos registros do índice de
+        chave estrangeira. Retorna (registros, total de registros que satisfazem o filtro ou None).
+        """
+        sort = sort or self.primary_key
+        with self._lock:
+            keys, pks = self._subset(sort, within)
+
+            start = 0
+            if seek is not None:
+                sort_value, pk = seek
+                start = bisect_right(keys, pk if sort == self.primary_key else (sort_key(sort_value), pk))
+
+            if predicate is None:
+                # Sem filtro a página é um recorte direto da ordenação
+                stop = None if limit is None else start + offset + limit
+                items = [self.record(self.rows[pk]) for pk in pks[start + offset:stop]]
+                return items, len(pks) if count else None
+
+            items = []
+            for pk in islice(pks, start, None) if limit != 0 else ():
+                item = self.record(self.rows[pk])
+                if not predicate(item): continue
+                if offset:
+                    offset -= 1
+                    continue
+                items.append(item)
+                if limit is not None and len(items) >= limit: break
+
+            total = None
+            if count: total = sum(1 for pk in pks if predicate(self.record(self.rows[pk])))
+            return items, total
+
+    def _subset(self, sort, within):
+        """(chaves de ordenação, pks) da ordenação inteira ou só dos registros de `within`"""
+        index = self.foreign.get(within[0]) if within is not None else None
+        if index is None: return self._order(sort)
+
+        pks = index.get(within[1], [])
+        if sort == self.primary_key: return pks, pks
+        position = self.columns.index(sort)
+        pairs = sorted((sort_key(self.rows[pk][position]), pk) for pk in pks)
+        return pairs, [pk for _, pk in pairs]
+
+    def column_arrays(self, fields, predicate=None):
+        """Valores dos campos em listas paralelas (uma por campo, na ordem das pks), para agregações"""
+        with self._lock:
+            positions = [self.columns.index(field) for field in fields]
+            rows = [self.rows[pk] for pk in self.keys]
+            if predicate is not None: rows = [values for values in rows if predicate(self.record(values))]
+            return [[values[position] for values in rows] for position in positions]
+
+    def value_map(self, field):
+        """Valor de `field` por chave primária (dimensão de agrupamento vinda desta tabela)"""
+        with self._lock:
+            position = self.columns.index(field)
+            return {pk: values[position] for pk, values in self.rows.items()}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'rows': len(self.rows),
+                'loaded_at': self.loaded_at.isoformat() if self.loaded_at else None,
+                'loads': self.loads,
+                'incremental_updates': self.updates
+            }
+
+class SnapshotStore:
+    """Réplica em memória das tabelas de referência, recarregada periodicamente
+
+    Escritas feitas por este processo atualizam o snapshot na hora (via
+    `BaseModel.notify_write`, antes da invalidação do cache); escritas de outros
+    processos são percebidas na recarga periódica, que notifica `table_versions`
+    com os IDs alterados.
+    """
+
+    def __init__(self, enabled=False, interval=300.0):
+        self.enabled = enabled
+        self.interval = interval
+        self.snapshots = {}
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self, models):
+        """Cria e carrega o snapshot de cada modelo e inicia a recarga em segundo plano"""
+        for model in models:
+            if model.table_name not in self.snapshots:
+                model.snapshot = self.snapshots[model.table_name] = TableSnapshot(model)
+        self.refresh()
+        self.start_refresh()
+
+    def start_refresh(self):
+        """Inicia a recarga periódica em segundo plano (no processo atual)"""
+        if not self.snapshots or self.interval <= 0: return
+        if self._thread is not None and self._thread.is_alive(): return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='snapshot-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def refresh(self):
+        """Recarrega todas as tabelas; falhas mantêm a cópia anterior (ou a consulta ao banco)"""
+        for table, snapshot in self.snapshots.items():
+            try:
+                changed = snapshot.load()
+                if changed: table_versions.bump(table, changed)
+            except Exception as e:
+                logger.error(f"Erro ao carregar snapshot da tabela {table}: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'refresh_interval': self.interval,
+            'tables': {table: snapshot.stats() for table, snapshot in self.snapshots.items()}
+        }
+
+# Instância global da réplica em memória (desativada por padrão)
+snapshot_store = SnapshotStore(
+    enabled=os.environ.get('SNAPSHOT_ENABLED', 'false').lower() == 'true',
+    interval=float(os.environ.get('SNAPSHOT_REFRESH_INTERVAL', 300))
+)
@@ -0,0 +1,83 @@
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tamanhos de lista IN: listas são completadas até o próximo tamanho (repetindo o último
+# valor), para que poucas formas de comando cubram qualquer quantidade de IDs
+IN_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1000)
+
+def in_bucket(size):
+    """Menor tamanho de IN_BUCKETS que comporta `size` valores"""
+    for bucket in IN_BUCKETS:
+        if size <= bucket: return bucket
+    return size
+
+def padded(values):
+    """Completa a lista até o tamanho do seu bucket repetindo o último valor (IN ignora repetições)"""
+    values = list(values)
+    missing = in_bucket(len(values)) - len(values)
+    return values + values[-1:] * missing if values else values
+
+def placeholders(count):
+    return ', '.join('?' for _ in range(count))
+
+# Caches registrados, por nome (usados nas estatísticas e no pré-aquecimento)
+statement_caches = {}
+
+class StatementCache:
+    """Textos SQL compilados uma vez por forma de consulta
+
+    A chave descreve a forma (operação, conjunto de colunas, forma dos filtros,
+    tamanho da lista IN...) e o valor é o texto SQL parametrizado. Como o mesmo
+    texto é reutilizado byte a byte, o SQL Server reaproveita o plano em cache
+    em vez de compilar um plano ad hoc por variação de texto.
+    """
+
+    def __init__(self, name, max_entries=1024):
+        self.name = name
+        self.max_entries = max_entries
+        self._statements = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._uncached = 0
+        statement_caches[name] = self
+
+    def get(self, key, build):
+        """Texto SQL da forma `key`, construído por `build()` na primeira vez"""
+        statement = self._statements.get(key)
+        if statement is not None:
+            self._hits += 1
+            return statement
+
+        statement = build()
+        with self._lock:
+            self._misses += 1
+            # Formas além do limite não são guardadas (nunca crescem sem limite)
+            if len(self._statements) < self.max_entries: self._statements[key] = statement
+            else: self._uncached += 1
+        return statement
+
+    def clear(self):
+        with self._lock: self._statements.clear()
+
+    def stats(self):
+        with self._lock:
+            operations = {}
+            for key in self._statements:
+                operations[key[0]] = operations.get(key[0], 0) + 1
+            lookups = self._hits + self._misses
+            return {
+                'statements': len(self._statements),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else None,
+                'uncached': self._uncached,
+                'by_operation': operations
+            }
+
+def statement_stats():
+    """Estatísticas de todos os caches de comandos"""
+    return {name: cache.stats() for name, cache in statement_caches.items()}
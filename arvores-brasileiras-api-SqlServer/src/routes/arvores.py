@@ -1,94 +1,73 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, request, jsonify
+from src.models.arvores import arvores_completas_model
+from src.models.measurements import MeasurementQuery, measurements_model
+from src.models.pagination import InvalidParameter
 from src.database.connection import db_connection
-import pyodbc
+from src.cache import response_cache
+import logging
+
+logger = logging.getLogger(__name__)
 
 arvores_bp = Blueprint('arvores', __name__)
 
 @arvores_bp.route('/arvores-completa/<int:especie_id>', methods=['GET'])
+@response_cache.cached(arvores_completas_model)
 def get_arvores_completa(especie_id: int) -> tuple:
-    try:   
-        query = """
-        SELECT 
-            e.EspecieID,
-            e.NomeCientifico,
-            e.NomePopular,
-            e.Familia,
-            e.Descricao AS DescricaoEspecie,
-            e.DataCadastro,
-            b.BiomaID,
-            b.Nome AS NomeBioma,
-            b.Descricao AS DescricaoBioma,
-            b.Regiao,
-            o.OcorrenciaID,
-            o.Frequencia,
-            c.CaracteristicaID,
-            c.AlturaMedia,
-            c.DiametroMedio,
-            c.TipoFolha,
-            c.Floracao,
-            cu.CuriosidadeID,
-            cu.Texto AS TextoCuriosidade,
-            cu.Fonte,
-            d.DadosID,
-            d.TempoDeVidaEstimado,
-            d.CrescimentoAnual,
-            d.RaizProfundidadeMedia,
-            d.DensidadeMadeira
-        FROM 
-            Especies e
-            LEFT JOIN Ocorrencias o ON e.EspecieID = o.EspecieID
-            LEFT JOIN Biomas b ON o.BiomaID = b.BiomaID
-            LEFT JOIN Caracteristicas c ON e.EspecieID = c.EspecieID
-            LEFT JOIN Curiosidades cu ON e.EspecieID = cu.EspecieID
-            LEFT JOIN DadosArvore d ON e.EspecieID = d.EspecieID
-        WHERE 
-            e.EspecieID = ?
-        """
-        
-        with db_connection.get_cursor() as (cursor, conn):
-            cursor.execute(query, especie_id)
-            rows = cursor.fetchall()
+    """GET /api/arvores-completa/<id> - Documento completo de uma espécie com listas aninhadas"""
+    try:
+        # Documento servido do cache já codificado (Fragment), sem recodificar as listas aninhadas
+        arvore = arvores_completas_model.get_many_encoded([especie_id], current_app.json.encode).get(especie_id)
 
-        if not rows:
+        if not arvore:
             return jsonify({'message': f'Nenhuma árvore com id {especie_id} encontrada para a espécie informada.'}), 404
-        
-        resultados = []
-        for row in rows:
-            resultado = {
-                'EspecieID': row.EspecieID,
-                'NomeCientifico': row.NomeCientifico,
-                'NomePopular': row.NomePopular,
-                'Familia': row.Familia,
-                'DescricaoEspecie': row.DescricaoEspecie,
-                'DataCadastro': row.DataCadastro.isoformat() if row.DataCadastro else None,
-                'Biomas': {
-                    'BiomaID': row.BiomaID, 'NomeBioma': row.NomeBioma,
-                    'DescricaoBioma': row.DescricaoBioma, 'Regiao': row.Regiao, 'Frequencia': row.Frequencia
-                } if row.BiomaID else None,
-                'Caracteristicas': {
-                    'CaracteristicaID': row.CaracteristicaID,
-                    'AlturaMedia': float(row.AlturaMedia) if row.AlturaMedia else None,
-                    'DiametroMedio': float(row.DiametroMedio) if row.DiametroMedio else None,
-                    'TipoFolha': row.TipoFolha,
-                    'Floracao': row.Floracao
-                } if row.CaracteristicaID else None,
-                'Curiosidades': {
-                    'CuriosidadeID': row.CuriosidadeID, 'Texto': row.TextoCuriosidade, 'Fonte': row.Fonte
-                } if row.CuriosidadeID else None,
-                'DadosArvore': {
-                    'DadosID': row.DadosID,
-                    'TempoDeVidaEstimado': row.TempoDeVidaEstimado,
-                    'CrescimentoAnual': float(row.CrescimentoAnual) if row.CrescimentoAnual else None,
-                    'RaizProfundidadeMedia': float(row.RaizProfundidadeMedia) if row.RaizProfundidadeMedia else None,
-                    'DensidadeMadeira': float(row.DensidadeMadeira) if row.DensidadeMadeira else None
-                } if row.DadosID else None
-            }
-            resultados.append(resultado)
 
-        return jsonify({'tree': resultados}), 200
+        return jsonify({'tree': arvore}), 200
+
+    except db_connection.dialect.Error as e:
+        logger.error(f"Erro de banco ao buscar a árvore completa {especie_id}: {e}")
+        return jsonify({'error': 'Erro ao acessar o banco de dados', 'details': str(e)}), 500
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@arvores_bp.route('/arvores-completa', methods=['GET'])
+@response_cache.cached(arvores_completas_model)
+def get_arvores_completas() -> tuple:
+    """GET /api/arvores-completa?ids=1,2,3 - Documentos completos de várias espécies em uma requisição"""
+    try:
+        try:
+            especie_ids = [int(value) for value in request.args.get('ids', '').split(',') if value.strip()]
+        except ValueError:
+            return jsonify({'error': 'Parâmetro ids deve ser uma lista de inteiros separados por vírgula'}), 400
+
+        if not especie_ids: return jsonify({'error': 'Parâmetro ids é obrigatório'}), 400
+        if len(especie_ids) > arvores_completas_model.MAX_IDS:
+            return jsonify({'error': f'Máximo de {arvores_completas_model.MAX_IDS} ids por requisição'}), 400
+
+        arvores = arvores_completas_model.get_many_encoded(especie_ids, current_app.json.encode)
+
+        return jsonify({
+            'trees': list(arvores.values()),
+            'not_found': [especie_id for especie_id in dict.fromkeys(especie_ids) if especie_id not in arvores]
+        }), 200
+
+    except db_connection.dialect.Error as e:
+        logger.error(f"Erro de banco ao buscar árvores completas {especie_ids}: {e}")
+        return jsonify({'error': 'Erro ao acessar o banco de dados', 'details': str(e)}), 500
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@arvores_bp.route('/arvores/query', methods=['GET'])
+@response_cache.cached(measurements_model)
+def query_arvores() -> tuple:
+    """GET /api/arvores/query?AlturaMedia__gte=10&TempoDeVidaEstimado__lt=200 - Medidas por faixas combinadas"""
+    try:
+        query = MeasurementQuery.parse(request.args)
+        return jsonify(measurements_model.query(query)), 200
 
-    except pyodbc.Error as e:
-        print(f'[ERRO PYODBC]: {e}')
+    except InvalidParameter as e:
+        return jsonify({'error': str(e)}), 400
+    except db_connection.dialect.Error as e:
+        logger.error(f"Erro de banco na consulta por medidas: {e}")
         return jsonify({'error': 'Erro ao acessar o banco de dados', 'details': str(e)}), 500
     except Exception as e:
         return jsonify({'error': str(e)}), 500
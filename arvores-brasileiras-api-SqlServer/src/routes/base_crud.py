@@ -1,15 +1,115 @@
-from flask import request, jsonify
+from flask import Response, current_app, request, jsonify, stream_with_context
+from functools import wraps
+from src.cache import response_cache
+from src.models.pagination import COUNT_NONE, InvalidParameter
+from urllib.parse import urlencode
 import traceback
+import csv
+import io
+import os
+import re
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Registros por página nas rotas auxiliares (padrão e máximo): nenhuma resposta paginada passa disso
+AUXILIARY_MAX_PER_PAGE = int(os.environ.get('AUXILIARY_MAX_PER_PAGE', 1000))
+
+def cached_view(method):
+    """Serve o método GET pelo cache de respostas, dependente das tabelas do modelo"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return response_cache.serve(self.model.cache_tables, lambda: method(self, *args, **kwargs))
+    return wrapper
+
+# Campos por relacionamento: fields[relacionamento]=a,b
+RELATIONSHIP_FIELDS_PARAM = re.compile(r'fields\[(\w+)\]')
+
+def requested_projection(model):
+    """Projection de ?fields= e fields[relacionamento]= da requisição atual (None = todos os campos)"""
+    nested = {}
+    for key, value in request.args.items():
+        match = RELATIONSHIP_FIELDS_PARAM.fullmatch(key)
+        if match: nested[match.group(1)] = value
+    return model.resolve_fields(request.args.get('fields'), nested)
+
+def page_url(**changes):
+    """URL da requisição atual com os parâmetros de query alterados"""
+    args = request.args.copy()
+    for key, value in changes.items(): args[key] = value
+    return request.base_url + '?' + urlencode(list(args.items(multi=True)))
+
+def pagination_headers(response, pagination):
+    """Link (next/prev), X-Next-Cursor e X-Total-Count a partir da paginação de `get_all`"""
+    links = []
+    if 'next_cursor' in pagination:
+        if pagination['next_cursor']:
+            response.headers['X-Next-Cursor'] = pagination['next_cursor']
+            links.append((page_url(after=pagination['next_cursor']), 'next'))
+    else:
+        if pagination['has_next']: links.append((page_url(page=pagination['page'] + 1), 'next'))
+        if pagination['has_prev']: links.append((page_url(page=pagination['page'] - 1), 'prev'))
+    
+    if pagination['total'] is not None: response.headers['X-Total-Count'] = str(pagination['total'])
+    if links: response.headers['Link'] = ', '.join(f'<{url}>; rel="{rel}"' for url, rel in links)
+
+def list_response(model, condition, relationships=True):
+    """Resposta das rotas auxiliares de listagem: registros de `condition` (Condition do modelo)
+
+    O corpo é a lista de registros de uma página, com page/per_page ou after (cursor) e sort,
+    como nas listagens; per_page vai até AUXILIARY_MAX_PER_PAGE, que também é o padrão. A
+    paginação vai nos cabeçalhos (Link, X-Next-Cursor e, com ?count=exact, X-Total-Count).
+    Aceita ?fields= e (se `relationships`) include_relationships; com ?format= (ndjson, json
+    ou csv) o resultado inteiro é enviado em streaming, lido do banco em blocos.
+    """
+    try:
+        export_format = request.args.get('format')
+        if export_format is not None: return BaseCRUD(model).stream_rows(export_format, condition=condition)
+        
+        result = model.get_all(
+            page=request.args.get('page', 1, type=int),
+            per_page=min(request.args.get('per_page', AUXILIARY_MAX_PER_PAGE, type=int), AUXILIARY_MAX_PER_PAGE),
+            include_relationships=relationships and request.args.get('include_relationships', 'false').lower() == 'true',
+            after=request.args.get('after'),
+            count=request.args.get('count') or COUNT_NONE,
+            sort=request.args.get('sort'),
+            projection=requested_projection(model),
+            condition=condition
+        )
+        
+        response = jsonify(result['data'])
+        pagination_headers(response, result['pagination'])
+        return response, 200
+        
+    except InvalidParameter as e: return jsonify({'error': str(e)}), 400
+    except Exception as e: return jsonify({'error': str(e)}), 500
+
 class BaseCRUD:
     """Classe base para operações CRUD usando pyodbc"""
     
+    # Parâmetros de query que não são tratados como filtros
+    RESERVED_PARAMS = ('page', 'per_page', 'include_relationships', 'after', 'count', 'sort', 'format', 'fields')
+    
+    # Formatos aceitos em /export: formato -> (mimetype, extensão do arquivo)
+    EXPORT_FORMATS = {
+        'ndjson': ('application/x-ndjson', 'ndjson'),
+        'json': ('application/json', 'json'),
+        'csv': ('text/csv', 'csv')
+    }
+    
+    # Registros lidos do banco por vez durante a exportação
+    EXPORT_CHUNK_SIZE = 1000
+    
+    # Registros por lote nas operações /bulk (cada lote vira poucos comandos no banco)
+    BULK_BATCH_SIZE = 500
+    
+    # Tipos de conteúdo aceitos como NDJSON (um objeto JSON por linha)
+    NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl', 'application/json-seq')
+    
     def __init__(self, model):
         self.model = model
     
+    @cached_view
     def get_all(self):
         """GET - Retorna todos os registros com paginação e filtros"""
         try:
@@ -17,25 +117,36 @@ class BaseCRUD:
             page = request.args.get('page', 1, type=int)
             per_page = min(request.args.get('per_page', 100, type=int), 1000)
             
+            # Paginação por cursor (?after=<token>, vazio na primeira página), ordenação e modo de contagem
+            after = request.args.get('after')
+            count = request.args.get('count')
+            sort = request.args.get('sort')
+            
             # Parâmetro de relacionamentos
             include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
             
+            # Campos pedidos (?fields=, fields[relacionamento]=), levados até a lista do SELECT
+            projection = requested_projection(self.model)
+            
             # Filtros dinâmicos
-            filters = {}
-            for key, value in request.args.items():
-                if key not in ['page', 'per_page', 'include_relationships']:
-                    filters[key] = value
+            filters = self._filters()
             
             # Buscar dados usando o modelo
             result = self.model.get_all(
                 page=page,
                 per_page=per_page,
                 filters=filters if filters else None,
-                include_relationships=include_relationships
+                include_relationships=include_relationships,
+                after=after,
+                count=count,
+                sort=sort,
+                projection=projection
             )
             
             return jsonify(result), 200
             
+        except InvalidParameter as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             logger.error(f"Erro ao buscar registros: {e}")
             return jsonify({
@@ -43,18 +154,100 @@ class BaseCRUD:
                 'traceback': traceback.format_exc()
             }), 500
     
+    @cached_view
+    def export(self):
+        """GET - Exporta a tabela inteira (com filtros opcionais) como ndjson, json ou csv
+        
+        A resposta é gerada em streaming: os registros são lidos em blocos e enviados
+        conforme chegam, sem montar o resultado completo em memória.
+        """
+        try:
+            return self.stream_rows(request.args.get('format', 'ndjson'), self._filters() or None)
+            
+        except InvalidParameter as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            logger.error(f"Erro ao exportar registros: {e}")
+            return jsonify({
+                'error': str(e),
+                'traceback': traceback.format_exc()
+            }), 500
+    
+    def stream_rows(self, export_format, filters=None, condition=None):
+        """Resposta em streaming (ndjson, json ou csv) com os registros dos filtros e da condição"""
+        export_format = export_format.lower()
+        if export_format not in self.EXPORT_FORMATS:
+            raise InvalidParameter(f"Formato '{export_format}' não suportado (use {', '.join(self.EXPORT_FORMATS)})")
+        
+        projection = requested_projection(self.model)
+        columns = self.model.query_columns(projection)
+        
+        # Filtros e campos inválidos são rejeitados aqui, antes do início do streaming
+        chunks = self.model.iter_rows(filters, chunk_size=self.EXPORT_CHUNK_SIZE, columns=columns, condition=condition)
+        
+        writer = getattr(self, f"_export_{export_format}")
+        mimetype, extension = self.EXPORT_FORMATS[export_format]
+        
+        response = Response(stream_with_context(writer(chunks, columns)), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename="{self.model.table_name.lower()}.{extension}"'
+        return response
+    
+    def _filters(self):
+        """Filtros dinâmicos: parâmetros da query que não são reservados nem fields[...]"""
+        return {
+            key: value for key, value in request.args.items()
+            if key not in self.RESERVED_PARAMS and not RELATIONSHIP_FIELDS_PARAM.fullmatch(key)
+        }
+    
+    @staticmethod
+    def _export_ndjson(chunks, columns=None):
+        dumps = current_app.json.dumps
+        for items in chunks:
+            yield ''.join(dumps(item) + '\n' for item in items)
+    
+    @staticmethod
+    def _export_json(chunks, columns=None):
+        dumps = current_app.json.dumps
+        separator = '['
+        for items in chunks:
+            if not items: continue
+            yield separator + ','.join(dumps(item) for item in items)
+            separator = ','
+        yield '[]' if separator == '[' else ']'
+    
+    def _export_csv(self, chunks, columns=None):
+        buffer = io.StringIO()
+        writer = None
+        for items in chunks:
+            if writer is None:
+                # Colunas na ordem do primeiro registro (a mesma de to_dict)
+                writer = csv.DictWriter(buffer, fieldnames=list(items[0].keys()), extrasaction='ignore')
+                writer.writeheader()
+            writer.writerows(items)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        
+        if writer is None:
+            csv.writer(buffer).writerow(columns or self.model.columns)
+            yield buffer.getvalue()
+    
+    @cached_view
     def get_by_id(self, record_id):
         """GET - Retorna um registro específico por ID"""
         try:
             include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
+            projection = requested_projection(self.model)
             
-            record = self.model.get_by_id(record_id, include_relationships=include_relationships)
+            record = self.model.get_by_id(record_id, include_relationships=include_relationships, projection=projection)
             
             if not record:
                 return jsonify({'error': 'Registro não encontrado'}), 404
             
             return jsonify(record), 200
             
+        except InvalidParameter as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             logger.error(f"Erro ao buscar registro {record_id}: {e}")
             return jsonify({
@@ -137,6 +330,90 @@ class BaseCRUD:
                 'traceback': traceback.format_exc()
             }), 500
     
+    def bulk_create(self):
+        """POST /bulk - Cria vários registros em uma transação (array JSON ou NDJSON)
+        
+        `?return=records|ids|none` controla a resposta; `none` usa fast_executemany e é o
+        mais rápido para cargas grandes.
+        """
+        try:
+            result = self.model.create_many(
+                self._bulk_records(), batch_size=self.BULK_BATCH_SIZE,
+                returning=request.args.get('return', 'records')
+            )
+            return jsonify(result), 201
+            
+        except InvalidParameter as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            logger.error(f"Erro ao criar registros em lote: {e}")
+            return jsonify({
+                'error': str(e),
+                'traceback': traceback.format_exc()
+            }), 500
+    
+    def bulk_update(self):
+        """PATCH /bulk - Atualiza parcialmente vários registros (cada um com sua chave primária)"""
+        try:
+            result = self.model.update_many(
+                self._bulk_records(), batch_size=self.BULK_BATCH_SIZE,
+                returning=request.args.get('return', 'records')
+            )
+            return jsonify(result), 200
+            
+        except InvalidParameter as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            logger.error(f"Erro ao atualizar registros em lote: {e}")
+            return jsonify({
+                'error': str(e),
+                'traceback': traceback.format_exc()
+            }), 500
+    
+    def bulk_delete(self):
+        """DELETE /bulk - Remove vários registros por ID (?ids=1,2,3 ou corpo {"ids": [...]})"""
+        try:
+            if 'ids' in request.args:
+                try:
+                    record_ids = [int(value) for value in request.args['ids'].split(',') if value.strip()]
+                except ValueError:
+                    return jsonify({'error': 'Parâmetro ids deve ser uma lista de inteiros separados por vírgula'}), 400
+            else:
+                data = request.get_json(silent=True)
+                record_ids = data.get('ids') if isinstance(data, dict) else data
+                if not isinstance(record_ids, list) or not all(isinstance(value, int) for value in record_ids):
+                    return jsonify({'error': 'Informe os IDs como lista de inteiros em ?ids= ou {"ids": [...]}'}), 400
+            
+            if not record_ids: return jsonify({'error': 'Nenhum ID informado'}), 400
+            
+            return jsonify(self.model.delete_many(record_ids)), 200
+            
+        except Exception as e:
+            logger.error(f"Erro ao remover registros em lote: {e}")
+            return jsonify({
+                'error': str(e),
+                'traceback': traceback.format_exc()
+            }), 500
+    
+    def _bulk_records(self):
+        """Registros do corpo da requisição: array JSON ou NDJSON lido linha a linha"""
+        if request.mimetype in self.NDJSON_MIMETYPES:
+            return self._ndjson_records(request.stream)
+        
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            raise InvalidParameter('O corpo deve ser um array JSON de registros ou NDJSON (application/x-ndjson)')
+        return data
+    
+    @staticmethod
+    def _ndjson_records(stream):
+        for number, line in enumerate(stream, 1):
+            if not line.strip(): continue
+            try:
+                yield current_app.json.loads(line)
+            except ValueError:
+                raise InvalidParameter(f"Linha {number} do NDJSON não é um JSON válido")
+    
     def head(self, record_id=None):
         """HEAD - Retorna apenas os headers"""
         try:
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from src.models.biomas import biomas_model
-from src.routes.base_crud import BaseCRUD
+from src.routes.base_crud import BaseCRUD, list_response
+from src.cache import response_cache
 
 biomas_bp = Blueprint('biomas', __name__)
 biomas_crud = BaseCRUD(biomas_model)
@@ -29,26 +30,32 @@ def head_biomas() -> tuple: return biomas_crud.head()
 @biomas_bp.route('/biomas/<int:bioma_id>', methods=['HEAD'])
 def head_bioma(bioma_id: int) -> tuple: return biomas_crud.head(bioma_id)
 """HEAD /api/biomas/<id> - Verifica se um bioma existe"""
+@biomas_bp.route('/biomas/export', methods=['GET'])
+def export_biomas() -> tuple: return biomas_crud.export()
+"""GET /api/biomas/export - Exporta todos os registros de biomas (ndjson, json ou csv)"""
+@biomas_bp.route('/biomas/bulk', methods=['POST'])
+def bulk_create_biomas() -> tuple: return biomas_crud.bulk_create()
+"""POST /api/biomas/bulk - Cria vários biomas em uma transação (array JSON ou NDJSON)"""
+@biomas_bp.route('/biomas/bulk', methods=['PATCH'])
+def bulk_update_biomas() -> tuple: return biomas_crud.bulk_update()
+"""PATCH /api/biomas/bulk - Atualiza parcialmente vários biomas por ID"""
+@biomas_bp.route('/biomas/bulk', methods=['DELETE'])
+def bulk_delete_biomas() -> tuple: return biomas_crud.bulk_delete()
+"""DELETE /api/biomas/bulk - Remove vários biomas por ID"""
 
 # Rotas auxiliares específicas para Biomas
 @biomas_bp.route('/biomas/regiao/<regiao>', methods=['GET'])
+@response_cache.cached(biomas_model)
 def get_biomas_by_regiao(regiao: str) -> tuple:
     """GET /api/biomas/regiao/<regiao> - Lista biomas por região"""
-    try:
-        biomas = biomas_model.get_by_regiao(regiao)
-        return jsonify(biomas), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    return list_response(biomas_model, biomas_model.by_regiao(regiao), relationships=False)
 
 @biomas_bp.route('/biomas/search', methods=['GET'])
+@response_cache.cached(biomas_model)
 def search_biomas() -> tuple:
     """GET /api/biomas/search - Busca biomas por nome"""
-    try:
-        nome = request.args.get('nome', '')
-        if not nome: return jsonify({'error': 'Parâmetro nome é obrigatório'}), 400
-        
-        biomas = biomas_model.search_by_name(nome)
-        return jsonify(biomas), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    nome = request.args.get('nome', '')
+    if not nome: return jsonify({'error': 'Parâmetro nome é obrigatório'}), 400
+    
+    return list_response(biomas_model, biomas_model.by_name(nome), relationships=False)
 
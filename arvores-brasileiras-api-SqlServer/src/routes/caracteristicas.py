@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from src.models.caracteristicas import caracteristicas_model
-from src.routes.base_crud import BaseCRUD
+from src.routes.base_crud import BaseCRUD, list_response
+from src.cache import response_cache
 
 caracteristicas_bp = Blueprint('caracteristicas', __name__)
 caracteristicas_crud = BaseCRUD(caracteristicas_model)
@@ -29,47 +30,38 @@ def head_caracteristicas() -> tuple: return caracteristicas_crud.head()
 @caracteristicas_bp.route('/caracteristicas/<int:caracteristica_id>', methods=['HEAD'])
 def head_caracteristica(caracteristica_id: int) -> tuple: return caracteristicas_crud.head(caracteristica_id)
 """HEAD /api/caracteristicas/<id> - Verifica se uma característica existe"""
+@caracteristicas_bp.route('/caracteristicas/export', methods=['GET'])
+def export_caracteristicas() -> tuple: return caracteristicas_crud.export()
+"""GET /api/caracteristicas/export - Exporta todos os registros de características (ndjson, json ou csv)"""
+@caracteristicas_bp.route('/caracteristicas/bulk', methods=['POST'])
+def bulk_create_caracteristicas() -> tuple: return caracteristicas_crud.bulk_create()
+"""POST /api/caracteristicas/bulk - Cria várias características em uma transação (array JSON ou NDJSON)"""
+@caracteristicas_bp.route('/caracteristicas/bulk', methods=['PATCH'])
+def bulk_update_caracteristicas() -> tuple: return caracteristicas_crud.bulk_update()
+"""PATCH /api/caracteristicas/bulk - Atualiza parcialmente várias características por ID"""
+@caracteristicas_bp.route('/caracteristicas/bulk', methods=['DELETE'])
+def bulk_delete_caracteristicas() -> tuple: return caracteristicas_crud.bulk_delete()
+"""DELETE /api/caracteristicas/bulk - Remove várias características por ID"""
     
 # Rotas auxiliares específicas para Caracteristicas
 @caracteristicas_bp.route('/caracteristicas/especie/<int:especie_id>', methods=['GET'])
+@response_cache.cached(caracteristicas_model)
 def get_caracteristicas_by_especie(especie_id: int) -> tuple:
     """GET /api/caracteristicas/especie/<especie_id> - Lista características por espécie"""
-    try:
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        caracteristicas = caracteristicas_model.get_by_especie(especie_id)
-        
-        if include_relationships: caracteristicas = [caracteristicas_model.add_relationships(item) for item in caracteristicas]
-        
-        return jsonify(caracteristicas), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    return list_response(caracteristicas_model, caracteristicas_model.by_especie(especie_id))
 
 @caracteristicas_bp.route('/caracteristicas/tipo-folha/<tipo_folha>', methods=['GET'])
+@response_cache.cached(caracteristicas_model)
 def get_caracteristicas_by_tipo_folha(tipo_folha: int) -> tuple:
     """GET /api/caracteristicas/tipo-folha/<tipo_folha> - Lista características por tipo de folha"""
-    try:
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        caracteristicas = caracteristicas_model.get_by_tipo_folha(tipo_folha)
-        
-        if include_relationships: caracteristicas = [caracteristicas_model.add_relationships(item) for item in caracteristicas]
-        
-        return jsonify(caracteristicas), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    return list_response(caracteristicas_model, caracteristicas_model.by_tipo_folha(tipo_folha))
 
 @caracteristicas_bp.route('/caracteristicas/altura-range', methods=['GET'])
+@response_cache.cached(caracteristicas_model)
 def get_caracteristicas_by_altura_range() -> tuple:
     """GET /api/caracteristicas/altura-range - Lista características por faixa de altura"""
-    try:
-        altura_min = request.args.get('min', type=float)
-        altura_max = request.args.get('max', type=float)
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        
-        caracteristicas = caracteristicas_model.get_by_altura_range(altura_min, altura_max)
-        
-        if include_relationships: caracteristicas = [caracteristicas_model.add_relationships(item) for item in caracteristicas]
-        
-        return jsonify(caracteristicas), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    altura_min = request.args.get('min', type=float)
+    altura_max = request.args.get('max', type=float)
+    
+    return list_response(caracteristicas_model, caracteristicas_model.by_altura_range(altura_min, altura_max))
 
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from src.models.curiosidades import curiosidades_model
-from src.routes.base_crud import BaseCRUD
+from src.routes.base_crud import BaseCRUD, list_response
+from src.cache import response_cache
 
 curiosidades_bp = Blueprint('curiosidades', __name__)
 curiosidades_crud = BaseCRUD(curiosidades_model)
@@ -29,47 +30,38 @@ def head_curiosidades() -> tuple: return curiosidades_crud.head()
 @curiosidades_bp.route('/curiosidades/<int:curiosidade_id>', methods=['HEAD'])
 def head_curiosidade(curiosidade_id: int) -> tuple: return curiosidades_crud.head(curiosidade_id)
 """HEAD /api/curiosidades/<id> - Verifica se uma curiosidade existe"""
+@curiosidades_bp.route('/curiosidades/export', methods=['GET'])
+def export_curiosidades() -> tuple: return curiosidades_crud.export()
+"""GET /api/curiosidades/export - Exporta todos os registros de curiosidades (ndjson, json ou csv)"""
+@curiosidades_bp.route('/curiosidades/bulk', methods=['POST'])
+def bulk_create_curiosidades() -> tuple: return curiosidades_crud.bulk_create()
+"""POST /api/curiosidades/bulk - Cria várias curiosidades em uma transação (array JSON ou NDJSON)"""
+@curiosidades_bp.route('/curiosidades/bulk', methods=['PATCH'])
+def bulk_update_curiosidades() -> tuple: return curiosidades_crud.bulk_update()
+"""PATCH /api/curiosidades/bulk - Atualiza parcialmente várias curiosidades por ID"""
+@curiosidades_bp.route('/curiosidades/bulk', methods=['DELETE'])
+def bulk_delete_curiosidades() -> tuple: return curiosidades_crud.bulk_delete()
+"""DELETE /api/curiosidades/bulk - Remove várias curiosidades por ID"""
     
 # Rotas auxiliares específicas para Curiosidades
 @curiosidades_bp.route('/curiosidades/especie/<int:especie_id>', methods=['GET'])
+@response_cache.cached(curiosidades_model)
 def get_curiosidades_by_especie(especie_id: int) -> tuple:
     """GET /api/curiosidades/especie/<especie_id> - Lista curiosidades por espécie"""
-    try:
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        curiosidades = curiosidades_model.get_by_especie(especie_id)
-        
-        if include_relationships: curiosidades = [curiosidades_model.add_relationships(item) for item in curiosidades]
-        
-        return jsonify(curiosidades), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    return list_response(curiosidades_model, curiosidades_model.by_especie(especie_id))
 
 @curiosidades_bp.route('/curiosidades/search', methods=['GET'])
+@response_cache.cached(curiosidades_model)
 def search_curiosidades() -> tuple:
     """GET /api/curiosidades/search - Busca curiosidades por texto"""
-    try:
-        texto = request.args.get('texto', '')
-        if not texto: return jsonify({'error': 'Parâmetro texto é obrigatório'}), 400
-        
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        curiosidades = curiosidades_model.search_by_text(texto)
-        
-        if include_relationships: curiosidades = [curiosidades_model.add_relationships(item) for item in curiosidades]
-        
-        return jsonify(curiosidades), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    texto = request.args.get('texto', '')
+    if not texto: return jsonify({'error': 'Parâmetro texto é obrigatório'}), 400
+    
+    return list_response(curiosidades_model, curiosidades_model.by_text(texto))
 
 @curiosidades_bp.route('/curiosidades/fonte/<fonte>', methods=['GET'])
+@response_cache.cached(curiosidades_model)
 def get_curiosidades_by_fonte(fonte: str) -> tuple:
     """GET /api/curiosidades/fonte/<fonte> - Lista curiosidades por fonte"""
-    try:
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        curiosidades = curiosidades_model.get_by_fonte(fonte)
-        
-        if include_relationships: curiosidades = [curiosidades_model.add_relationships(item) for item in curiosidades]
-        
-        return jsonify(curiosidades), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    return list_response(curiosidades_model, curiosidades_model.by_fonte(fonte))
 
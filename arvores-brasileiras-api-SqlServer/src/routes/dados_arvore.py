@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from src.models.dados_arvore import dados_arvore_model
-from src.routes.base_crud import BaseCRUD
+from src.routes.base_crud import BaseCRUD, list_response
+from src.cache import response_cache
 
 dados_arvore_bp = Blueprint('dados_arvore', __name__)
 dados_arvore_crud = BaseCRUD(dados_arvore_model)
@@ -29,66 +30,50 @@ def head_dados_arvore() -> tuple: return dados_arvore_crud.head()
 @dados_arvore_bp.route('/dados-arvore/<int:dados_id>', methods=['HEAD'])
 def head_dados_arvore_by_id(dados_id: int) -> tuple: return dados_arvore_crud.head(dados_id)
 """HEAD /api/dados-arvore/<id> - Verifica se dados de árvore existem"""
+@dados_arvore_bp.route('/dados-arvore/export', methods=['GET'])
+def export_dados_arvore() -> tuple: return dados_arvore_crud.export()
+"""GET /api/dados-arvore/export - Exporta todos os registros de dados de árvore (ndjson, json ou csv)"""
+@dados_arvore_bp.route('/dados-arvore/bulk', methods=['POST'])
+def bulk_create_dados_arvore() -> tuple: return dados_arvore_crud.bulk_create()
+"""POST /api/dados-arvore/bulk - Cria vários registros de dados de árvore em uma transação (array JSON ou NDJSON)"""
+@dados_arvore_bp.route('/dados-arvore/bulk', methods=['PATCH'])
+def bulk_update_dados_arvore() -> tuple: return dados_arvore_crud.bulk_update()
+"""PATCH /api/dados-arvore/bulk - Atualiza parcialmente vários registros de dados de árvore por ID"""
+@dados_arvore_bp.route('/dados-arvore/bulk', methods=['DELETE'])
+def bulk_delete_dados_arvore() -> tuple: return dados_arvore_crud.bulk_delete()
+"""DELETE /api/dados-arvore/bulk - Remove vários registros de dados de árvore por ID"""
 
 # Rotas auxiliares específicas para DadosArvore
 @dados_arvore_bp.route('/dados-arvore/especie/<int:especie_id>', methods=['GET'])
+@response_cache.cached(dados_arvore_model)
 def get_dados_arvore_by_especie(especie_id: int) -> tuple:
     """GET /api/dados-arvore/especie/<especie_id> - Lista dados de árvore por espécie"""
-    try:
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        dados_arvore = dados_arvore_model.get_by_especie(especie_id)
-        
-        if include_relationships: dados_arvore = [dados_arvore_model.add_relationships(item) for item in dados_arvore]
-        
-        return jsonify(dados_arvore), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    return list_response(dados_arvore_model, dados_arvore_model.by_especie(especie_id))
 
 @dados_arvore_bp.route('/dados-arvore/tempo-vida-range', methods=['GET'])
+@response_cache.cached(dados_arvore_model)
 def get_dados_arvore_by_tempo_vida_range() -> tuple:
     """GET /api/dados-arvore/tempo-vida-range - Lista dados por faixa de tempo de vida"""
-    try:
-        tempo_min = request.args.get('min', type=int)
-        tempo_max = request.args.get('max', type=int)
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        
-        dados_arvore = dados_arvore_model.get_by_tempo_vida_range(tempo_min, tempo_max)
-        
-        if include_relationships: dados_arvore = [dados_arvore_model.add_relationships(item) for item in dados_arvore]
-        
-        return jsonify(dados_arvore), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    tempo_min = request.args.get('min', type=int)
+    tempo_max = request.args.get('max', type=int)
+    
+    return list_response(dados_arvore_model, dados_arvore_model.by_tempo_vida_range(tempo_min, tempo_max))
 
 @dados_arvore_bp.route('/dados-arvore/crescimento-range', methods=['GET'])
+@response_cache.cached(dados_arvore_model)
 def get_dados_arvore_by_crescimento_range() -> tuple:
     """GET /api/dados-arvore/crescimento-range - Lista dados por faixa de crescimento anual"""
-    try:
-        crescimento_min = request.args.get('min', type=float)
-        crescimento_max = request.args.get('max', type=float)
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        
-        dados_arvore = dados_arvore_model.get_by_crescimento_range(crescimento_min, crescimento_max)
-        
-        if include_relationships: dados_arvore = [dados_arvore_model.add_relationships(item) for item in dados_arvore]
-        
-        return jsonify(dados_arvore), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    crescimento_min = request.args.get('min', type=float)
+    crescimento_max = request.args.get('max', type=float)
+    
+    return list_response(dados_arvore_model, dados_arvore_model.by_crescimento_range(crescimento_min, crescimento_max))
 
 @dados_arvore_bp.route('/dados-arvore/densidade-range', methods=['GET'])
+@response_cache.cached(dados_arvore_model)
 def get_dados_arvore_by_densidade_range() -> tuple:
     """GET /api/dados-arvore/densidade-range - Lista dados por faixa de densidade da madeira"""
-    try:
-        densidade_min = request.args.get('min', type=float)
-        densidade_max = request.args.get('max', type=float)
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        
-        dados_arvore = dados_arvore_model.get_by_densidade_range(densidade_min, densidade_max)
-        
-        if include_relationships: dados_arvore = [dados_arvore_model.add_relationships(item) for item in dados_arvore]
-        
-        return jsonify(dados_arvore), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    densidade_min = request.args.get('min', type=float)
+    densidade_max = request.args.get('max', type=float)
+    
+    return list_response(dados_arvore_model, dados_arvore_model.by_densidade_range(densidade_min, densidade_max))
 
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from src.models.especies import especies_model
-from src.routes.base_crud import BaseCRUD
+from src.routes.base_crud import BaseCRUD, list_response
+from src.cache import response_cache
+from src.autocomplete import especies_autocomplete, ORDERS
 
 especies_bp = Blueprint('especies', __name__)
 especies_crud = BaseCRUD(especies_model)
@@ -9,7 +11,7 @@ especies_crud = BaseCRUD(especies_model)
 def get_especies() -> tuple: return especies_crud.get_all()
 """GET /api/especies - Lista todas as espécies"""
 @especies_bp.route('/especies/<int:especie_id>', methods=['GET'])
-def get_especie(especie_id: int) -> tuple: return especies_crud.get(especie_id)
+def get_especie(especie_id: int) -> tuple: return especies_crud.get_by_id(especie_id)
 """GET /api/especies/<id> - Obtém uma espécie específica"""
 @especies_bp.route('/especies', methods=['POST'])
 def create_especie() -> tuple: return especies_crud.create()
@@ -29,26 +31,47 @@ def head_especies() -> tuple: return especies_crud.head()
 @especies_bp.route('/especies/<int:especie_id>', methods=['HEAD'])
 def head_especie(especie_id: int) -> tuple: return especies_crud.head(especie_id)
 """HEAD /api/especies/<id> - Verifica se uma espécie existe"""
+@especies_bp.route('/especies/export', methods=['GET'])
+def export_especies() -> tuple: return especies_crud.export()
+"""GET /api/especies/export - Exporta todos os registros de espécies (ndjson, json ou csv)"""
+@especies_bp.route('/especies/bulk', methods=['POST'])
+def bulk_create_especies() -> tuple: return especies_crud.bulk_create()
+"""POST /api/especies/bulk - Cria várias espécies em uma transação (array JSON ou NDJSON)"""
+@especies_bp.route('/especies/bulk', methods=['PATCH'])
+def bulk_update_especies() -> tuple: return especies_crud.bulk_update()
+"""PATCH /api/especies/bulk - Atualiza parcialmente várias espécies por ID"""
+@especies_bp.route('/especies/bulk', methods=['DELETE'])
+def bulk_delete_especies() -> tuple: return especies_crud.bulk_delete()
+"""DELETE /api/especies/bulk - Remove várias espécies por ID"""
     
 # Rotas auxiliares específicas para Especies
 @especies_bp.route('/especies/search', methods=['GET'])
+@response_cache.cached(especies_model)
 def search_especies() -> tuple:
     """GET /api/especies/search - Busca espécies por nome científico ou popular"""
+    nome = request.args.get('nome', '')
+    if not nome: return jsonify({'error': 'Parâmetro nome é obrigatório'}), 400
+    
+    return list_response(especies_model, especies_model.by_name(nome), relationships=False)
+
+@especies_bp.route('/especies/autocomplete', methods=['GET'])
+def autocomplete_especies() -> tuple:
+    """GET /api/especies/autocomplete?prefix=<texto> - Sugestões de espécies pelo início do nome"""
     try:
-        nome = request.args.get('nome', '')
-        if not nome: return jsonify({'error': 'Parâmetro nome é obrigatório'}), 400
+        prefix = request.args.get('prefix', '')
+        if not prefix.strip(): return jsonify({'error': 'Parâmetro prefix é obrigatório'}), 400
+        
+        order = request.args.get('order', ORDERS[0])
+        if order not in ORDERS: return jsonify({'error': f"Ordem inválida: {order} (use {', '.join(ORDERS)})"}), 400
+        limit = max(1, min(request.args.get('limit', 10, type=int), 50))
         
-        especies = especies_model.search_by_name(nome)
-        return jsonify(especies), 200
+        return jsonify(especies_autocomplete.suggest(prefix, limit=limit, order=order)), 200
         
     except Exception as e: return jsonify({'error': str(e)}), 500
 
 @especies_bp.route('/especies/familia/<familia>', methods=['GET'])
+@response_cache.cached(especies_model)
 def get_especies_by_familia(familia: str) -> tuple:
     """GET /api/especies/familia/<familia> - Lista espécies por família"""
-    try:
-        especies = especies_model.get_by_familia(familia)
-        return jsonify(especies), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    return list_response(especies_model, especies_model.by_familia(familia), relationships=False)
 
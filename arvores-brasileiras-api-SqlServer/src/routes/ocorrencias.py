@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from src.models.ocorrencias import ocorrencias_model
-from src.routes.base_crud import BaseCRUD
+from src.routes.base_crud import BaseCRUD, list_response
+from src.cache import response_cache
 
 ocorrencias_bp = Blueprint('ocorrencias', __name__)
 ocorrencias_crud = BaseCRUD(ocorrencias_model)
@@ -29,44 +30,35 @@ def head_ocorrencias() -> tuple: return ocorrencias_crud.head()
 @ocorrencias_bp.route('/ocorrencias/<int:ocorrencia_id>', methods=['HEAD'])
 def head_ocorrencia(ocorrencia_id: int) -> tuple: return ocorrencias_crud.head(ocorrencia_id)
 """HEAD /api/ocorrencias/<id> - Verifica se uma ocorrência existe"""
+@ocorrencias_bp.route('/ocorrencias/export', methods=['GET'])
+def export_ocorrencias() -> tuple: return ocorrencias_crud.export()
+"""GET /api/ocorrencias/export - Exporta todos os registros de ocorrências (ndjson, json ou csv)"""
+@ocorrencias_bp.route('/ocorrencias/bulk', methods=['POST'])
+def bulk_create_ocorrencias() -> tuple: return ocorrencias_crud.bulk_create()
+"""POST /api/ocorrencias/bulk - Cria várias ocorrências em uma transação (array JSON ou NDJSON)"""
+@ocorrencias_bp.route('/ocorrencias/bulk', methods=['PATCH'])
+def bulk_update_ocorrencias() -> tuple: return ocorrencias_crud.bulk_update()
+"""PATCH /api/ocorrencias/bulk - Atualiza parcialmente várias ocorrências por ID"""
+@ocorrencias_bp.route('/ocorrencias/bulk', methods=['DELETE'])
+def bulk_delete_ocorrencias() -> tuple: return ocorrencias_crud.bulk_delete()
+"""DELETE /api/ocorrencias/bulk - Remove várias ocorrências por ID"""
     
 # Rotas auxiliares específicas para Ocorrencias
 @ocorrencias_bp.route('/ocorrencias/especie/<int:especie_id>', methods=['GET'])
+@response_cache.cached(ocorrencias_model)
 def get_ocorrencias_by_especie(especie_id: int) -> tuple:
     """GET /api/ocorrencias/especie/<especie_id> - Lista ocorrências por espécie"""
-    try:
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        ocorrencias = ocorrencias_model.get_by_especie(especie_id)
-        
-        if include_relationships: ocorrencias = [ocorrencias_model.add_relationships(item) for item in ocorrencias]
-        
-        return jsonify(ocorrencias), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    return list_response(ocorrencias_model, ocorrencias_model.by_especie(especie_id))
 
 @ocorrencias_bp.route('/ocorrencias/bioma/<int:bioma_id>', methods=['GET'])
+@response_cache.cached(ocorrencias_model)
 def get_ocorrencias_by_bioma(bioma_id: int) -> tuple:
     """GET /api/ocorrencias/bioma/<bioma_id> - Lista ocorrências por bioma"""
-    try:
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        ocorrencias = ocorrencias_model.get_by_bioma(bioma_id)
-        
-        if include_relationships: ocorrencias = [ocorrencias_model.add_relationships(item) for item in ocorrencias]
-        
-        return jsonify(ocorrencias), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    return list_response(ocorrencias_model, ocorrencias_model.by_bioma(bioma_id))
 
 @ocorrencias_bp.route('/ocorrencias/frequencia/<frequencia>', methods=['GET'])
+@response_cache.cached(ocorrencias_model)
 def get_ocorrencias_by_frequencia(frequencia: int) -> tuple:
     """GET /api/ocorrencias/frequencia/<frequencia> - Lista ocorrências por frequência"""
-    try:
-        include_relationships = request.args.get('include_relationships', 'false').lower() == 'true'
-        ocorrencias = ocorrencias_model.get_by_frequencia(frequencia)
-        
-        if include_relationships: ocorrencias = [ocorrencias_model.add_relationships(item) for item in ocorrencias]
-        
-        return jsonify(ocorrencias), 200
-        
-    except Exception as e: return jsonify({'error': str(e)}), 500
+    return list_response(ocorrencias_model, ocorrencias_model.by_frequencia(frequencia))
 
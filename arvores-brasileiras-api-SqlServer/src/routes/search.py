@@ -0,0 +1,30 @@
+from flask import Blueprint, request, jsonify
+from src.search import search_index
+import time
+
+search_bp = Blueprint('search', __name__)
+
+@search_bp.route('/search', methods=['GET'])
+def search() -> tuple:
+    """GET /api/search?q=<texto> - Busca ranqueada em espécies e curiosidades, sem acento e tolerante a erros"""
+    try:
+        query = request.args.get('q', '').strip()
+        if not query: return jsonify({'error': 'Parâmetro q é obrigatório'}), 400
+
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        kinds = [kind.strip() for kind in request.args.get('type', '').split(',') if kind.strip()]
+        invalid = [kind for kind in kinds if kind not in search_index.kinds]
+        if invalid:
+            return jsonify({'error': f"Tipo inválido: {', '.join(invalid)} (use {', '.join(search_index.kinds)})"}), 400
+
+        started = time.perf_counter()
+        results = search_index.search(query, limit=limit, kinds=kinds or None)
+
+        return jsonify({
+            'query': query,
+            'results': results,
+            'indexed': search_index.ready,
+            'took_ms': round((time.perf_counter() - started) * 1000, 3)
+        }), 200
+
+    except Exception as e: return jsonify({'error': str(e)}), 500
@@ -0,0 +1,55 @@
+from flask import Blueprint, request, jsonify
+from src.cache import response_cache
+from src.models.aggregates import AggregateSpec, aggregate, group_fields, numeric_fields
+from src.models.pagination import InvalidParameter
+from src.models.especies import especies_model
+from src.models.biomas import biomas_model
+from src.models.ocorrencias import ocorrencias_model
+from src.models.caracteristicas import caracteristicas_model
+from src.models.curiosidades import curiosidades_model
+from src.models.dados_arvore import dados_arvore_model
+import logging
+
+logger = logging.getLogger(__name__)
+
+stats_bp = Blueprint('stats', __name__)
+
+# Recursos com estatísticas: nome na URL -> modelo
+STATS_MODELS = {
+    'especies': especies_model,
+    'biomas': biomas_model,
+    'ocorrencias': ocorrencias_model,
+    'caracteristicas': caracteristicas_model,
+    'curiosidades': curiosidades_model,
+    'dados-arvore': dados_arvore_model
+}
+
+# Parâmetros da agregação; os demais são filtros, como nas listagens (?Campo__gte=10)
+STATS_PARAMS = ('group_by', 'metrics', 'distinct', 'percentiles', 'bins', 'bins_min', 'bins_max', 'limit')
+
+@stats_bp.route('/stats', methods=['GET'])
+def list_stats() -> tuple:
+    """GET /api/stats - Recursos, agrupamentos e métricas disponíveis"""
+    return jsonify({
+        resource: {'group_by': group_fields(model), 'metrics': numeric_fields(model)}
+        for resource, model in STATS_MODELS.items()
+    }), 200
+
+@stats_bp.route('/stats/<recurso>', methods=['GET'])
+def get_stats(recurso: str) -> tuple:
+    """GET /api/stats/<recurso> - Contagem, mínimo, máximo, média, percentis e histogramas por grupo"""
+    model = STATS_MODELS.get(recurso)
+    if model is None:
+        return jsonify({'error': f"Recurso sem estatísticas: {recurso} (use {', '.join(STATS_MODELS)})"}), 404
+    try:
+        filters = {key: value for key, value in request.args.items() if key not in STATS_PARAMS}
+        spec = AggregateSpec.parse(model, request.args, filters)
+    except InvalidParameter as e: return jsonify({'error': str(e)}), 400
+
+    def produce():
+        try:
+            return jsonify({'resource': recurso, **aggregate(spec)}), 200
+        except Exception as e: return jsonify({'error': str(e)}), 500
+
+    # Invalidado por escritas na tabela e na tabela da dimensão de agrupamento
+    return response_cache.serve(spec.tables, produce)
@@ -0,0 +1,249 @@
+from bisect import bisect_left, insort
+from collections import Counter
+from src.database.versions import table_versions
+from src.models.filters import fold
+from src.models.pagination import COUNT_NONE
+from src.models.especies import especies_model
+from src.models.curiosidades import curiosidades_model
+import heapq
+import math
+import os
+import re
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Palavras muito frequentes que não ajudam a ranquear
+STOPWORDS = frozenset((
+    'a', 'as', 'o', 'os', 'e', 'de', 'da', 'das', 'do', 'dos', 'em', 'na', 'nas', 'no', 'nos',
+    'um', 'uma', 'com', 'por', 'para', 'que', 'se', 'ao', 'aos'
+))
+
+# Peso de cada tipo de correspondência entre o termo buscado e o termo indexado
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.8
+FUZZY_MATCH = 0.7
+
+# Erros de digitação tolerados (inserção, remoção, troca ou transposição de letras)
+def max_typos(term):
+    return 0 if len(term) < 4 else 1 if len(term) < 8 else 2
+
+# Limite de termos considerados por prefixo, para consultas curtas como "a"
+MAX_PREFIX_EXPANSIONS = 50
+
+# Limite de candidatos (os que mais compartilham trigramas) verificados por distância de edição
+MAX_FUZZY_CANDIDATES = 64
+
+def tokenize(text):
+    """Termos normalizados (sem acento e sem caixa) de um texto"""
+    if not text: return []
+    return [token for token in TOKEN_PATTERN.findall(fold(text)) if token not in STOPWORDS]
+
+def trigrams(term):
+    padded = f"#{term}#"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def edit_distance(a, b, limit):
+    """Distância de edição com transposições (OSA); retorna limit + 1 assim que passar do limite"""
+    if abs(len(a) - len(b)) > limit: return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit: return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+class SearchSource:
+    """Tabela indexada: tipo do documento, modelo, peso de cada campo e condição da busca alternativa no banco"""
+    __slots__ = ('kind', 'model', 'weights', 'fallback')
+
+    def __init__(self, kind, model, weights, fallback):
+        self.kind = kind
+        self.model = model
+        self.weights = weights
+        self.fallback = fallback
+
+class SearchIndex:
+    """Índice invertido em memória com trigramas para tolerância a erros de digitação
+
+    Cada documento (tipo, id) contribui com seus termos ponderados pelo peso do
+    campo; a busca expande cada termo da consulta em correspondências exatas, por
+    prefixo e por semelhança de trigramas, e ranqueia por TF-IDF. O índice é
+    construído na inicialização e atualizado pelas notificações de escrita.
+    """
+
+    def __init__(self, sources=(), enabled=True):
+        self.enabled = enabled
+        self.sources = {source.model.table_name: source for source in sources}
+        self.kinds = tuple(source.kind for source in sources)
+        self.documents = {}    # (tipo, id) -> registro
+        self.doc_terms = {}    # (tipo, id) -> {termo: peso}
+        self.postings = {}     # termo -> {(tipo, id): peso}
+        self.grams = {}        # trigrama -> conjunto de termos
+        self.terms = []        # termos em ordem alfabética (busca por prefixo)
+        self.ready = False
+        self._lock = threading.RLock()
+        table_versions.subscribe(self._on_write)
+
+    # Construção e manutenção
+
+    def build(self):
+        """(Re)constrói o índice a partir do banco; em caso de falha a busca usa o banco"""
+        try:
+            for source in self.sources.values():
+                self._rebuild(source)
+            self.ready = True
+            logger.info(f"Índice de busca construído com {len(self.documents)} documentos e {len(self.terms)} termos")
+        except Exception as e:
+            logger.error(f"Erro ao construir índice de busca: {e}")
+            self.ready = False
+
+    def _rebuild(self, source):
+        records = [record for chunk in source.model.iter_rows() for record in chunk]
+        with self._lock:
+            for key in [key for key in self.documents if key[0] == source.kind]:
+                self._remove(key)
+            for record in records:
+                self._add(source, record)
+
+    def _on_write(self, table, ids):
+        source = self.sources.get(table)
+        if source is None or not self.ready: return
+        if ids is None:
+            self._rebuild(source)
+            return
+
+        records = source.model.get_many(ids)
+        with self._lock:
+            for record_id in ids:
+                self._remove((source.kind, record_id))
+            for record in records:
+                self._add(source, record)
+
+    def _add(self, source, record):
+        key = (source.kind, record[source.model.primary_key])
+        weights = Counter()
+        for field, weight in source.weights.items():
+            for term in tokenize(record.get(field)):
+                weights[term] += weight
+        if not weights: return
+
+        self.documents[key] = record
+        self.doc_terms[key] = weights
+        for term, weight in weights.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                insort(self.terms, term)
+                for gram in trigrams(term):
+                    self.grams.setdefault(gram, set()).add(term)
+            postings[key] = weight
+
+    def _remove(self, key):
+        self.documents.pop(key, None)
+        for term in self.doc_terms.pop(key, ()):
+            postings = self.postings[term]
+            postings.pop(key, None)
+            if postings: continue
+
+            del self.postings[term]
+            del self.terms[bisect_left(self.terms, term)]
+            for gram in trigrams(term):
+                terms = self.grams.get(gram)
+                if terms is not None:
+                    terms.discard(term)
+                    if not terms: del self.grams[gram]
+
+    # Consulta
+
+    def _expand(self, term):
+        """Termos do índice que correspondem a `term`, com o peso da correspondência"""
+        matches = {}
+        if term in self.postings: matches[term] = EXACT_MATCH
+
+        start = bisect_left(self.terms, term)
+        for candidate in self.terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not candidate.startswith(term): break
+            matches.setdefault(candidate, PREFIX_MATCH)
+
+        # Termos com erro de digitação só são procurados quando não há correspondência exata.
+        # Candidatos saem do índice de trigramas: cada erro altera no máximo 4 trigramas (transposição)
+        typos = max_typos(term)
+        if typos and term not in self.postings:
+            grams = trigrams(term)
+            minimum_shared = max(1, len(grams) - 4 * typos)
+            shared = Counter(candidate for gram in grams for candidate in self.grams.get(gram, ()))
+            for candidate, count in shared.most_common(MAX_FUZZY_CANDIDATES):
+                if count < minimum_shared: break
+                if candidate in matches: continue
+                distance = edit_distance(term, candidate, typos)
+                if distance <= typos:
+                    matches[candidate] = FUZZY_MATCH * (1 - distance / len(term))
+        return matches
+
+    def search(self, query, limit=20, kinds=None):
+        """Documentos ranqueados para a consulta: [{'type', 'id', 'score', 'data'}]"""
+        if not self.ready: return self._fallback(query, limit, kinds)
+
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            total_documents = len(self.documents) or 1
+            scores, matched = Counter(), Counter()
+
+            for term in terms:
+                best = {}
+                for candidate, match in self._expand(term).items():
+                    postings = self.postings[candidate]
+                    idf = math.log(1 + total_documents / len(postings))
+                    for key, weight in postings.items():
+                        if kinds and key[0] not in kinds: continue
+                        score = match * weight * idf
+                        if score > best.get(key, 0): best[key] = score
+                for key, score in best.items():
+                    scores[key] += score
+                    matched[key] += 1
+
+            # Documentos que casam com mais termos da consulta vêm primeiro; depois a pontuação
+            ranked = heapq.nlargest(limit, scores, key=lambda key: (matched[key], scores[key]))
+            return [
+                {'type': key[0], 'id': key[1], 'score': round(scores[key], 4), 'data': self.documents[key]}
+                for key in ranked
+            ]
+
+    def _fallback(self, query, limit, kinds):
+        """Busca sem índice (LIKE no banco), sem ranqueamento"""
+        results = []
+        for source in self.sources.values():
+            if kinds and source.kind not in kinds: continue
+            page = source.model.get_all(per_page=limit, count=COUNT_NONE, condition=source.fallback(query))
+            for record in page['data']:
+                results.append({'type': source.kind, 'id': record[source.model.primary_key], 'score': None, 'data': record})
+        return results[:limit]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'ready': self.ready,
+                'documents': len(self.documents),
+                'terms': len(self.terms),
+                'trigrams': len(self.grams)
+            }
+
+# Instância global do índice de busca
+search_index = SearchIndex([
+    SearchSource(
+        'especie', especies_model,
+        {'NomePopular': 3.0, 'NomeCientifico': 3.0, 'Familia': 2.0, 'Descricao': 1.0},
+        fallback=especies_model.by_name
+    ),
+    SearchSource('curiosidade', curiosidades_model, {'Texto': 1.0}, fallback=curiosidades_model.by_text)
+], enabled=os.environ.get('SEARCH_INDEX_ENABLED', 'true').lower() == 'true')
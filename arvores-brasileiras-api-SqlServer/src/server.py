@@ -0,0 +1,146 @@
+"""Servidor de produção da API (`python src/server.py`)
+
+No Linux/macOS usa o gunicorn: a aplicação é criada uma vez no processo mestre
+(modelos, índices de busca e snapshot carregados antes do fork) e cada worker abre o
+próprio pool de conexões depois do fork. No Windows, ou sem o gunicorn instalado, usa
+o waitress (um processo, várias threads).
+
+Cache de respostas, índices de busca e snapshot são de cada processo e só veem na hora
+as escritas feitas por ele. Por isso o padrão é um worker; vários workers exigem o
+snapshot com recarga periódica (SNAPSHOT_ENABLED=true), que leva as escritas dos outros
+processos a todos eles em até SNAPSHOT_REFRESH_INTERVAL segundos.
+
+Recarga sem derrubar conexões: `kill -HUP <pid do mestre>` substitui os workers aos
+poucos, cada um terminando as requisições em andamento (até SERVER_GRACEFUL_TIMEOUT).
+"""
+import os
+import sys
+# Mesmo ajuste de caminho de src/main.py, para executar o arquivo diretamente
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from src.database.connection import db_connection
+from src.models.snapshot import snapshot_store
+import multiprocessing
+import logging
+
+logger = logging.getLogger(__name__)
+
+SERVER_ENGINES = ('auto', 'gunicorn', 'waitress')
+
+def shares_writes():
+    """Se as escritas de um worker chegam aos outros (recarga periódica do snapshot)"""
+    return snapshot_store.enabled and snapshot_store.interval > 0
+
+def server_settings():
+    """Lê a configuração do servidor das variáveis de ambiente"""
+    return {
+        'host': os.environ.get('SERVER_HOST', '0.0.0.0'),
+        'port': int(os.environ.get('SERVER_PORT', 5000)),
+        # Processos (WEB_CONCURRENCY é a convenção das plataformas): 2 x CPUs + 1 só quando o
+        # snapshot propaga as escritas entre eles, senão um
+        'workers': int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1 if shares_writes() else 1)),
+        'threads': int(os.environ.get('SERVER_THREADS', 4)),
+        'keepalive': int(os.environ.get('SERVER_KEEPALIVE', 5)),
+        'timeout': int(os.environ.get('SERVER_TIMEOUT', 60)),
+        'graceful_timeout': int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', 30)),
+        'max_requests': int(os.environ.get('SERVER_MAX_REQUESTS', 0)),
+        'max_requests_jitter': int(os.environ.get('SERVER_MAX_REQUESTS_JITTER', 0)),
+        'backlog': int(os.environ.get('SERVER_BACKLOG', 2048))
+    }
+
+# Hooks do gunicorn
+
+def when_ready(server):
+    """No mestre, antes dos workers: ninguém mais consulta o banco neste processo"""
+    # A recarga periódica do snapshot roda nos workers; conexões abertas durante o
+    # carregamento da aplicação são fechadas para não serem herdadas pelos filhos
+    snapshot_store.stop()
+    db_connection.pool.close_all()
+
+def post_fork(server, worker):
+    """No worker recém-criado: pool e executor já foram reinicializados (os.register_at_fork)"""
+    snapshot_store.start_refresh()
+    logger.info(f"Worker {worker.pid} iniciado")
+
+def run_gunicorn(app, settings):
+    from gunicorn.app.base import BaseApplication
+
+    class GunicornServer(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items(): self.cfg.set(key, value)
+
+        def load(self): return self.application
+
+    options = {
+        'bind': f"{settings['host']}:{settings['port']}",
+        'workers': settings['workers'],
+        'threads': settings['threads'],
+        'worker_class': 'gthread' if settings['threads'] > 1 else 'sync',
+        'keepalive': settings['keepalive'],
+        'timeout': settings['timeout'],
+        'graceful_timeout': settings['graceful_timeout'],
+        'max_requests': settings['max_requests'],
+        'max_requests_jitter': settings['max_requests_jitter'],
+        'backlog': settings['backlog'],
+        # A aplicação já foi criada aqui, no mestre: os workers a herdam pronta
+        'preload_app': True,
+        'when_ready': when_ready,
+        'post_fork': post_fork
+    }
+    GunicornServer(app, options).run()
+
+def run_waitress(app, settings):
+    from waitress import serve
+
+    # Um único processo: o número de threads é o total de requisições simultâneas
+    serve(
+        app, host=settings['host'], port=settings['port'],
+        threads=settings['threads'] * max(1, settings['workers']),
+        channel_timeout=max(settings['keepalive'], settings['timeout']),
+        backlog=settings['backlog']
+    )
+
+def resolve_engine(engine):
+    if engine not in SERVER_ENGINES: raise ValueError(f"SERVER_ENGINE inválido: {engine} (use {', '.join(SERVER_ENGINES)})")
+    if engine != 'auto': return engine
+    if sys.platform == 'win32': return 'waitress'
+    try:
+        import gunicorn
+        return 'gunicorn'
+    except ImportError:
+        return 'waitress'
+
+def main() -> None:
+    """Executa a API com o servidor de produção"""
+    from src.main import create_app
+    config_name = os.environ.get('FLASK_ENV', 'production')
+    engine = resolve_engine(os.environ.get('SERVER_ENGINE', 'auto'))
+    settings = server_settings()
+
+    app = create_app(config_name)
+    app.config['JSON_SORT_KEYS'] = False
+
+    logger.info(f"=== API Árvores Brasileiras v2.0.0 (pyodbc) - servidor {engine} ===")
+    logger.info(f"Ambiente: {config_name}")
+    logger.info(
+        f"Escutando em {settings['host']}:{settings['port']} com "
+        + (f"{settings['workers']} processos x {settings['threads']} threads" if engine == 'gunicorn'
+           else f"{settings['threads'] * max(1, settings['workers'])} threads")
+    )
+
+    if engine == 'gunicorn' and settings['workers'] > 1 and not shares_writes():
+        logger.warning(
+            "Vários workers sem SNAPSHOT_ENABLED=true (e SNAPSHOT_REFRESH_INTERVAL > 0): cache e índices "
+            "de busca de cada worker não veem as escritas feitas pelos outros até expirarem (CACHE_TTL)"
+        )
+
+    if engine == 'gunicorn': run_gunicorn(app, settings)
+    else: run_waitress(app, settings)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Fixtures compartilhadas pelos testes
+
+A aplicação dos testes usa o SQLite num diretório temporário. As variáveis de ambiente
+são definidas aqui, antes de qualquer import de `src`: as instâncias globais (conexão,
+cache, snapshot...) leem a configuração quando o módulo é importado.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import pytest
+
+DATA_DIR = tempfile.mkdtemp(prefix='arvores-testes-')
+os.environ.update(
+    DB_ENGINE='sqlite', SQLITE_PATH=os.path.join(DATA_DIR, 'api.db'),
+    CACHE_ENABLED='true', SNAPSHOT_ENABLED='false', STATEMENT_WARMUP='false'
+)
+
+import parity
+from fakes import FakeDriver
+
+# Espécies do banco semeado (parity.seed) usado pelos testes da aplicação
+ESPECIES = 40
+
+@pytest.fixture
+def driver():
+    return FakeDriver()
+
+@pytest.fixture(scope='session')
+def app():
+    """Aplicação criada uma vez sobre o banco semeado; `client` restaura os dados a cada teste"""
+    base = os.path.join(DATA_DIR, 'base.db')
+    parity.seed(base, ESPECIES)
+    shutil.copyfile(base, os.environ['SQLITE_PATH'])
+
+    from src.main import create_app
+    yield create_app('testing')
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+@pytest.fixture
+def client(app):
+    """Cliente sobre o banco semeado, com caches e índices reconstruídos a partir dele"""
+    from src.cache import response_cache
+    from src.database.versions import table_versions
+    from src.main import (
+        especies_model, biomas_model, ocorrencias_model, caracteristicas_model, curiosidades_model, dados_arvore_model
+    )
+
+    # O backup escreve no mesmo arquivo: as conexões abertas do pool passam a ver os dados originais
+    source, target = sqlite3.connect(os.path.join(DATA_DIR, 'base.db')), sqlite3.connect(os.environ['SQLITE_PATH'])
+    source.backup(target)
+    source.close()
+    target.close()
+
+    response_cache.backend.clear()
+    with response_cache._validators_lock: response_cache._validators.clear()
+    # Escrita "desconhecida" em todas as tabelas: invalida o que foi derivado dos dados anteriores
+    for model in (especies_model, biomas_model, ocorrencias_model, caracteristicas_model, curiosidades_model, dados_arvore_model):
+        table_versions.bump(model.table_name)
+    return app.test_client()
@@ -0,0 +1,52 @@
+"""Driver DB-API falso (sem banco) para os testes dos pools de conexões"""
+from src.database.pool import ConnectionPool
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.closed = False
+
+    def execute(self, query, *params):
+        if self.connection.broken: raise RuntimeError("conexão perdida")
+        self.connection.queries.append(query)
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        self.closed = True
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.broken = False
+        self.closed = False
+        self.rollbacks = 0
+        self.queries = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+class FakeDriver:
+    """Fábrica `connect` do pool: numera e guarda as conexões abertas"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.connections = []
+
+    def connect(self):
+        if self.fail: raise RuntimeError("banco indisponível")
+        connection = FakeConnection(len(self.connections) + 1)
+        self.connections.append(connection)
+        return connection
+
+def make_pool(driver, **settings):
+    settings.setdefault('min_size', 0)
+    settings.setdefault('reset', lambda connection: connection.rollback())
+    return ConnectionPool(driver.connect, **settings)
@@ -0,0 +1,321 @@
+"""Paridade entre os dialetos: as mesmas requisições contra o SQLite e o dialeto do SQL Server
+
+Cria um banco SQLite com dados determinísticos e executa, em dois processos, todas as
+rotas de dados da API (GET com parâmetros de exemplo, exportações e uma sequência de
+escritas com POST, PUT, PATCH, DELETE e /bulk):
+  - sqlite: DB_ENGINE=sqlite sobre uma cópia do banco;
+  - sqlserver: o dialeto do SQL Server (SQL gerado com OFFSET/FETCH, OUTPUT, sys.partitions,
+    PERCENTILE_CONT e fast_executemany) sobre um substituto do pyodbc que traduz esse SQL
+    para o SQLite, em outra cópia do mesmo banco.
+As respostas são comparadas por `test_dialect_parity.py`; este módulo também é o processo
+filho (`python tests/parity.py --run <dialeto> --db <banco> --output <json>`).
+"""
+from urllib.parse import quote
+import argparse
+import json
+import math
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ENGINES = ('sqlite', 'sqlserver')
+
+# Rotas de sistema (estatísticas, versão do banco, HTML) ficam fora da comparação
+EXCLUDED_ENDPOINTS = {
+    'static', 'index_home', 'health_check', 'api_info', 'test_database', 'pool_status', 'executor_status',
+    'statements_status', 'cache_status', 'compression_status', 'metrics_status', 'snapshot_status', 'search_status'
+}
+
+# Valores de exemplo para os parâmetros textuais das rotas
+PATH_SAMPLES = {'regiao': 'Norte', 'tipo_folha': 'Simples', 'fonte': 'Embrapa', 'frequencia': 'Comum', 'familia': 'Fab'}
+
+QUERY_CASES = (
+    '/api/especies?page=2&per_page=5',
+    '/api/especies?per_page=5&after=&sort=NomePopular',
+    '/api/especies?per_page=5&count=estimate',
+    '/api/especies?per_page=5&count=false',
+    '/api/especies?Familia=Fab&per_page=50',
+    '/api/especies?NomePopular__contains=' + quote('bá') + '&per_page=50',
+    '/api/especies?EspecieID__in=1,3,5&include_relationships=true',
+    '/api/especies?per_page=3&include_relationships=true',
+    '/api/especies?per_page=3&fields=NomePopular,ocorrencias&include_relationships=true&fields[ocorrencias]=Frequencia',
+    '/api/especies/1?include_relationships=true',
+    '/api/especies/99999',
+    '/api/especies?DataCadastro__gte=2024-01-05',
+    '/api/biomas?Regiao=Norte&include_relationships=true',
+    '/api/ocorrencias?BiomaID=2&per_page=50&include_relationships=true',
+    '/api/dados-arvore?per_page=50&CrescimentoAnual__gte=0.5',
+    '/api/dados-arvore?per_page=5&after=&sort=EspecieID',
+    '/api/caracteristicas?per_page=50&TipoFolha=Simples',
+    '/api/dados-arvore/tempo-vida-range?min=60&max=90',
+    '/api/dados-arvore/crescimento-range?min=0.5',
+    '/api/dados-arvore/densidade-range?max=0.8',
+    '/api/caracteristicas/altura-range?min=10&max=20',
+    '/api/especies/search?nome=ip',
+    '/api/biomas/search?nome=bioma',
+    '/api/curiosidades/search?texto=' + quote('árvore 1'),
+    '/api/especies/autocomplete?prefix=ja',
+    '/api/search?q=ipe',
+    '/api/arvores-completa?ids=1,2,3,99999',
+    '/api/arvores/query?AlturaMedia__gte=10&TempoDeVidaEstimado__lt=200&per_page=20',
+    '/api/arvores/query?DensidadeMadeira__gte=0.5&DensidadeMadeira__lte=0.9&sort=-CrescimentoAnual&per_page=5&after=',
+    '/api/arvores/query?sort=DensidadeMadeira&per_page=10&page=2',
+    '/api/especies/export?format=csv',
+    '/api/ocorrencias/export?format=ndjson',
+    '/api/dados-arvore/export?format=json',
+    '/api/stats/especies?group_by=Familia',
+    '/api/stats/ocorrencias?group_by=Bioma&distinct=EspecieID&Frequencia=Rara',
+    '/api/stats/caracteristicas?group_by=Familia&metrics=AlturaMedia,DiametroMedio&bins=5',
+    '/api/stats/dados-arvore?metrics=DensidadeMadeira,TempoDeVidaEstimado&bins=4&bins_min=0.5&bins_max=1',
+    # Percentis: PERCENTILE_CONT no SQL Server, leitura ordenada e interpolação na aplicação no SQLite
+    '/api/stats/dados-arvore?metrics=DensidadeMadeira&percentiles=0,25,50,75,100',
+    '/api/stats/caracteristicas?group_by=TipoFolha&metrics=AlturaMedia,DiametroMedio&percentiles=10,50,90',
+    '/api/stats/dados-arvore?group_by=Familia&metrics=TempoDeVidaEstimado,CrescimentoAnual&percentiles=33.3,99&CrescimentoAnual__gte=0.5',
+)
+
+WRITE_CASES = (
+    ('POST', '/api/especies', {
+        'NomeCientifico': 'Handroanthus albus', 'NomePopular': 'Ipê-amarelo', 'Familia': 'Bignoniaceae',
+        'Descricao': 'Árvore do cerrado', 'DataCadastro': '2024-05-01T10:00:00'
+    }),
+    ('PUT', '/api/especies/{EspecieID}', {'NomePopular': 'Ipê-amarelo-do-cerrado', 'DataCadastro': '2024-05-02T08:30:00'}),
+    ('PATCH', '/api/especies/{EspecieID}', {'Familia': 'Bignoniaceae', 'DataCadastro': '2024-05-03T09:00:00'}),
+    ('POST', '/api/dados-arvore', {
+        'EspecieID': 1, 'TempoDeVidaEstimado': 120, 'CrescimentoAnual': 0.75, 'RaizProfundidadeMedia': 2.5, 'DensidadeMadeira': 0.9
+    }),
+    ('POST', '/api/biomas/bulk', [{'Nome': f'Novo bioma {i}', 'Descricao': 'Inserido em lote', 'Regiao': 'Sul'} for i in range(5)]),
+    ('POST', '/api/biomas/bulk?return=ids', [{'Nome': f'Bioma por id {i}', 'Regiao': 'Norte'} for i in range(3)]),
+    ('POST', '/api/curiosidades/bulk?return=none', [{'EspecieID': 2, 'Texto': f'Curiosidade {i}', 'Fonte': 'IBF'} for i in range(4)]),
+    ('PATCH', '/api/biomas/bulk', [{'BiomaID': 7, 'Regiao': 'Centro-Oeste'}, {'BiomaID': 8, 'Nome': 'Renomeado'}, {'BiomaID': 99999, 'Nome': 'X'}]),
+    ('DELETE', '/api/biomas/bulk?ids=9,10,99999', None),
+    ('DELETE', '/api/especies/{EspecieID}', None),
+    ('DELETE', '/api/especies/{EspecieID}', None),
+    ('GET', '/api/biomas?per_page=50', None),
+    ('GET', '/api/curiosidades/especie/2', None),
+    ('GET', '/api/especies?per_page=5&count=estimate', None),
+)
+
+# ---------------------------------------------------------------- dados
+
+def seed(path, especies):
+    """Banco SQLite com o esquema da API e dados determinísticos"""
+    connection = sqlite3.connect(path)
+    with open(os.path.join(ROOT, 'src', 'database', 'schema_sqlite.sql'), encoding='utf-8') as file:
+        connection.executescript(file.read())
+    nomes = ['Ipê', 'Jatobá', 'Embaúba', 'Pau-brasil']
+    familias = ['Bignoniaceae', 'Fabaceae', 'Urticaceae']
+    for i in range(1, 7):
+        connection.execute("INSERT INTO Biomas (Nome, Descricao, Regiao) VALUES (?, ?, ?)",
+                           (f'Bioma {i}', f'Descrição do bioma {i}', ['Norte', 'Sul', 'Sudeste'][i % 3]))
+    for i in range(1, especies + 1):
+        connection.execute(
+            "INSERT INTO Especies (NomeCientifico, NomePopular, Familia, Descricao, DataCadastro) VALUES (?, ?, ?, ?, ?)",
+            (f'Genus species{i}', f'{nomes[i % 4]} {i}', familias[i % 3], f'Descrição da espécie {i}',
+             f'2024-01-{i % 28 + 1:02d} 10:00:00')
+        )
+        for bioma in (1 + i % 6, 1 + (i + 2) % 6):
+            connection.execute("INSERT INTO Ocorrencias (EspecieID, BiomaID, Frequencia) VALUES (?, ?, ?)",
+                               (i, bioma, ['Comum', 'Rara'][bioma % 2]))
+        connection.execute(
+            "INSERT INTO Caracteristicas (EspecieID, AlturaMedia, DiametroMedio, TipoFolha, Floracao) VALUES (?, ?, ?, ?, ?)",
+            (i, f'{5 + i % 30}.50', f'{0.5 + i % 3:.2f}', ['Simples', 'Composta'][i % 2], 'Primavera')
+        )
+        connection.execute("INSERT INTO Curiosidades (EspecieID, Texto, Fonte) VALUES (?, ?, ?)",
+                           (i, f'Curiosidade sobre a árvore {i}', ['Embrapa', 'IBF'][i % 2]))
+        connection.execute(
+            "INSERT INTO DadosArvore (EspecieID, TempoDeVidaEstimado, CrescimentoAnual, RaizProfundidadeMedia, DensidadeMadeira) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (i, 50 + i * 3, f'{0.3 + (i % 10) / 10:.2f}', f'{1 + i % 5:.2f}', None if i % 7 == 0 else f'{0.4 + (i % 7) / 10:.2f}')
+        )
+    connection.commit()
+    connection.close()
+
+# ------------------------------------------------- substituto do SQL Server
+
+PAGE_PATTERN = re.compile(r'OFFSET \? ROWS FETCH NEXT \? ROWS ONLY')
+OUTPUT_PATTERN = re.compile(r' OUTPUT ((?:INSERTED|DELETED)\.\w+(?:, (?:INSERTED|DELETED)\.\w+)*)')
+
+PERCENTILE_PATTERN = re.compile(r'PERCENTILE_CONT\(([0-9.e-]+)\) WITHIN GROUP \(ORDER BY ([\w.]+)\) OVER')
+
+def translate(sql, params):
+    """T-SQL gerado pelo dialeto do SQL Server -> SQL equivalente no SQLite"""
+    sql = PERCENTILE_PATTERN.sub(r'percentile_cont(\1, \2) OVER', sql)
+    if 'sys.partitions' in sql:
+        # Contagem dos metadados: exata no SQL Server (linhas por partição)
+        return f"SELECT COUNT(*) FROM {params[0]}", []
+    if PAGE_PATTERN.search(sql):
+        sql = PAGE_PATTERN.sub('LIMIT ? OFFSET ?', sql)
+        params = params[:-2] + [params[-1], params[-2]]
+    match = OUTPUT_PATTERN.search(sql)
+    if match:
+        columns = re.sub(r'(?:INSERTED|DELETED)\.', '', match.group(1))
+        sql = sql.replace(match.group(0), '') + f" RETURNING {columns}"
+    return sql, params
+
+class PercentileCont:
+    """Função de janela percentile_cont(fração, valor): o PERCENTILE_CONT do SQL Server no SQLite
+
+    Percentil contínuo dos valores não nulos da partição, interpolado entre os dois postos vizinhos.
+    """
+
+    def __init__(self):
+        self.fraction = None
+        self.values = []
+
+    def step(self, fraction, value):
+        self.fraction = fraction
+        if value is not None: self.values.append(value)
+
+    def inverse(self, fraction, value):
+        if value is not None: self.values.remove(value)
+
+    def value(self):
+        if not self.values: return None
+        ordered = sorted(self.values)
+        position = self.fraction * (len(ordered) - 1)
+        lower, upper = math.floor(position), math.ceil(position)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    def finalize(self):
+        return self.value()
+
+class StandInCursor:
+    """Cursor com a interface do pyodbc usada pela API, executando no SQLite"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.fast_executemany = False
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, sql, *params):
+        params = list(params[0]) if len(params) == 1 and isinstance(params[0], (list, tuple)) else list(params)
+        self._cursor.execute(*translate(sql, params))
+        return self
+
+    def executemany(self, sql, rows):
+        self._cursor.executemany(translate(sql, [])[0], rows)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size=1):
+        return self._cursor.fetchmany(size)
+
+    def close(self):
+        self._cursor.close()
+
+class StandInConnection:
+    def __init__(self, path):
+        self._connection = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        self._connection.create_window_function('percentile_cont', 2, PercentileCont)
+
+    def cursor(self):
+        return StandInCursor(self._connection.cursor())
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def close(self):
+        self._connection.close()
+
+# ---------------------------------------------------------------- execução
+
+def route_cases(app):
+    """Uma requisição GET por rota de dados, com valores de exemplo nos parâmetros do caminho"""
+    cases = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda rule: rule.rule):
+        if 'GET' not in rule.methods or rule.endpoint in EXCLUDED_ENDPOINTS: continue
+        values = {name: 1 if type(converter).__name__ == 'IntegerConverter' else PATH_SAMPLES.get(name, 'a')
+                  for name, converter in rule._converters.items()}
+        cases.append(app.url_map.bind('localhost').build(rule.endpoint, values))
+    return cases
+
+# Campos de tempo medido, que variam a cada execução
+TIMING_KEYS = ('took_ms',)
+
+def body_of(response):
+    if not response.is_json: return response.get_data(as_text=True)
+    data = response.get_json()
+    if isinstance(data, dict):
+        for key in TIMING_KEYS: data.pop(key, None)
+    return data
+
+def run(engine, db_path, output):
+    """Processo filho: executa todas as requisições com o dialeto `engine` e grava as respostas"""
+    os.environ.update(DB_ENGINE=engine, SQLITE_PATH=db_path, CACHE_ENABLED='false', STATEMENT_WARMUP='false')
+    from src.database.connection import db_connection
+    from src.database.dialects import register_sqlite_types
+    from src.database.pool import ConnectionPool
+    if engine == 'sqlserver':
+        register_sqlite_types()
+        db_connection.pool = ConnectionPool(lambda: StandInConnection(db_path), reset=lambda connection: connection.rollback())
+    from src.main import create_app
+
+    client = create_app('production').test_client()
+    results = []
+
+    def call(method, url, body=None):
+        response = client.open(url, method=method, json=body)
+        results.append([f"{method} {url}", response.status_code, body_of(response)])
+        response.close()
+        return results[-1][2]
+
+    for url in route_cases(client.application) + list(QUERY_CASES):
+        data = call('GET', url)
+        # Segue o cursor da primeira página (paginação por chave)
+        if isinstance(data, dict) and (data.get('pagination') or {}).get('next_cursor'):
+            call('GET', re.sub(r'after=[^&]*', f"after={data['pagination']['next_cursor']}", url))
+
+    created = {}
+    for method, url, body in WRITE_CASES:
+        data = call(method, url.format(**created), body)
+        if method == 'POST' and isinstance(data, dict) and 'EspecieID' in data and not created: created.update(data)
+
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump({'engine': engine, 'results': results}, file, ensure_ascii=False)
+
+def collect(directory, especies=40):
+    """Semeia o banco e executa as requisições com cada dialeto; retorna {dialeto: [[rótulo, status, corpo]]}"""
+    base = os.path.join(directory, 'base.db')
+    seed(base, especies)
+    reports = {}
+    for engine in ENGINES:
+        db_path, output = os.path.join(directory, f'{engine}.db'), os.path.join(directory, f'{engine}.json')
+        shutil.copyfile(base, db_path)
+        process = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run', engine, '--db', db_path, '--output', output],
+            stderr=subprocess.PIPE, text=True
+        )
+        if process.returncode != 0: raise RuntimeError(f"Execução com {engine} falhou:\n{process.stderr[-4000:]}")
+        with open(output, encoding='utf-8') as file: reports[engine] = json.load(file)['results']
+    return reports
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--run', choices=ENGINES, required=True)
+    parser.add_argument('--db', required=True)
+    parser.add_argument('--output', required=True)
+    args = parser.parse_args(argv)
+    run(args.run, args.db, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Operações /bulk: uma transação por requisição, desfeita por inteiro quando um registro falha"""
+import json
+
+import pytest
+
+from src.cache import response_cache
+from src.routes.base_crud import BaseCRUD
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    """Lotes de dois registros: a falha acontece depois de lotes anteriores já enviados ao banco"""
+    monkeypatch.setattr(BaseCRUD, 'BULK_BATCH_SIZE', 2)
+    # As leituras de conferência vão ao banco, não ao cache de respostas
+    monkeypatch.setattr(response_cache, 'enabled', False)
+
+def biomas(client):
+    return client.get('/api/biomas?per_page=100').get_json()['data']
+
+def test_bulk_create_inserts_every_batch(client):
+    before = len(biomas(client))
+    response = client.post('/api/biomas/bulk', json=[{'Nome': f'Bioma novo {i}', 'Regiao': 'Sul'} for i in range(5)])
+    assert response.status_code == 201
+    assert response.get_json()['created'] == 5
+    assert len(biomas(client)) == before + 5
+
+def test_bulk_create_rolls_back_earlier_batches(client):
+    before = biomas(client)
+    records = [{'Nome': f'Bioma novo {i}', 'Regiao': 'Sul'} for i in range(4)] + ['não é um registro']
+    response = client.post('/api/biomas/bulk?return=none', json=records)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Registro 4 deve ser um objeto JSON'
+    assert biomas(client) == before
+
+def test_bulk_create_ndjson_rolls_back_on_invalid_line(client):
+    before = biomas(client)
+    lines = [json.dumps({'Nome': f'Bioma novo {i}', 'Regiao': 'Sul'}) for i in range(3)] + ['{quebrado']
+    response = client.post('/api/biomas/bulk', data='\n'.join(lines), content_type='application/x-ndjson')
+    assert response.status_code == 400
+    assert 'Linha 4' in response.get_json()['error']
+    assert biomas(client) == before
+
+def test_bulk_update_rolls_back_earlier_batches(client):
+    before = biomas(client)
+    records = [{'BiomaID': 1, 'Nome': 'Alterado'}, {'BiomaID': 2, 'Nome': 'Alterado'}, {'BiomaID': 3, 'Nome': 'Alterado'}, {'Nome': 'Sem ID'}]
+    response = client.patch('/api/biomas/bulk', json=records)
+    assert response.status_code == 400
+    assert biomas(client) == before
@@ -0,0 +1,49 @@
+"""Requisições condicionais: ETag, 304 e revalidação depois das escritas"""
+import pytest
+
+from src.cache import response_cache
+
+@pytest.fixture(params=[True, False], ids=['cache', 'sem-cache'])
+def client(request, client, monkeypatch):
+    """O 304 vale com e sem o cache de respostas (CACHE_ENABLED)"""
+    monkeypatch.setattr(response_cache, 'enabled', request.param)
+    return client
+
+def test_response_carries_content_etag(client):
+    response = client.get('/api/biomas/1')
+    assert response.headers['ETag']
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert 'Last-Modified' not in response.headers
+    assert client.get('/api/biomas/1').headers['ETag'] == response.headers['ETag']
+
+def test_matching_etag_gets_304_without_body(client):
+    etag = client.get('/api/biomas/1').headers['ETag']
+    response = client.get('/api/biomas/1', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+def test_other_etag_gets_full_response(client):
+    response = client.get('/api/biomas/1', headers={'If-None-Match': '"outro"'})
+    assert response.status_code == 200
+    assert response.get_json()['BiomaID'] == 1
+
+def test_if_modified_since_is_ignored(client):
+    response = client.get('/api/biomas/1', headers={'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'})
+    assert response.status_code == 200
+
+def test_write_changes_etag(client):
+    etag = client.get('/api/biomas/1').headers['ETag']
+    client.patch('/api/biomas/1', json={'Nome': 'Cerrado'})
+    response = client.get('/api/biomas/1', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.get_json()['Nome'] == 'Cerrado'
+
+def test_write_that_restores_content_keeps_etag(client):
+    """O ETag vem do conteúdo: voltar ao mesmo corpo volta ao mesmo ETag"""
+    response = client.get('/api/biomas/1')
+    etag, nome = response.headers['ETag'], response.get_json()['Nome']
+    client.patch('/api/biomas/1', json={'Nome': 'Temporário'})
+    client.patch('/api/biomas/1', json={'Nome': nome})
+    assert client.get('/api/biomas/1', headers={'If-None-Match': etag}).status_code == 304
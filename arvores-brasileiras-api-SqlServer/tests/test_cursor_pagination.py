@@ -0,0 +1,57 @@
+"""Paginação por cursor (?after=): percurso completo, ordenação e cursores inválidos"""
+import pytest
+
+from conftest import ESPECIES
+from src.models.pagination import InvalidParameter, decode_cursor, encode_cursor
+
+def walk(client, url, key):
+    """Segue next_cursor a partir da primeira página; retorna as chaves na ordem recebida"""
+    keys, cursor = [], ''
+    while True:
+        response = client.get(f"{url}&after={cursor}")
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        keys.extend(record[key] for record in body['data'])
+        cursor = body['pagination']['next_cursor']
+        assert body['pagination']['has_next'] == bool(cursor)
+        if not cursor: return keys
+
+def test_cursor_round_trip():
+    token = encode_cursor('NomePopular', 'Ipê 4', 4)
+    assert decode_cursor(token, 'NomePopular') == ('Ipê 4', 4)
+
+def test_walk_visits_every_record_once_in_sort_order(client):
+    especies = client.get('/api/especies?per_page=100').get_json()['data']
+    expected = [record['EspecieID'] for record in sorted(especies, key=lambda record: (record['NomePopular'], record['EspecieID']))]
+    assert len(expected) == ESPECIES
+    assert walk(client, '/api/especies?per_page=7&sort=NomePopular', 'EspecieID') == expected
+
+def test_walk_with_filter(client):
+    keys = walk(client, '/api/especies?per_page=4&sort=Familia&Familia=Fabaceae', 'EspecieID')
+    assert keys == sorted(keys)
+    assert len(keys) == len([i for i in range(1, ESPECIES + 1) if i % 3 == 1])
+
+def test_walk_descending_with_nulls(client):
+    """DensidadeMadeira tem nulos: o cursor atravessa a fronteira sem repetir nem pular registros"""
+    keys = walk(client, '/api/arvores/query?per_page=6&sort=-DensidadeMadeira', 'EspecieID')
+    assert sorted(keys) == list(range(1, ESPECIES + 1))
+
+def test_write_between_pages_does_not_repeat_records(client):
+    body = client.get('/api/especies?per_page=5&sort=EspecieID&after=').get_json()
+    first = [record['EspecieID'] for record in body['data']]
+    client.post('/api/especies', json={'NomeCientifico': 'Genus novus', 'NomePopular': 'Nova', 'Familia': 'Fabaceae'})
+    second = client.get(f"/api/especies?per_page=5&sort=EspecieID&after={body['pagination']['next_cursor']}").get_json()
+    assert [record['EspecieID'] for record in second['data']] == [first[-1] + i for i in range(1, 6)]
+
+@pytest.mark.parametrize('token', ['zzz', 'bm90IGpzb24', encode_cursor('NomePopular', 'x', 1)[:-3]])
+def test_malformed_cursor_is_rejected(client, token):
+    response = client.get(f'/api/especies?per_page=5&sort=NomePopular&after={token}')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Cursor inválido'
+
+def test_cursor_from_another_sort_is_rejected(client):
+    token = encode_cursor('NomePopular', 'Ipê 4', 4)
+    response = client.get(f'/api/especies?per_page=5&sort=Familia&after={token}')
+    assert response.status_code == 400
+    with pytest.raises(InvalidParameter):
+        decode_cursor(token, 'Familia')
@@ -0,0 +1,45 @@
+"""As mesmas requisições devolvem o mesmo status e corpo no SQLite e no dialeto do SQL Server"""
+import pytest
+
+import parity
+
+@pytest.fixture(scope='module')
+def reports(tmp_path_factory):
+    """Respostas de cada dialeto por rótulo ("GET /api/..."), na ordem em que foram feitas"""
+    return parity.collect(str(tmp_path_factory.mktemp('parity')))
+
+def responses(reports, engine, label):
+    found = [(status, body) for request, status, body in reports[engine] if request == label]
+    assert found, f"Requisição não executada: {label}"
+    return found
+
+def test_same_requests(reports):
+    assert [label for label, _, _ in reports['sqlite']] == [label for label, _, _ in reports['sqlserver']]
+
+def test_routes(reports):
+    """Uma requisição por rota GET de dados (valores de exemplo no caminho) e as páginas seguintes dos cursores"""
+    labels = {f"GET {url}" for url in parity.QUERY_CASES}
+    reads = len(reports['sqlite']) - len(parity.WRITE_CASES)
+    different = [
+        label for (label, *sqlite), (_, *sqlserver) in zip(reports['sqlite'][:reads], reports['sqlserver'][:reads])
+        if label not in labels and sqlite != sqlserver
+    ]
+    assert not different
+
+@pytest.mark.parametrize('url', parity.QUERY_CASES)
+def test_queries(reports, url):
+    assert responses(reports, 'sqlite', f"GET {url}") == responses(reports, 'sqlserver', f"GET {url}")
+
+def test_percentiles_computed(reports):
+    """Os casos de percentis retornam valores (e não só a ausência deles nos dois dialetos)"""
+    for url in parity.QUERY_CASES:
+        if 'percentiles=' not in url: continue
+        ((status, body),) = responses(reports, 'sqlserver', f"GET {url}")
+        assert status == 200
+        assert all(metric['percentiles'] for group in body['groups'] for metric in group['metrics'].values())
+
+def test_writes(reports):
+    """A sequência de escritas, na ordem, com as leituras feitas depois dela"""
+    steps = len(parity.WRITE_CASES)
+    for (label, *sqlite), (_, *sqlserver) in zip(reports['sqlite'][-steps:], reports['sqlserver'][-steps:]):
+        assert sqlite == sqlserver, label
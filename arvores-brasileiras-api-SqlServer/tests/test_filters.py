@@ -0,0 +1,29 @@
+"""Condições das rotas auxiliares: curingas do LIKE tratados como texto no banco e em memória"""
+import pytest
+
+from src.cache import response_cache
+from src.models.filters import Condition
+
+NOMES = ('Pau_ferro', 'Paurosa', '100% nativa', '100 nativa', 'Ipê[roxo]', 'Barra\\fina')
+
+@pytest.fixture
+def client(client, monkeypatch):
+    monkeypatch.setattr(response_cache, 'enabled', False)
+    for nome in NOMES:
+        client.post('/api/especies', json={'NomeCientifico': 'Genus novus', 'NomePopular': nome, 'Familia': 'Fabaceae'})
+    return client
+
+@pytest.mark.parametrize('text, expected', [
+    ('_', ['Pau_ferro']),
+    ('u_f', ['Pau_ferro']),
+    ('%', ['100% nativa']),
+    ('0% n', ['100% nativa']),
+    ('[roxo]', ['Ipê[roxo]']),
+    ('\\f', ['Barra\\fina']),
+])
+def test_wildcards_match_literally(client, text, expected):
+    response = client.get('/api/especies/search', query_string={'nome': text, 'per_page': 100})
+    assert [record['NomePopular'] for record in response.get_json()] == expected
+
+    condition = Condition.contains(('NomeCientifico', 'NomePopular'), text)
+    assert [nome for nome in NOMES if condition.predicate({'NomeCientifico': 'Genus novus', 'NomePopular': nome})] == expected
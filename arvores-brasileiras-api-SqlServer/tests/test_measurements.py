@@ -0,0 +1,101 @@
+"""Consulta por medidas (/api/arvores/query): faixas combinadas, ordenação e paginação"""
+import pytest
+
+from src.cache import response_cache
+
+@pytest.fixture
+def client(client, monkeypatch):
+    monkeypatch.setattr(response_cache, 'enabled', False)
+    return client
+
+def measurements(client):
+    """Medidas de cada DadosID montadas a partir das listagens de dados-arvore e caracteristicas"""
+    dados = client.get('/api/dados-arvore?per_page=1000').get_json()['data']
+    caracteristicas = {
+        record['EspecieID']: record for record in client.get('/api/caracteristicas?per_page=1000').get_json()['data']
+    }
+    return {
+        record['DadosID']: dict(record, **{
+            field: caracteristicas.get(record['EspecieID'], {}).get(field) for field in ('AlturaMedia', 'DiametroMedio')
+        })
+        for record in dados
+    }
+
+def query(client, **params):
+    response = client.get('/api/arvores/query', query_string=dict({'per_page': 1000}, **params))
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def ids(body):
+    return [record['DadosID'] for record in body['data']]
+
+def number(value):
+    return None if value is None else float(value)
+
+def test_combined_ranges_match_the_tables(client):
+    expected = [
+        pk for pk, record in sorted(measurements(client).items())
+        if number(record['AlturaMedia']) is not None and number(record['AlturaMedia']) >= 10
+        and record['TempoDeVidaEstimado'] < 120 and number(record['DensidadeMadeira']) is not None
+        and 0.5 < number(record['DensidadeMadeira']) <= 0.9
+    ]
+    body = query(client, AlturaMedia__gte=10, TempoDeVidaEstimado__lt=120, DensidadeMadeira__gt=0.5, DensidadeMadeira__lte=0.9)
+    assert expected and ids(body) == expected
+    assert body['pagination']['total'] == len(expected)
+
+def test_record_carries_species_and_measures(client):
+    record = query(client, TempoDeVidaEstimado=53)['data'][0]
+    assert record['EspecieID'] == 1
+    assert record['NomePopular'] == client.get('/api/especies/1').get_json()['NomePopular']
+    assert set(record) >= {'AlturaMedia', 'DiametroMedio', 'CrescimentoAnual', 'RaizProfundidadeMedia', 'DensidadeMadeira'}
+
+def test_conditions_on_same_field_use_narrowest_range(client):
+    assert ids(query(client, AlturaMedia__gt=10, AlturaMedia__gte=12)) == ids(query(client, AlturaMedia__gte=12))
+    assert ids(query(client, AlturaMedia__lte=20, AlturaMedia__lt=20)) == ids(query(client, AlturaMedia__lt=20))
+
+def test_exclusive_and_inclusive_bounds(client):
+    inclusive = ids(query(client, AlturaMedia__gte=10.5, AlturaMedia__lte=10.5))
+    assert inclusive and ids(query(client, AlturaMedia=10.5)) == inclusive
+    assert query(client, AlturaMedia__gt=10.5, AlturaMedia__lt=11)['data'] == []
+
+def test_empty_range_returns_no_rows(client):
+    body = query(client, DensidadeMadeira__gte=0.9, DensidadeMadeira__lte=0.5)
+    assert body['data'] == [] and body['pagination']['total'] == 0
+
+def test_sort_orders_by_value_then_key(client):
+    values = {pk: number(record['DensidadeMadeira']) for pk, record in measurements(client).items()}
+    ascending = ids(query(client, sort='DensidadeMadeira'))
+    descending = ids(query(client, sort='-DensidadeMadeira'))
+    assert sorted(ascending) == sorted(values)
+    known = [pk for pk in ascending if values[pk] is not None]
+    assert known == sorted(known, key=lambda pk: (values[pk], pk))
+    # A ordem decrescente é a crescente invertida, inclusive no desempate e nos nulos
+    assert descending == ascending[::-1]
+
+def test_cursor_walk_matches_offset_pages(client):
+    by_offset = [pk for page in range(1, 6) for pk in ids(query(client, sort='-CrescimentoAnual', per_page=8, page=page))]
+    by_cursor, cursor = [], ''
+    while True:
+        body = query(client, sort='-CrescimentoAnual', per_page=8, after=cursor)
+        by_cursor += ids(body)
+        cursor = body['pagination']['next_cursor']
+        if not cursor: break
+    assert by_cursor == by_offset
+
+def test_results_follow_writes(client):
+    assert query(client, TempoDeVidaEstimado__gte=500)['data'] == []
+    client.patch('/api/dados-arvore/3', json={'TempoDeVidaEstimado': 600})
+    assert ids(query(client, TempoDeVidaEstimado__gte=500)) == [3]
+
+@pytest.mark.parametrize('params', [
+    {'Altura__gte': '10'},
+    {'AlturaMedia__between': '10'},
+    {'AlturaMedia__gte': 'alta'},
+    {'TempoDeVidaEstimado': '1.5'},
+    {'sort': 'NomePopular'},
+    {'per_page': '0'},
+    {'after': 'zzz'},
+])
+def test_invalid_parameters(client, params):
+    response = client.get('/api/arvores/query', query_string=params)
+    assert response.status_code == 400, response.get_json()
@@ -0,0 +1,142 @@
+"""Testes do pool de conexões contra um driver DB-API falso (sem banco)"""
+import threading
+import time
+
+import pytest
+
+from src.database import pool as pool_module
+from src.database.pool import PoolTimeout
+from fakes import FakeConnection, FakeDriver, make_pool
+
+class FakeClock:
+    """Substitui time.monotonic no módulo do pool para avançar o tempo sem esperar"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(pool_module, 'time', clock)
+    return clock
+
+# Checkout e devolução
+
+def test_reuses_released_connection(driver):
+    pool = make_pool(driver, max_size=2)
+    with pool.connection() as first: pass
+    with pool.connection() as second: pass
+    assert first is second
+    assert len(driver.connections) == 1
+    assert first.rollbacks == 2
+
+def test_warmup_opens_min_size(driver):
+    pool = make_pool(driver, min_size=2, max_size=4)
+    pool.warmup()
+    assert pool.stats()['idle'] == 2
+    assert len(driver.connections) == 2
+
+def test_failed_connect_frees_reserved_slot():
+    driver = FakeDriver(fail=True)
+    pool = make_pool(driver, max_size=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool.stats()['size'] == 0
+    driver.fail = False
+    assert pool.acquire(timeout=0) is driver.connections[0]
+
+def test_failed_reset_discards_connection(driver):
+    def reset(connection): raise RuntimeError("rollback falhou")
+    pool = make_pool(driver, reset=reset)
+    connection = pool.acquire()
+    pool.release(connection)
+    assert connection.closed
+    assert pool.stats()['size'] == 0
+
+def test_release_of_foreign_connection_is_ignored(driver):
+    pool = make_pool(driver)
+    pool.release(FakeConnection(99))
+    assert pool.stats()['closed'] == 0
+
+# Tempo limite de checkout
+
+def test_acquire_times_out_when_exhausted(driver):
+    pool = make_pool(driver, max_size=1, timeout=0.05)
+    pool.acquire()
+    started = time.monotonic()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    assert time.monotonic() - started >= 0.05
+    stats = pool.stats()
+    assert stats['timeouts'] == 1
+    assert stats['waits'] == 1
+
+def test_waiting_acquire_gets_released_connection(driver):
+    pool = make_pool(driver, max_size=1, timeout=5)
+    connection = pool.acquire()
+    threading.Timer(0.05, pool.release, [connection]).start()
+    assert pool.acquire() is connection
+    assert pool.stats()['waits'] == 1
+    assert len(driver.connections) == 1
+
+# Verificação de vida e expiração
+
+def test_ping_skipped_for_recently_used_connection(driver, clock):
+    pool = make_pool(driver, ping_interval=30)
+    with pool.connection() as connection: pass
+    clock.advance(10)
+    with pool.connection(): pass
+    assert connection.queries == []
+
+def test_ping_after_idle_interval(driver, clock):
+    pool = make_pool(driver, ping_interval=30)
+    with pool.connection() as connection: pass
+    clock.advance(31)
+    with pool.connection() as again: pass
+    assert again is connection
+    assert connection.queries == ['SELECT 1']
+
+def test_dead_connection_replaced_on_checkout(driver, clock):
+    pool = make_pool(driver, ping_interval=30)
+    with pool.connection() as connection: pass
+    connection.broken = True
+    clock.advance(31)
+    with pool.connection() as replacement: pass
+    assert replacement is not connection
+    assert connection.closed
+    stats = pool.stats()
+    assert stats['ping_failures'] == 1
+    assert stats['size'] == 1
+
+def test_idle_connections_above_min_size_expire(driver, clock):
+    pool = make_pool(driver, min_size=1, max_size=3, max_idle=60, ping_interval=None)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    clock.advance(61)
+    assert pool.prune() == 1
+    assert pool.stats()['idle'] == 1
+
+def test_connections_expire_after_max_lifetime(driver, clock):
+    pool = make_pool(driver, max_lifetime=100, ping_interval=None)
+    with pool.connection() as connection: pass
+    clock.advance(101)
+    with pool.connection() as replacement: pass
+    assert replacement is not connection
+    assert connection.closed
+
+def test_close_all_retires_connections_in_use(driver):
+    pool = make_pool(driver, max_size=2)
+    idle, busy = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.close_all()
+    assert idle.closed and not busy.closed
+    pool.release(busy)
+    assert busy.closed
+    assert pool.stats()['size'] == 0
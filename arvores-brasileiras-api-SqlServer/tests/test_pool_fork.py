@@ -0,0 +1,37 @@
+"""Pool de conexões depois do fork: o filho abre as próprias conexões"""
+import os
+
+import pytest
+
+from fakes import make_pool
+
+def test_reset_after_fork_forgets_inherited_connections(driver):
+    pool = make_pool(driver, max_size=1)
+    inherited = pool.acquire()
+    pool.reset_after_fork()
+    # O filho não fecha nem reaproveita as conexões do pai
+    child = pool.acquire(timeout=0)
+    assert child is not inherited
+    assert not inherited.closed
+    pool.release(inherited)
+    assert pool.stats()['in_use'] == 1
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="os.fork indisponível")
+def test_child_process_opens_own_connections(driver):
+    pool = make_pool(driver, max_size=1)
+    inherited = pool.acquire()
+
+    pid = os.fork()
+    if pid == 0:
+        # Processo filho: o hook de register_at_fork já reinicializou o pool
+        status = 1
+        try:
+            connection = pool.acquire(timeout=0)
+            if connection is not inherited and not inherited.closed: status = 0
+        finally:
+            os._exit(status)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert pool.stats()['in_use'] == 1
+    pool.release(inherited)
@@ -0,0 +1,71 @@
+"""Cache de respostas: acertos, invalidação pelas escritas e o backend LRU"""
+from types import SimpleNamespace
+
+from src.cache import LRUCache
+
+def entry(size):
+    """Valor armazenável no LRUCache (só `size` é usado pelo backend)"""
+    return SimpleNamespace(size=size)
+
+# Rotas
+
+def test_second_read_is_served_from_cache(client):
+    first = client.get('/api/especies/1')
+    second = client.get('/api/especies/1')
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == first.get_json()
+
+def test_write_invalidates_cached_reads(client):
+    assert client.get('/api/especies/1').get_json()['NomePopular'] != 'Ipê-roxo'
+    client.get('/api/especies?per_page=5')
+
+    assert client.patch('/api/especies/1', json={'NomePopular': 'Ipê-roxo'}).status_code == 200
+
+    by_id = client.get('/api/especies/1')
+    listing = client.get('/api/especies?per_page=5')
+    assert by_id.headers['X-Cache'] == listing.headers['X-Cache'] == 'MISS'
+    assert by_id.get_json()['NomePopular'] == 'Ipê-roxo'
+    assert listing.get_json()['data'][0]['NomePopular'] == 'Ipê-roxo'
+
+def test_write_to_related_table_invalidates_full_tree(client):
+    before = client.get('/api/arvores-completa/1').get_json()['tree']
+    client.post('/api/curiosidades', json={'EspecieID': 1, 'Texto': 'Nova curiosidade', 'Fonte': 'IBF'})
+    after = client.get('/api/arvores-completa/1').get_json()['tree']
+    assert len(after['Curiosidades']) == len(before['Curiosidades']) + 1
+
+# Backend LRU
+
+def test_lru_evicts_least_recently_used_within_budget():
+    cache = LRUCache(max_bytes=100)
+    cache.set('a', entry(40), ttl=None)
+    cache.set('b', entry(40), ttl=None)
+    cache.get('a')
+    cache.set('c', entry(40), ttl=None)
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['evictions'] == 1
+
+def test_lru_rejects_entry_larger_than_budget():
+    cache = LRUCache(max_bytes=10)
+    assert cache.set('a', entry(11), ttl=None) is False
+    assert cache.stats()['entries'] == 0
+
+def test_lru_expires_entries_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('src.cache.time.monotonic', lambda: now[0])
+    cache = LRUCache()
+    cache.set('a', entry(1), ttl=5)
+    now[0] += 6
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+def test_lru_invalidates_by_table_tag():
+    cache = LRUCache()
+    cache.set('especies', entry(1), ttl=None, tags=('Especies',))
+    cache.set('arvore', entry(1), ttl=None, tags=('Especies', 'Curiosidades'))
+    cache.set('biomas', entry(1), ttl=None, tags=('Biomas',))
+    cache.invalidate('Especies')
+    assert cache.get('especies') is None and cache.get('arvore') is None
+    assert cache.get('biomas') is not None
+    assert cache.stats()['invalidations'] == 2
@@ -0,0 +1,72 @@
+"""Busca textual (/api/search): ranqueamento, acentos, erros de digitação e atualização do índice"""
+import pytest
+
+from src.search import edit_distance, search_index
+
+def search(client, query, **params):
+    response = client.get('/api/search', query_string=dict(params, q=query))
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['results']
+
+def especie(client, nome_popular, nome_cientifico='Genus ignotus', familia='Sapotaceae'):
+    response = client.post('/api/especies', json={'NomeCientifico': nome_cientifico, 'NomePopular': nome_popular, 'Familia': familia})
+    assert response.status_code == 201
+    return response.get_json()['EspecieID']
+
+def test_edit_distance_counts_transpositions():
+    assert edit_distance('jatoba', 'jatoba', 2) == 0
+    assert edit_distance('jatoba', 'jaotba', 2) == 1
+    assert edit_distance('jatoba', 'jatobaaa', 1) == 2
+
+def test_exact_ranks_above_prefix(client):
+    prefix, exact = especie(client, 'Perobarana'), especie(client, 'Peroba')
+    assert [result['id'] for result in search(client, 'peroba', type='especie')] == [exact, prefix]
+
+def test_typos_only_when_there_is_no_exact_match(client):
+    peroba, perova = especie(client, 'Peroba'), especie(client, 'Perova')
+    assert [result['id'] for result in search(client, 'peroba', type='especie')] == [peroba]
+    assert sorted(result['id'] for result in search(client, 'perofa', type='especie')) == [peroba, perova]
+
+def test_accents_and_case_are_ignored(client):
+    assert search(client, 'IPE 12')[0]['id'] == search(client, 'ipê 12')[0]['id'] == 12
+
+def test_documents_matching_more_terms_come_first(client):
+    results = search(client, 'jatobá 13', type='especie')
+    assert results[0]['id'] == 13
+    assert all('Jatobá' in result['data']['NomePopular'] for result in results[1:])
+
+@pytest.mark.parametrize('query', ['jatboa', 'jatobaa', 'jtoba'])
+def test_typos_are_tolerated(client, query):
+    results = search(client, query, type='especie')
+    assert results and all(result['data']['NomePopular'].startswith('Jatobá') for result in results)
+
+def test_short_terms_need_exact_or_prefix_match(client):
+    assert search(client, 'ipx') == []
+    assert search(client, 'ip', type='especie')
+
+def test_type_filter(client):
+    results = search(client, 'árvore', type='curiosidade')
+    assert results and {result['type'] for result in results} == {'curiosidade'}
+
+@pytest.mark.parametrize('params', [{}, {'q': 'ipe', 'type': 'planta'}])
+def test_invalid_requests(client, params):
+    assert client.get('/api/search', query_string=params).status_code == 400
+
+def test_index_follows_writes(client):
+    especie_id = especie(client, 'Sapucaia')
+    assert [result['id'] for result in search(client, 'sapucaia')] == [especie_id]
+
+    client.patch(f'/api/especies/{especie_id}', json={'NomePopular': 'Castanha-de-macaco'})
+    assert search(client, 'sapucaia') == []
+    assert search(client, 'castanha')[0]['id'] == especie_id
+
+    client.delete(f'/api/especies/{especie_id}')
+    assert search(client, 'castanha') == []
+
+def test_database_fallback_without_index(client, monkeypatch):
+    monkeypatch.setattr(search_index, 'ready', False)
+    response = client.get('/api/search', query_string={'q': 'Jatobá 13'})
+    body = response.get_json()
+    assert body['indexed'] is False
+    assert [result['id'] for result in body['results'] if result['type'] == 'especie'] == [13]
+    assert all(result['score'] is None for result in body['results'])
@@ -0,0 +1,112 @@
+"""Snapshot em memória: as mesmas respostas servidas do banco"""
+import os
+import sqlite3
+
+import pytest
+
+import parity
+from src.cache import response_cache
+from src.main import (
+    especies_model, biomas_model, ocorrencias_model, caracteristicas_model, curiosidades_model, dados_arvore_model
+)
+from src.models.snapshot import snapshot_store
+
+MODELS = (especies_model, biomas_model, ocorrencias_model, caracteristicas_model, curiosidades_model, dados_arvore_model)
+
+@pytest.fixture
+def client(client, monkeypatch):
+    """Snapshot carregado das seis tabelas, sem recarga periódica nem cache de respostas"""
+    monkeypatch.setattr(response_cache, 'enabled', False)
+    monkeypatch.setattr(snapshot_store, 'interval', 0)
+    monkeypatch.setattr(snapshot_store, 'snapshots', {})
+    for model in MODELS: monkeypatch.setattr(model, 'snapshot', None)
+    snapshot_store.start(MODELS)
+    return client
+
+# Seleções e buscas por chave (seek) com ordenação, filtros e cursor, além das rotas de parity.QUERY_CASES
+SEEK_CASES = (
+    '/api/especies?per_page=7&sort=NomePopular&after=',
+    '/api/especies?per_page=7&sort=Familia&Familia=Fabaceae&after=',
+    '/api/especies?per_page=5&sort=NomeCientifico&NomePopular__contains=ip&after=',
+    '/api/ocorrencias?per_page=6&sort=EspecieID&BiomaID=3&after=',
+    '/api/dados-arvore?per_page=4&sort=EspecieID&DensidadeMadeira__lte=0.7&after=',
+    '/api/especies?page=3&per_page=6&count=exact',
+    '/api/especies?EspecieID__in=2,4,40,99999',
+    '/api/ocorrencias/especie/3',
+    '/api/curiosidades/especie/5',
+)
+
+def get(client, url):
+    """(status, corpo) da resposta, fechada logo em seguida (as exportações são streaming)"""
+    response = client.get(url)
+    try:
+        status, body = response.status_code, parity.body_of(response)
+    finally:
+        response.close()
+    # As estatísticas informam de onde vieram (memory ou database)
+    if isinstance(body, dict): body.pop('source', None)
+    return status, body
+
+def from_database(client, url):
+    """A mesma requisição com os snapshots desligados"""
+    snapshots = {model: model.snapshot for model in MODELS}
+    for model in MODELS: model.snapshot = None
+    try:
+        return get(client, url)
+    finally:
+        for model, snapshot in snapshots.items(): model.snapshot = snapshot
+
+def assert_same(client, url):
+    snapshot = get(client, url)
+    assert snapshot == from_database(client, url), url
+    return snapshot[1]
+
+def test_routes_match_database(client, app):
+    different = []
+    for url in parity.route_cases(app):
+        if get(client, url) != from_database(client, url): different.append(url)
+    assert not different
+
+@pytest.mark.parametrize('url', parity.QUERY_CASES + SEEK_CASES)
+def test_queries_match_database(client, url):
+    assert_same(client, url)
+
+def test_reads_skip_database(client):
+    for url in ('/api/especies?per_page=5', '/api/especies/3', '/api/arvores/query?per_page=3'):
+        assert 'desc="0 consultas"' in client.get(url).headers['Server-Timing'], url
+
+def test_cursor_pages_match_and_are_interchangeable(client):
+    """Cursores gerados pelo snapshot valem no banco e vice-versa (workers podem diferir)"""
+    url = '/api/especies?per_page=6&sort=NomePopular&after='
+    cursor, pages = '', 0
+    while True:
+        body = assert_same(client, url + cursor)
+        database_cursor = from_database(client, url + cursor)[1]['pagination']['next_cursor']
+        assert body['pagination']['next_cursor'] == database_cursor
+        cursor, pages = body['pagination']['next_cursor'], pages + 1
+        if not cursor: break
+    assert pages == 7
+
+def test_writes_update_snapshot(client):
+    created = client.post('/api/especies', json={'NomeCientifico': 'Genus novus', 'NomePopular': 'Aroeira', 'Familia': 'Fabaceae'}).get_json()
+    client.patch('/api/especies/2', json={'NomePopular': 'Angico'})
+    client.delete('/api/curiosidades/3')
+    client.post('/api/ocorrencias/bulk?return=none', json=[{'EspecieID': created['EspecieID'], 'BiomaID': b, 'Frequencia': 'Rara'} for b in (1, 2)])
+    client.patch('/api/dados-arvore/bulk', json=[{'DadosID': 4, 'DensidadeMadeira': 0.55}])
+
+    for url in (
+        '/api/especies?per_page=100&sort=NomePopular&after=', f"/api/especies/{created['EspecieID']}?include_relationships=true",
+        '/api/curiosidades?per_page=100', '/api/ocorrencias?per_page=100&BiomaID=1',
+        '/api/dados-arvore/densidade-range?max=0.6', '/api/arvores/query?sort=DensidadeMadeira&per_page=50'
+    ):
+        assert_same(client, url)
+
+def test_refresh_picks_up_writes_from_other_processes(client):
+    assert_same(client, '/api/especies/1')
+    connection = sqlite3.connect(os.environ['SQLITE_PATH'])
+    connection.execute("UPDATE Especies SET NomePopular = 'Baraúna' WHERE EspecieID = 1")
+    connection.commit()
+    connection.close()
+
+    snapshot_store.refresh()
+    assert assert_same(client, '/api/especies/1')['NomePopular'] == 'Baraúna'
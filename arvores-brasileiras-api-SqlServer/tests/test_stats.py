@@ -0,0 +1,87 @@
+"""Estatísticas por grupo (/api/stats/<recurso>): contagens, histogramas e percentis"""
+from collections import Counter
+
+import pytest
+
+from conftest import ESPECIES
+from src.models.aggregates import percentile_cont
+
+def stats(client, recurso, **params):
+    response = client.get(f'/api/stats/{recurso}', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def column(client, recurso, field, **filters):
+    """Valores não nulos da coluna, lidos pela listagem comum"""
+    records = client.get(f'/api/{recurso}', query_string=dict(filters, per_page=100)).get_json()['data']
+    return sorted(float(record[field]) for record in records if record[field] is not None)
+
+def test_percentile_cont_interpolates_between_ranks():
+    assert percentile_cont([10, 20, 30, 40], 0.5) == 25
+    assert percentile_cont([10, 20, 30, 40], 0) == 10
+    assert percentile_cont([10, 20, 30, 40], 1) == 40
+    assert percentile_cont([7], 0.9) == 7
+
+def test_counts_by_group(client):
+    especies = client.get('/api/especies?per_page=100').get_json()['data']
+    body = stats(client, 'especies', group_by='Familia')
+    assert {group['Familia']: group['count'] for group in body['groups']} == Counter(record['Familia'] for record in especies)
+    assert sum(group['count'] for group in body['groups']) == ESPECIES
+
+def test_metrics_and_percentiles_match_the_data(client):
+    values = column(client, 'dados-arvore', 'DensidadeMadeira')
+    metrics = stats(client, 'dados-arvore', metrics='DensidadeMadeira', percentiles='0,25,50,90,100')['groups'][0]['metrics']['DensidadeMadeira']
+    assert metrics['count'] == len(values) < ESPECIES
+    assert (metrics['min'], metrics['max']) == (values[0], values[-1])
+    assert metrics['avg'] == pytest.approx(sum(values) / len(values), abs=1e-6)
+    assert metrics['percentiles'] == {
+        f"p{p:g}": pytest.approx(percentile_cont(values, p / 100), abs=1e-6) for p in (0, 25, 50, 90, 100)
+    }
+
+def test_percentiles_follow_filters(client):
+    values = column(client, 'dados-arvore', 'TempoDeVidaEstimado', CrescimentoAnual__gte=0.5)
+    body = stats(client, 'dados-arvore', metrics='TempoDeVidaEstimado', percentiles='50', CrescimentoAnual__gte=0.5)
+    assert body['groups'][0]['metrics']['TempoDeVidaEstimado']['percentiles']['p50'] == pytest.approx(percentile_cont(values, 0.5))
+
+def test_histogram_over_data_range(client):
+    values = column(client, 'caracteristicas', 'AlturaMedia')
+    body = stats(client, 'caracteristicas', metrics='AlturaMedia', bins=5)
+    histogram = body['histograms']['AlturaMedia']
+    assert (histogram['min'], histogram['max'], histogram['bins']) == (values[0], values[-1], 5)
+
+    expected = [0] * 5
+    for value in values: expected[min(int((value - values[0]) / histogram['width']), 4)] += 1
+    assert body['groups'][0]['metrics']['AlturaMedia']['histogram'] == expected
+
+def test_histogram_with_bounds_drops_values_outside(client):
+    values = column(client, 'dados-arvore', 'DensidadeMadeira')
+    body = stats(client, 'dados-arvore', metrics='DensidadeMadeira', bins=4, bins_min=0.5, bins_max=0.8)
+    counts = body['groups'][0]['metrics']['DensidadeMadeira']['histogram']
+    assert body['histograms']['DensidadeMadeira']['width'] == pytest.approx(0.075)
+    assert sum(counts) == len([value for value in values if 0.5 <= value <= 0.8])
+
+def test_histogram_bins_are_shared_by_groups(client):
+    body = stats(client, 'caracteristicas', group_by='TipoFolha', metrics='AlturaMedia', bins=3)
+    assert [group['TipoFolha'] for group in body['groups']] == ['Composta', 'Simples']
+    for group in body['groups']:
+        metrics = group['metrics']['AlturaMedia']
+        assert len(metrics['histogram']) == 3 and sum(metrics['histogram']) == metrics['count']
+
+def test_stats_follow_writes(client):
+    before = stats(client, 'dados-arvore', metrics='TempoDeVidaEstimado')['groups'][0]['metrics']['TempoDeVidaEstimado']
+    client.post('/api/dados-arvore', json={'EspecieID': 1, 'TempoDeVidaEstimado': 1000})
+    after = stats(client, 'dados-arvore', metrics='TempoDeVidaEstimado')['groups'][0]['metrics']['TempoDeVidaEstimado']
+    assert (after['count'], after['max']) == (before['count'] + 1, 1000)
+
+@pytest.mark.parametrize('params', [
+    {'group_by': 'Descricao2'},
+    {'metrics': 'NomePopular'},
+    {'metrics': 'DensidadeMadeira', 'percentiles': '101'},
+    {'metrics': 'DensidadeMadeira', 'percentiles': ','.join(str(p) for p in range(11))},
+    {'metrics': 'DensidadeMadeira', 'bins': '0'},
+    {'metrics': 'DensidadeMadeira', 'bins': '4', 'bins_min': '1', 'bins_max': '0'},
+    {'percentiles': '50'},
+])
+def test_invalid_parameters(client, params):
+    response = client.get('/api/stats/dados-arvore', query_string=params)
+    assert response.status_code == 400, response.get_json()
@@ -0,0 +1,25 @@
+"""Pool de uma conexão por thread (SQLite) contra o driver DB-API falso"""
+import threading
+
+from src.database.pool import ThreadLocalPool
+
+def test_thread_local_pool_reuses_per_thread(driver):
+    pool = ThreadLocalPool(driver.connect)
+    with pool.connection() as first: pass
+    with pool.connection() as second: pass
+    assert first is second
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(pool.acquire()))
+    thread.start()
+    thread.join()
+    assert other[0] is not first
+
+def test_thread_local_pool_nested_checkout_opens_extra(driver):
+    pool = ThreadLocalPool(driver.connect, max_idle_per_thread=1)
+    outer, inner = pool.acquire(), pool.acquire()
+    assert outer is not inner
+    pool.release(inner)
+    pool.release(outer)
+    # Só uma fica ociosa na thread; a excedente é fechada
+    assert outer.closed and not inner.closed